@@ -0,0 +1,268 @@
+"""
+Upstream AI client for chat2api
+Forwards chat completions to OpenAI through the shared HTTP client, with fallback content
+"""
+
+import os
+import json
+import logging
+from datetime import datetime
+from typing import Dict, Any, AsyncIterator, List, Optional, Tuple
+import httpx
+from http_client import openai_http_client
+from models import ChatRequest
+from json_extract import JSONValueScanner
+from rate_limiter import rate_limiters, estimate_tokens
+
+# Configuration
+OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
+CHAT2API_API_KEY = os.getenv("CHAT2API_API_KEY")
+OPENAI_CHAT_COMPLETIONS_URL = "https://api.openai.com/v1/chat/completions"
+
+logger = logging.getLogger(__name__)
+
+def request_token_estimate(request: ChatRequest, max_tokens: Optional[int] = None) -> int:
+    """Tokens to reserve on the rate limiter for a chat request; max_tokens=0 estimates the prompt alone"""
+    return estimate_tokens("".join(msg.content for msg in request.messages),
+                           request.max_tokens if max_tokens is None else max_tokens)
+
+def parse_stream_chunk(payload: str) -> Tuple[str, Optional[int]]:
+    """Content text and reported total tokens carried by one streamed chunk"""
+    try:
+        chunk = json.loads(payload)
+    except ValueError:
+        return "", None
+    choices = chunk.get("choices") or [{}]
+    content = (choices[0].get("delta") or {}).get("content") or ""
+    return content, (chunk.get("usage") or {}).get("total_tokens")
+
+class UpstreamFallback(Exception):
+    """OpenAI couldn't answer; carries the fallback response to serve in its place
+
+    Raised rather than returned so caching layers never store the canned answer.
+    """
+
+    def __init__(self, response: Dict[str, Any]):
+        super().__init__("OpenAI unavailable, serving fallback response")
+        self.response = response
+
+async def forward_to_openai(request: ChatRequest) -> Dict[str, Any]:
+    """Forward request to OpenAI API; raises UpstreamFallback when it can't be reached"""
+    if not OPENAI_API_KEY:
+        # Fallback response if no API key
+        raise UpstreamFallback(generate_fallback_response(request))
+    
+    limiter = rate_limiters.get("openai", request.model)
+    reserved = await limiter.acquire(request_token_estimate(request))
+    
+    # Refused, failed and cancelled requests give their whole reservation back
+    used = 0
+    try:
+        response = await openai_http_client.post(
+            OPENAI_CHAT_COMPLETIONS_URL,
+            headers={
+                "Authorization": f"Bearer {OPENAI_API_KEY}",
+                "Content-Type": "application/json"
+            },
+            json=request.dict()
+        )
+        limiter.record(response.status_code, response.headers)
+        
+        if response.status_code == 200:
+            data = response.json()
+            used = (data.get("usage") or {}).get("total_tokens", reserved)
+            return data
+        else:
+            # Fallback if OpenAI fails
+            raise UpstreamFallback(generate_fallback_response(request))
+    finally:
+        limiter.settle(reserved, used)
+
+async def forward_to_openai_stream(request: ChatRequest) -> AsyncIterator[str]:
+    """Forward a streaming request to OpenAI, yielding SSE data payloads as they arrive
+
+    "[DONE]" is only passed on when the upstream stream completes; fallback content and
+    error events end without it, so callers can tell them apart from a real answer.
+    """
+    if not OPENAI_API_KEY:
+        yield json.dumps(generate_fallback_stream_chunk(request))
+        return
+    
+    limiter = rate_limiters.get("openai", request.model)
+    reserved = await limiter.acquire(request_token_estimate(request))
+    
+    accepted = False
+    streamed = False
+    completion: List[str] = []
+    usage: Optional[int] = None
+    try:
+        # Leaving this block (including on client disconnect) closes the upstream stream
+        async with openai_http_client.stream(
+            "POST",
+            OPENAI_CHAT_COMPLETIONS_URL,
+            headers={
+                "Authorization": f"Bearer {OPENAI_API_KEY}",
+                "Content-Type": "application/json"
+            },
+            json=request.dict()
+        ) as response:
+            limiter.record(response.status_code, response.headers)
+            if response.status_code != 200:
+                # Fallback if OpenAI fails
+                yield json.dumps(generate_fallback_stream_chunk(request))
+                return
+            accepted = True
+            
+            async for line in response.aiter_lines():
+                if not line.startswith("data:"):
+                    continue
+                payload = line[5:].strip()
+                if payload != "[DONE]":
+                    content, total_tokens = parse_stream_chunk(payload)
+                    completion.append(content)
+                    if total_tokens is not None:
+                        usage = total_tokens
+                yield payload
+                if payload == "[DONE]":
+                    return
+                streamed = True
+    except httpx.HTTPError as e:
+        logger.warning(f"Upstream stream failed: {e}")
+        # Headers are already sent, so the failure has to travel as an event
+        if streamed:
+            yield json.dumps(generate_stream_error_chunk(f"Upstream stream interrupted: {e}"))
+        else:
+            yield json.dumps(generate_fallback_stream_chunk(request))
+    finally:
+        # Also runs when the client disconnects: charge what was generated, not max_tokens
+        if usage is None:
+            usage = request_token_estimate(request, 0) + estimate_tokens("".join(completion)) if accepted else 0
+        limiter.settle(reserved, usage)
+
+async def generate_ai_json(prompt: str, openers: str = "{[") -> str:
+    """Generate a JSON AI response, streaming it and hanging up once the first JSON value is complete
+
+    Closing the stream stops the upstream generation, so trailing prose is never paid for.
+    """
+    if OPENAI_API_KEY:
+        scanner = JSONValueScanner(openers)
+        parts: List[str] = []
+        usage: Optional[int] = None
+        accepted = False
+        limiter = rate_limiters.get("openai", "gpt-3.5-turbo")
+        reserved = await limiter.acquire(estimate_tokens(prompt, 2000))
+        try:
+            async with openai_http_client.stream(
+                "POST",
+                OPENAI_CHAT_COMPLETIONS_URL,
+                headers={
+                    "Authorization": f"Bearer {OPENAI_API_KEY}",
+                    "Content-Type": "application/json"
+                },
+                json={
+                    "model": "gpt-3.5-turbo",
+                    "messages": [{"role": "user", "content": prompt}],
+                    "temperature": 0.7,
+                    "max_tokens": 2000,
+                    "stream": True
+                }
+            ) as response:
+                limiter.record(response.status_code, response.headers)
+                if response.status_code == 200:
+                    accepted = True
+                    async for line in response.aiter_lines():
+                        if not line.startswith("data:"):
+                            continue
+                        payload = line[5:].strip()
+                        if payload == "[DONE]":
+                            break
+                        content, total_tokens = parse_stream_chunk(payload)
+                        if total_tokens is not None:
+                            usage = total_tokens
+                        parts.append(content)
+                        if scanner.feed(content):
+                            break
+                    return "".join(parts)
+        except Exception:
+            pass
+        finally:
+            # Hanging up early means far fewer than max_tokens were generated
+            if usage is None:
+                usage = estimate_tokens(prompt) + estimate_tokens("".join(parts)) if accepted else 0
+            limiter.settle(reserved, usage)
+    
+    # Fallback to predefined responses
+    return generate_fallback_content(prompt)
+
+def generate_fallback_response(request: ChatRequest) -> Dict[str, Any]:
+    """Generate fallback response when APIs fail"""
+    return {
+        "id": f"fallback-{datetime.utcnow().timestamp()}",
+        "object": "chat.completion",
+        "created": int(datetime.utcnow().timestamp()),
+        "model": request.model,
+        "choices": [
+            {
+                "index": 0,
+                "message": {
+                    "role": "assistant",
+                    "content": generate_fallback_content(" ".join([msg.content for msg in request.messages]))
+                },
+                "finish_reason": "stop"
+            }
+        ],
+        "usage": {
+            "prompt_tokens": 0,
+            "completion_tokens": 0,
+            "total_tokens": 0
+        }
+    }
+
+def generate_fallback_stream_chunk(request: ChatRequest) -> Dict[str, Any]:
+    """Generate a single streaming chunk carrying the fallback response"""
+    return {
+        "id": f"fallback-{datetime.utcnow().timestamp()}",
+        "object": "chat.completion.chunk",
+        "created": int(datetime.utcnow().timestamp()),
+        "model": request.model,
+        "choices": [
+            {
+                "index": 0,
+                "delta": {
+                    "role": "assistant",
+                    "content": generate_fallback_content(" ".join([msg.content for msg in request.messages]))
+                },
+                "finish_reason": "stop"
+            }
+        ]
+    }
+
+def generate_stream_error_chunk(message: str) -> Dict[str, Any]:
+    """Error event for a stream that broke off after content was sent"""
+    return {
+        "error": {
+            "message": message,
+            "type": "upstream_error"
+        }
+    }
+
+def generate_fallback_content(prompt: str) -> str:
+    """Generate fallback content based on prompt"""
+    if "job" in prompt.lower() or "position" in prompt.lower():
+        return """Here are some sample job openings:
+
+1. **Software Engineer** at TechCorp
+   - Location: Remote
+   - Salary: $80,000 - $120,000
+   - Skills: JavaScript, React, Node.js
+   - Experience: Mid Level
+
+2. **Data Scientist** at Analytics Inc
+   - Location: Remote
+   - Salary: $90,000 - $140,000
+   - Skills: Python, Machine Learning, SQL
+   - Experience: Mid Level
+
+*Note: This is fallback data. For real-time information, please check job boards.*"""
+    
+    return "I'm currently using fallback mode. Please try again later for real-time data."
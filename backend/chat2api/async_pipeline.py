@@ -0,0 +1,139 @@
+"""
+Staged asyncio pipeline
+Items flow through stages connected by bounded queues, each stage with its own worker pool,
+so slow stages apply backpressure instead of letting work pile up in memory
+"""
+
+import time
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterable, Awaitable, Callable, Dict, Iterable, List, Optional, Union
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Queue marker telling a worker its stage has no more input
+_DONE = object()
+
+@dataclass
+class PipelineStage:
+    """One step of the pipeline
+
+    handler receives the previous stage's output and returns the value passed on;
+    returning None or raising drops the item.
+    """
+    name: str
+    handler: Callable[[Any], Awaitable[Any]]
+    concurrency: int = 1
+    queue_size: int = 0  # defaults to twice the concurrency
+
+@dataclass
+class StageStats:
+    """Per-stage counters"""
+    processed: int = 0
+    dropped: int = 0
+    busy_seconds: float = 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {"processed": self.processed, "dropped": self.dropped,
+                "busy_seconds": round(self.busy_seconds, 3)}
+
+@dataclass
+class PipelineResult:
+    """Outcome of a pipeline run"""
+    completed: int = 0
+    dropped: int = 0
+    duration_seconds: float = 0.0
+    stages: Dict[str, StageStats] = field(default_factory=dict)
+
+# on_item_done(source item, final value or None, stage name and error if dropped)
+ItemCallback = Callable[[Any, Any, Optional[str], Optional[BaseException]], Awaitable[None]]
+
+class AsyncPipeline:
+    """Runs items through stages with bounded queues and per-stage concurrency"""
+
+    def __init__(self, stages: List[PipelineStage], on_item_done: Optional[ItemCallback] = None):
+        if not stages:
+            raise ValueError("A pipeline needs at least one stage")
+        self.stages = stages
+        self.on_item_done = on_item_done
+
+    async def run(self, items: Union[Iterable[Any], AsyncIterable[Any]]) -> PipelineResult:
+        """Feed items through every stage and wait until all of them have left the pipeline"""
+        start = time.monotonic()
+        result = PipelineResult(stages={stage.name: StageStats() for stage in self.stages})
+        queues = [asyncio.Queue(maxsize=stage.queue_size or stage.concurrency * 2) for stage in self.stages]
+
+        workers: List[List[asyncio.Task]] = []
+        for index, stage in enumerate(self.stages):
+            next_queue = queues[index + 1] if index + 1 < len(queues) else None
+            workers.append([
+                asyncio.create_task(self._worker(stage, queues[index], next_queue, result))
+                for _ in range(max(1, stage.concurrency))
+            ])
+
+        try:
+            # put() blocks while the first stage is saturated
+            if hasattr(items, "__aiter__"):
+                async for item in items:
+                    await queues[0].put((item, item))
+            else:
+                for item in items:
+                    await queues[0].put((item, item))
+
+            # Close each stage once every worker of the stage before it has finished
+            for index, stage_workers in enumerate(workers):
+                for _ in stage_workers:
+                    await queues[index].put(_DONE)
+                await asyncio.gather(*stage_workers)
+        except BaseException:
+            for stage_workers in workers:
+                for task in stage_workers:
+                    task.cancel()
+            await asyncio.gather(*(t for w in workers for t in w), return_exceptions=True)
+            raise
+
+        result.duration_seconds = time.monotonic() - start
+        return result
+
+    async def _worker(self, stage: PipelineStage, inbox: asyncio.Queue,
+                      outbox: Optional[asyncio.Queue], result: PipelineResult):
+        stats = result.stages[stage.name]
+        while True:
+            envelope = await inbox.get()
+            if envelope is _DONE:
+                return
+            source, value = envelope
+
+            started = time.monotonic()
+            error = None
+            try:
+                output = await stage.handler(value)
+            except Exception as e:
+                output, error = None, e
+            stats.busy_seconds += time.monotonic() - started
+
+            if output is None:
+                stats.dropped += 1
+                result.dropped += 1
+                if error is not None:
+                    logger.error(f"Pipeline stage {stage.name} failed: {error}")
+                await self._item_done(source, None, stage.name, error)
+                continue
+
+            stats.processed += 1
+            if outbox is not None:
+                await outbox.put((source, output))
+            else:
+                result.completed += 1
+                await self._item_done(source, output, None, None)
+
+    async def _item_done(self, source: Any, output: Any, stage: Optional[str], error: Optional[BaseException]):
+        if self.on_item_done is None:
+            return
+        try:
+            await self.on_item_done(source, output, stage, error)
+        except Exception as e:
+            logger.error(f"Pipeline item callback failed: {e}")
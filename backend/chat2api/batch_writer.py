@@ -0,0 +1,120 @@
+"""
+Batched database writer
+Collects statements from concurrent callers and writes each batch with one executemany per
+statement inside a single transaction, so a batch costs a handful of round trips
+"""
+
+import os
+import asyncio
+import logging
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# (SQL text, arguments); statements with identical SQL are sent together
+Statement = Tuple[str, Sequence[Any]]
+
+class BatchWriter:
+    """Groups writes from many callers into one transaction per batch
+
+    write() returns once the caller's statements are committed. If a batch fails,
+    its writes are retried one transaction each so a bad row only fails its own caller.
+    """
+
+    def __init__(self, db_pool, batch_size: Optional[int] = None, max_delay: Optional[float] = None):
+        self.db_pool = db_pool
+        self.batch_size = batch_size or int(os.getenv('DB_WRITE_BATCH_SIZE', '20'))
+        # Longest a write waits for its batch to fill up
+        self.max_delay = max_delay if max_delay is not None else float(os.getenv('DB_WRITE_MAX_DELAY', '0.5'))
+        self._pending: List[Tuple[List[Statement], asyncio.Future]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._flushes = set()
+
+        # Counters
+        self.batches = 0
+        self.writes = 0
+        self.statements = 0
+        self.retried_batches = 0
+
+    async def write(self, statements: List[Statement]):
+        """Queue statements for the next batch and wait for it to commit"""
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((statements, future))
+        if len(self._pending) >= self.batch_size:
+            self._start_flush()
+        elif self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(self.max_delay, self._start_flush)
+        await future
+
+    async def flush(self):
+        """Write whatever is pending now and wait for every batch in flight"""
+        self._start_flush()
+        if self._flushes:
+            await asyncio.gather(*self._flushes, return_exceptions=True)
+
+    def _start_flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._pending:
+            return
+        batch, self._pending = self._pending, []
+        task = asyncio.create_task(self._flush(batch))
+        self._flushes.add(task)
+        task.add_done_callback(self._flushes.discard)
+
+    async def _flush(self, batch: List[Tuple[List[Statement], asyncio.Future]]):
+        try:
+            await self._execute([statement for statements, _ in batch for statement in statements])
+        except Exception as e:
+            if len(batch) == 1:
+                self._settle(batch[0][1], e)
+                return
+            logger.warning(f"Batch of {len(batch)} writes failed ({e}); retrying them one by one")
+            self.retried_batches += 1
+            for statements, future in batch:
+                try:
+                    await self._execute(statements)
+                except Exception as item_error:
+                    self._settle(future, item_error)
+                else:
+                    self._settle(future, None)
+                    self.writes += 1
+            return
+
+        for _, future in batch:
+            self._settle(future, None)
+        self.batches += 1
+        self.writes += len(batch)
+
+    async def _execute(self, statements: List[Statement]):
+        # Keep first-seen statement order so dependent statements (upsert, then history) stay ordered
+        grouped: Dict[str, List[Sequence[Any]]] = {}
+        for sql, args in statements:
+            grouped.setdefault(sql, []).append(args)
+        async with self.db_pool.acquire() as conn:
+            async with conn.transaction():
+                for sql, rows in grouped.items():
+                    await conn.executemany(sql, rows)
+        self.statements += len(statements)
+
+    @staticmethod
+    def _settle(future: asyncio.Future, error: Optional[BaseException]):
+        if future.done():
+            return
+        if error is None:
+            future.set_result(None)
+        else:
+            future.set_exception(error)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "batches": self.batches,
+            "writes": self.writes,
+            "statements": self.statements,
+            "retried_batches": self.retried_batches,
+            "avg_batch_size": round(self.writes / self.batches, 2) if self.batches else 0.0,
+            "pending": len(self._pending)
+        }
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Route table benchmark for chat2api
+Reports which handler serves each endpoint, how long route resolution takes and,
+for side-effect-free endpoints, the full in-process dispatch latency
+
+Usage: python benchmark_routes.py [iterations]
+"""
+
+import sys
+import time
+import asyncio
+import logging
+import statistics
+import httpx
+from main import app
+from route_table import flatten_routes, resolve_route
+
+# Per-request client logging would drown the table
+logging.getLogger("httpx").setLevel(logging.WARNING)
+
+# (method, path, JSON body, dispatch?) -- only endpoints that neither call the
+# LLM nor write anywhere are dispatched
+SAMPLE_REQUESTS = [
+    ("GET", "/health", None, True),
+    ("GET", "/api/careers", None, True),
+    ("GET", "/api/careers/search?q=python", None, True),
+    ("POST", "/api/careers/search", {"skills": ["Python", "SQL"]}, True),
+    ("GET", "/api/careers/ai-engineer", None, True),
+    ("GET", "/api/careers/stats", None, False),
+    ("POST", "/api/careers/roadmap", None, False),
+    ("GET", "/api/careers/ai-engineer/market", None, False),
+    ("POST", "/api/jobs/market", None, False),
+    ("POST", "/v1/chat/completions", None, False),
+]
+
+def benchmark_resolution(method: str, path: str, iterations: int) -> float:
+    """Mean microseconds to find the route for method/path"""
+    route_path = path.split("?", 1)[0]
+    start = time.perf_counter()
+    for _ in range(iterations):
+        resolve_route(app, method, route_path)
+    return (time.perf_counter() - start) / iterations * 1e6
+
+async def benchmark_dispatch(client: httpx.AsyncClient, method: str, path: str, body, iterations: int):
+    """Median and p99 milliseconds for a full request through the ASGI app"""
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        response = await client.request(method, path, json=body)
+        samples.append((time.perf_counter() - start) * 1000)
+        response.raise_for_status()
+    samples.sort()
+    return statistics.median(samples), samples[min(len(samples) - 1, int(len(samples) * 0.99))]
+
+async def main(iterations: int):
+    routes = flatten_routes(app.routes)
+    transport = httpx.ASGITransport(app=app)
+    print(f"{'request':<42} {'handler':<48} {'pos':>4} {'resolve µs':>11} {'p50 ms':>8} {'p99 ms':>8}")
+    async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+        for method, path, body, dispatch in SAMPLE_REQUESTS:
+            route = resolve_route(app, method, path.split("?", 1)[0])
+            handler = f"{route.endpoint.__module__}.{route.name}" if route else "-"
+            position = routes.index(route) if route else -1
+            resolve_us = benchmark_resolution(method, path, iterations)
+            p50, p99 = "", ""
+            if dispatch and route:
+                median, tail = await benchmark_dispatch(client, method, path, body, iterations)
+                p50, p99 = f"{median:.3f}", f"{tail:.3f}"
+            print(f"{method + ' ' + path:<42} {handler:<48} {position:>4} {resolve_us:>11.2f} {p50:>8} {p99:>8}")
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 200))
@@ -0,0 +1,227 @@
+"""
+Two-tier response cache for chat2api
+L1 is a bounded in-process LRU with TTLs, L2 is Redis accessed through an asyncio connection pool
+"""
+
+import os
+import json
+import time
+import asyncio
+import logging
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+import redis.asyncio as aioredis
+from metrics import LatencyHistogram
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+class LocalLRUCache:
+    """Bounded in-process LRU cache with per-entry expiry"""
+
+    def __init__(self, max_entries: int = 1024, max_bytes: int = 64 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self.evictions = 0
+        # key -> (expires_at, size, value)
+        self._entries: "OrderedDict[str, Tuple[float, int, Any]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return a live entry and mark it most recently used"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, _, value = entry
+        if expires_at <= time.monotonic():
+            self.delete(key)
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: Any, ttl: float, size: int):
+        """Store an entry, evicting least recently used entries to stay in bounds"""
+        if ttl <= 0 or size > self.max_bytes:
+            return
+        self.delete(key)
+        self._entries[key] = (time.monotonic() + ttl, size, value)
+        self.current_bytes += size
+        while len(self._entries) > self.max_entries or self.current_bytes > self.max_bytes:
+            _, (_, evicted_size, _) = self._entries.popitem(last=False)
+            self.current_bytes -= evicted_size
+            self.evictions += 1
+
+    def delete(self, key: str):
+        """Remove an entry if present"""
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.current_bytes -= entry[1]
+
+    def clear(self):
+        """Remove all entries"""
+        self._entries.clear()
+        self.current_bytes = 0
+
+class TieredCache:
+    """In-process L1 in front of an asyncio Redis L2"""
+
+    def __init__(self):
+        self.redis_url = os.getenv('REDIS_URL', 'redis://redis:6379/0')
+        self.max_connections = int(os.getenv('REDIS_MAX_CONNECTIONS', '50'))
+        self.socket_timeout = float(os.getenv('REDIS_SOCKET_TIMEOUT', '0.5'))
+        # L1 entries expire sooner than L2 so workers converge on shared Redis data
+        self.l1_max_ttl = float(os.getenv('CACHE_L1_MAX_TTL', '300'))
+        self.l1 = LocalLRUCache(
+            max_entries=int(os.getenv('CACHE_L1_MAX_ENTRIES', '1024')),
+            max_bytes=int(os.getenv('CACHE_L1_MAX_BYTES', str(64 * 1024 * 1024)))
+        )
+        self.redis: Optional[aioredis.Redis] = None
+        self._pool: Optional[aioredis.ConnectionPool] = None
+        # Owners that called initialize(); the last close() disconnects
+        self._users = 0
+        self._lock = asyncio.Lock()
+
+        # Counters
+        self.l1_hits = 0
+        self.l2_hits = 0
+        self.misses = 0
+        self.sets = 0
+        self.errors = 0
+        self.l2_get_latency = LatencyHistogram()
+        self.l2_set_latency = LatencyHistogram()
+
+    @property
+    def redis_available(self) -> bool:
+        return self.redis is not None
+
+    async def initialize(self):
+        """Take a share of the Redis pool, connecting (or retrying a failed connect) if needed"""
+        async with self._lock:
+            self._users += 1
+            if self.redis is None:
+                await self._connect()
+
+    async def _connect(self):
+        try:
+            self._pool = aioredis.ConnectionPool.from_url(
+                self.redis_url,
+                max_connections=self.max_connections,
+                socket_timeout=self.socket_timeout,
+                socket_connect_timeout=self.socket_timeout,
+                decode_responses=True
+            )
+            client = aioredis.Redis(connection_pool=self._pool)
+            await client.ping()
+            self.redis = client
+            logger.info(f"Redis cache connected ({self.redis_url}, pool size {self.max_connections})")
+        except Exception as e:
+            logger.warning(f"Redis not available, running with in-process cache only: {e}")
+            self.redis = None
+            if self._pool:
+                await self._pool.disconnect()
+                self._pool = None
+
+    async def close(self):
+        """Release a share of the Redis pool; the last owner closes it"""
+        async with self._lock:
+            self._users = max(0, self._users - 1)
+            if self._users > 0:
+                return
+            self.redis = None
+            if self._pool:
+                await self._pool.disconnect()
+                self._pool = None
+
+    async def get(self, key: str) -> Optional[Any]:
+        """Look up a key in L1, then L2; L2 hits are promoted into L1"""
+        value = self.l1.get(key)
+        if value is not None:
+            self.l1_hits += 1
+            return value
+
+        if self.redis:
+            start = time.perf_counter()
+            raw, ttl = None, None
+            try:
+                # GET and TTL share one round trip
+                async with self.redis.pipeline(transaction=False) as pipe:
+                    pipe.get(key)
+                    pipe.ttl(key)
+                    raw, ttl = await pipe.execute()
+            except Exception as e:
+                self.errors += 1
+                logger.debug(f"Redis GET failed for {key}: {e}")
+            finally:
+                self.l2_get_latency.observe(time.perf_counter() - start)
+
+            if raw:
+                try:
+                    value = json.loads(raw)
+                except ValueError:
+                    value = None
+                if value is not None:
+                    self.l2_hits += 1
+                    # Promoted L1 entries never outlive the Redis copy
+                    remaining = float(ttl) if ttl and ttl > 0 else self.l1_max_ttl
+                    self.l1.set(key, value, min(remaining, self.l1_max_ttl), len(raw))
+                    return value
+
+        self.misses += 1
+        return None
+
+    async def set(self, key: str, value: Any, ttl: int):
+        """Write a value through to both tiers"""
+        try:
+            raw = json.dumps(value)
+        except (TypeError, ValueError) as e:
+            self.errors += 1
+            logger.warning(f"Cannot cache unserializable value for {key}: {e}")
+            return
+
+        self.sets += 1
+        self.l1.set(key, value, min(ttl, self.l1_max_ttl), len(raw))
+
+        if self.redis:
+            start = time.perf_counter()
+            try:
+                await self.redis.setex(key, ttl, raw)
+            except Exception as e:
+                self.errors += 1
+                logger.debug(f"Redis SETEX failed for {key}: {e}")
+            finally:
+                self.l2_set_latency.observe(time.perf_counter() - start)
+
+    async def delete(self, key: str):
+        """Remove a key from both tiers"""
+        self.l1.delete(key)
+        if self.redis:
+            try:
+                await self.redis.delete(key)
+            except Exception as e:
+                self.errors += 1
+                logger.debug(f"Redis DEL failed for {key}: {e}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and L2 latency histograms"""
+        lookups = self.l1_hits + self.l2_hits + self.misses
+        return {
+            "redis_connected": self.redis_available,
+            "l1_hits": self.l1_hits,
+            "l2_hits": self.l2_hits,
+            "misses": self.misses,
+            "hit_ratio": round((self.l1_hits + self.l2_hits) / lookups, 4) if lookups else 0.0,
+            "sets": self.sets,
+            "errors": self.errors,
+            "l1_entries": len(self.l1),
+            "l1_bytes": self.l1.current_bytes,
+            "l1_evictions": self.l1.evictions,
+            "l2_get_latency": self.l2_get_latency.snapshot(),
+            "l2_set_latency": self.l2_set_latency.snapshot()
+        }
+
+# Global cache instance
+response_cache = TieredCache()
@@ -0,0 +1,422 @@
+"""
+In-memory career catalog for chat2api
+Loads careers once from Supabase (or the static fallback), refreshes them on a schedule
+and serves text and structured search from precomputed indexes
+"""
+
+import os
+import re
+import time
+import asyncio
+import logging
+from bisect import bisect_left, bisect_right
+from typing import Any, Dict, List, Optional, Set, Tuple
+from supabase_career_service import supabase_career_service
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+_TOKEN = re.compile(r"\w+", re.UNICODE)
+_SALARY_AMOUNT = re.compile(r"(\d[\d,]*(?:\.\d+)?)\s*([kK])?")
+
+# Relative weight of a query token matching each career field
+FIELD_WEIGHTS = {
+    "title": 4.0,
+    "jobTitles": 3.0,
+    "skills": 3.0,
+    "description": 1.0
+}
+# Whole-token matches rank above prefix matches
+EXACT_MATCH_BONUS = 2.0
+
+# Static careers served when Supabase is not configured or returns nothing
+FALLBACK_CAREERS = [
+    {
+        "id": "ai-engineer",
+        "title": "AI Engineer",
+        "description": "Design, develop, and deploy artificial intelligence systems and machine learning models to solve complex business problems.",
+        "skills": ["Python", "Machine Learning", "TensorFlow", "PyTorch", "Deep Learning", "Natural Language Processing", "Computer Vision", "Data Science"],
+        "salary": "$90,000 - $150,000",
+        "experience": "2-5 years",
+        "level": "I",
+        "industry": "tech",
+        "jobTitles": ["AI Engineer", "Machine Learning Engineer", "AI Developer", "ML Engineer", "AI Research Engineer"],
+        "certifications": ["AWS Machine Learning", "Google Cloud ML Engineer", "Microsoft Azure AI Engineer"],
+        "requirements": {
+            "education": ["Bachelor's in Computer Science", "Master's in AI/ML", "Data Science Degree"],
+            "experience": "2-5 years in software development or data science",
+            "skills": ["Python", "Machine Learning", "Deep Learning", "Statistics"]
+        }
+    },
+    {
+        "id": "data-scientist",
+        "title": "Data Scientist",
+        "description": "Analyze complex data sets to extract insights and build predictive models for business decision-making.",
+        "skills": ["Python", "R", "SQL", "Statistics", "Machine Learning", "Data Visualization", "Pandas", "NumPy"],
+        "salary": "$80,000 - $130,000",
+        "experience": "2-5 years",
+        "level": "I",
+        "industry": "tech",
+        "jobTitles": ["Data Scientist", "Senior Data Scientist", "Analytics Engineer", "Research Scientist"],
+        "certifications": ["AWS Certified Data Analytics", "Google Cloud Professional Data Engineer", "Microsoft Certified: Azure Data Scientist"],
+        "requirements": {
+            "education": ["Master's in Data Science", "Statistics", "Computer Science"],
+            "experience": "2-5 years in data analysis or research",
+            "skills": ["Statistics", "Machine Learning", "Python/R", "SQL"]
+        }
+    },
+    {
+        "id": "cybersecurity-analyst",
+        "title": "Cybersecurity Analyst",
+        "description": "Protect organizations from cyber threats by monitoring systems, analyzing security breaches, and implementing security measures.",
+        "skills": ["Network Security", "Incident Response", "Risk Assessment", "SIEM", "Penetration Testing", "Compliance", "Firewall Management"],
+        "salary": "$70,000 - $120,000",
+        "experience": "1-4 years",
+        "level": "I",
+        "industry": "tech",
+        "jobTitles": ["Cybersecurity Analyst", "Security Analyst", "Information Security Analyst", "SOC Analyst"],
+        "certifications": ["CompTIA Security+", "CISSP", "CEH", "GSEC"],
+        "requirements": {
+            "education": ["Bachelor's in Cybersecurity", "Computer Science", "Information Technology"],
+            "experience": "1-4 years in IT or security",
+            "skills": ["Network Security", "Incident Response", "Risk Assessment"]
+        }
+    },
+    {
+        "id": "cloud-engineer",
+        "title": "Cloud Engineer",
+        "description": "Design, implement, and manage cloud infrastructure and services to support scalable applications and systems.",
+        "skills": ["AWS", "Azure", "Google Cloud", "Docker", "Kubernetes", "Terraform", "CI/CD", "Infrastructure as Code"],
+        "salary": "$85,000 - $140,000",
+        "experience": "2-5 years",
+        "level": "I",
+        "industry": "tech",
+        "jobTitles": ["Cloud Engineer", "DevOps Engineer", "Cloud Architect", "Site Reliability Engineer"],
+        "certifications": ["AWS Solutions Architect", "Azure Solutions Architect", "Google Cloud Professional Cloud Architect"],
+        "requirements": {
+            "education": ["Bachelor's in Computer Science", "Information Technology", "Cloud Computing"],
+            "experience": "2-5 years in system administration or development",
+            "skills": ["Cloud Platforms", "Containerization", "Infrastructure as Code"]
+        }
+    },
+    {
+        "id": "software-engineer",
+        "title": "Software Engineer",
+        "description": "Design, develop, and maintain software applications and systems using various programming languages and frameworks.",
+        "skills": ["JavaScript", "Python", "Java", "React", "Node.js", "SQL", "Git", "Agile Development"],
+        "salary": "$70,000 - $130,000",
+        "experience": "1-5 years",
+        "level": "I",
+        "industry": "tech",
+        "jobTitles": ["Software Engineer", "Full Stack Developer", "Backend Developer", "Frontend Developer"],
+        "certifications": ["AWS Certified Developer", "Microsoft Certified: Azure Developer", "Google Cloud Professional Developer"],
+        "requirements": {
+            "education": ["Bachelor's in Computer Science", "Software Engineering", "Bootcamp Certificate"],
+            "experience": "1-5 years in software development",
+            "skills": ["Programming Languages", "Frameworks", "Database Management"]
+        }
+    }
+]
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word tokens"""
+    return _TOKEN.findall(text.lower())
+
+def normalize_skill(skill: str) -> str:
+    """Canonical form used for skill postings"""
+    return " ".join(tokenize(skill))
+
+def parse_salary_range(salary: Any) -> Optional[Tuple[int, int]]:
+    """(min, max) from strings like "$90,000 - $150,000" or "$85k"; None if unparseable"""
+    if not isinstance(salary, str):
+        return None
+    amounts = []
+    for number, thousands in _SALARY_AMOUNT.findall(salary):
+        value = float(number.replace(",", ""))
+        amounts.append(int(value * 1000 if thousands else value))
+    if not amounts:
+        return None
+    return min(amounts), max(amounts)
+
+def iter_bits(mask: int):
+    """Positions of the set bits in mask, lowest first"""
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+class CatalogSnapshot:
+    """Immutable careers list plus the indexes built over it"""
+
+    def __init__(self, careers: List[Dict[str, Any]], source: str, max_prefix_length: int):
+        self.careers = careers
+        self.source = source
+        self.by_id: Dict[str, int] = {}
+        # token -> {career position: best field weight}
+        self.token_index: Dict[str, Dict[int, float]] = {}
+        # token prefix -> {career position: best field weight}
+        self.prefix_index: Dict[str, Dict[int, float]] = {}
+        # normalized skill -> career positions
+        self.skill_postings: Dict[str, List[int]] = {}
+        # Bitsets over career positions for structured search
+        self.all_bits = (1 << len(careers)) - 1
+        self.skill_bits: Dict[str, int] = {}
+        self.level_bits: Dict[str, int] = {}
+        self.industry_bits: Dict[str, int] = {}
+
+        for pos, career in enumerate(careers):
+            self.by_id[career["id"]] = pos
+            for field, weight in FIELD_WEIGHTS.items():
+                value = career.get(field) or []
+                texts = value if isinstance(value, list) else [value]
+                for text in texts:
+                    for token in tokenize(text):
+                        self._post(self.token_index, token, pos, weight)
+                        for end in range(1, min(len(token), max_prefix_length) + 1):
+                            self._post(self.prefix_index, token[:end], pos, weight)
+            for skill in career.get("skills") or []:
+                postings = self.skill_postings.setdefault(normalize_skill(skill), [])
+                if not postings or postings[-1] != pos:
+                    postings.append(pos)
+                self._set_bit(self.skill_bits, normalize_skill(skill), pos)
+            self._set_bit(self.level_bits, normalize_skill(career.get("level") or ""), pos)
+            self._set_bit(self.industry_bits, normalize_skill(career.get("industry") or ""), pos)
+
+        # Salary ranges sorted by bound, with cumulative bitsets so a range
+        # filter is two bisects and an AND
+        ranges = [(pos, parse_salary_range(career.get("salary"))) for pos, career in enumerate(careers)]
+        ranges = [(pos, bounds) for pos, bounds in ranges if bounds]
+        by_min = sorted(ranges, key=lambda item: item[1][0])
+        by_max = sorted(ranges, key=lambda item: item[1][1])
+        self.salary_mins = [bounds[0] for _, bounds in by_min]
+        self.salary_maxes = [bounds[1] for _, bounds in by_max]
+        # _min_prefix_bits[i]: careers with the i lowest minimums
+        self._min_prefix_bits = [0]
+        for pos, _ in by_min:
+            self._min_prefix_bits.append(self._min_prefix_bits[-1] | (1 << pos))
+        # _max_suffix_bits[i]: careers from the i-th lowest maximum upwards
+        self._max_suffix_bits = [0] * (len(by_max) + 1)
+        for i in range(len(by_max) - 1, -1, -1):
+            self._max_suffix_bits[i] = self._max_suffix_bits[i + 1] | (1 << by_max[i][0])
+
+    @staticmethod
+    def _set_bit(index: Dict[str, int], key: str, pos: int):
+        if key:
+            index[key] = index.get(key, 0) | (1 << pos)
+
+    @staticmethod
+    def _post(index: Dict[str, Dict[int, float]], key: str, pos: int, weight: float):
+        postings = index.setdefault(key, {})
+        if postings.get(pos, 0.0) < weight:
+            postings[pos] = weight
+
+    def _matches(self, token: str, max_prefix_length: int) -> Dict[int, float]:
+        """Careers containing a word that starts with token, with their scores"""
+        exact = self.token_index.get(token, {})
+        if len(token) <= max_prefix_length:
+            prefix = self.prefix_index.get(token, {})
+        else:
+            # Longer than the indexed prefixes: narrow by the longest prefix, then verify
+            prefix = {}
+            for pos, weight in self.prefix_index.get(token[:max_prefix_length], {}).items():
+                if any(t.startswith(token) for t in self._career_tokens(pos)):
+                    prefix[pos] = weight
+        scores = dict(prefix)
+        for pos, weight in exact.items():
+            scores[pos] = max(scores.get(pos, 0.0), weight * EXACT_MATCH_BONUS)
+        return scores
+
+    def _career_tokens(self, pos: int) -> Set[str]:
+        career = self.careers[pos]
+        tokens: Set[str] = set()
+        for field in FIELD_WEIGHTS:
+            value = career.get(field) or []
+            for text in value if isinstance(value, list) else [value]:
+                tokens.update(tokenize(text))
+        return tokens
+
+    def search(self, query: str, max_prefix_length: int) -> List[Dict[str, Any]]:
+        """Careers matching every query token, best matches first"""
+        tokens = tokenize(query)
+        if not tokens:
+            return list(self.careers)
+
+        scores: Optional[Dict[int, float]] = None
+        for token in tokens:
+            matches = self._matches(token, max_prefix_length)
+            if scores is None:
+                scores = dict(matches)
+            else:
+                scores = {pos: score + matches[pos] for pos, score in scores.items() if pos in matches}
+            if not scores:
+                return []
+
+        # A query naming a skill exactly ranks careers requiring it first
+        for pos in self.skill_postings.get(" ".join(tokens), []):
+            if pos in scores:
+                scores[pos] += FIELD_WEIGHTS["skills"] * EXACT_MATCH_BONUS
+
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], self.careers[item[0]]["title"]))
+        return [self.careers[pos] for pos, _ in ranked]
+
+    def salary_bits(self, salary_min: Optional[int], salary_max: Optional[int]) -> int:
+        """Careers whose salary range intersects [salary_min, salary_max]"""
+        # Careers paying at most salary_max at the bottom of their range
+        upper = self._min_prefix_bits[-1] if salary_max is None else \
+            self._min_prefix_bits[bisect_right(self.salary_mins, salary_max)]
+        # Careers paying at least salary_min at the top of their range
+        lower = self._max_suffix_bits[0] if salary_min is None else \
+            self._max_suffix_bits[bisect_left(self.salary_maxes, salary_min)]
+        return upper & lower
+
+    def structured_search(self, skills: Optional[List[str]] = None,
+                          salary_min: Optional[int] = None, salary_max: Optional[int] = None,
+                          level: Optional[str] = None, category: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Careers passing every given filter, ranked by number of requested skills they list"""
+        mask = self.all_bits
+        if level:
+            mask &= self.level_bits.get(normalize_skill(level), 0)
+        if category:
+            mask &= self.industry_bits.get(normalize_skill(category), 0)
+        if salary_min is not None or salary_max is not None:
+            mask &= self.salary_bits(salary_min, salary_max)
+        if not mask:
+            return []
+
+        wanted = {normalize_skill(skill) for skill in skills or []} - {""}
+        if not wanted:
+            return [self.careers[pos] for pos in iter_bits(mask)]
+
+        overlap: Dict[int, int] = {}
+        for skill in wanted:
+            for pos in iter_bits(self.skill_bits.get(skill, 0) & mask):
+                overlap[pos] = overlap.get(pos, 0) + 1
+
+        ranked = sorted(overlap.items(), key=lambda item: (-item[1], self.careers[item[0]]["title"]))
+        return [self.careers[pos] for pos, _ in ranked]
+
+class CareerCatalog:
+    """Career catalog loaded at startup and refreshed periodically"""
+
+    def __init__(self):
+        self.refresh_interval = int(os.getenv('CAREER_CATALOG_REFRESH_SECONDS', '3600'))
+        self.page_size = int(os.getenv('CAREER_CATALOG_PAGE_SIZE', '1000'))
+        self.max_prefix_length = int(os.getenv('CAREER_CATALOG_MAX_PREFIX', '12'))
+        self._snapshot = CatalogSnapshot(FALLBACK_CAREERS, "fallback", self.max_prefix_length)
+        self._task: Optional[asyncio.Task] = None
+        self.last_refresh: Optional[float] = None
+
+    async def start(self):
+        """Load the catalog and schedule periodic refreshes"""
+        await self.refresh()
+        if self._task is None and self.refresh_interval > 0:
+            self._task = asyncio.create_task(self._refresh_loop())
+
+    async def stop(self):
+        """Cancel the refresh loop"""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _refresh_loop(self):
+        while True:
+            await asyncio.sleep(self.refresh_interval)
+            await self.refresh()
+
+    async def refresh(self):
+        """Reload careers and rebuild the indexes; the previous snapshot stays on failure"""
+        try:
+            careers = await asyncio.to_thread(self._fetch_careers)
+        except Exception as e:
+            logger.error(f"Failed to load careers for catalog: {e}")
+            return
+
+        if careers:
+            source = "supabase"
+        elif self._snapshot.source == "fallback":
+            careers, source = FALLBACK_CAREERS, "fallback"
+        else:
+            logger.warning("Careers table returned no rows, keeping the current catalog")
+            return
+
+        # Index building is CPU-bound; keep it off the event loop
+        self._snapshot = await asyncio.to_thread(CatalogSnapshot, careers, source, self.max_prefix_length)
+        self.last_refresh = time.time()
+        logger.info(f"Career catalog loaded {len(careers)} careers from {source}")
+
+    def _fetch_careers(self) -> List[Dict[str, Any]]:
+        """Page through the careers table (runs in a worker thread)"""
+        client = supabase_career_service.supabase
+        if client is None:
+            return []
+
+        careers: List[Dict[str, Any]] = []
+        start = 0
+        while True:
+            result = (client.table('careers')
+                      .select('id, title, description, skills, salary, experience, level, industry, '
+                              'job_titles, certifications, requirements')
+                      .order('id')
+                      .range(start, start + self.page_size - 1)
+                      .execute())
+            rows = result.data or []
+            careers.extend(self._to_api_format(row) for row in rows)
+            if len(rows) < self.page_size:
+                return careers
+            start += self.page_size
+
+    @staticmethod
+    def _to_api_format(row: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "id": row["id"],
+            "title": row.get("title") or "",
+            "description": row.get("description") or "",
+            "skills": row.get("skills") or [],
+            "salary": row.get("salary") or "",
+            "experience": row.get("experience") or "",
+            "level": row.get("level") or "",
+            "industry": row.get("industry") or "",
+            "jobTitles": row.get("job_titles") or [],
+            "certifications": row.get("certifications") or [],
+            "requirements": row.get("requirements") or {}
+        }
+
+    def all(self) -> List[Dict[str, Any]]:
+        """All careers in the catalog"""
+        return self._snapshot.careers
+
+    def get(self, career_id: str) -> Optional[Dict[str, Any]]:
+        """A single career by ID"""
+        snapshot = self._snapshot
+        pos = snapshot.by_id.get(career_id)
+        return snapshot.careers[pos] if pos is not None else None
+
+    def search(self, query: str) -> List[Dict[str, Any]]:
+        """Ranked careers whose title, job titles, skills or description match every query word"""
+        return self._snapshot.search(query, self.max_prefix_length)
+
+    def structured_search(self, skills: Optional[List[str]] = None,
+                          salary_min: Optional[int] = None, salary_max: Optional[int] = None,
+                          level: Optional[str] = None, category: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Careers filtered by level, category (industry) and salary overlap, ranked by skill overlap"""
+        return self._snapshot.structured_search(skills, salary_min, salary_max, level, category)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Catalog size and index statistics"""
+        snapshot = self._snapshot
+        return {
+            "source": snapshot.source,
+            "careers": len(snapshot.careers),
+            "indexed_tokens": len(snapshot.token_index),
+            "indexed_prefixes": len(snapshot.prefix_index),
+            "indexed_skills": len(snapshot.skill_postings),
+            "careers_with_salary": len(snapshot.salary_mins)
+        }
+
+# Global catalog instance
+career_catalog = CareerCatalog()
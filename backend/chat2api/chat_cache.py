@@ -0,0 +1,133 @@
+"""
+Chat completion cache keys for chat2api
+Canonical hashing of normalized requests plus an opt-in MinHash index for near-duplicate prompts
+"""
+
+import os
+import re
+import json
+import random
+import hashlib
+import unicodedata
+from collections import OrderedDict
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+
+_WHITESPACE = re.compile(r"\s+")
+_WORD = re.compile(r"\w+", re.UNICODE)
+# Mersenne prime used for the universal hash family
+_MERSENNE_PRIME = (1 << 61) - 1
+
+def normalize_text(text: str) -> str:
+    """Unicode-normalize and collapse whitespace"""
+    return _WHITESPACE.sub(" ", unicodedata.normalize("NFC", text)).strip()
+
+def chat_request_digest(messages: Sequence[Tuple[str, str]], model: str,
+                        temperature: float, max_tokens: int) -> str:
+    """Stable hash of the normalized (role, content) messages and sampling parameters"""
+    payload = {
+        "model": model.strip(),
+        "temperature": round(float(temperature), 3),
+        "max_tokens": int(max_tokens),
+        "messages": [[role.strip().lower(), normalize_text(content)] for role, content in messages]
+    }
+    canonical = json.dumps(payload, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+def chat_params_namespace(model: str, temperature: float, max_tokens: int) -> str:
+    """Only requests with identical sampling parameters may match approximately"""
+    return f"{model.strip()}|{round(float(temperature), 3)}|{int(max_tokens)}"
+
+class MinHashIndex:
+    """Bounded MinHash/LSH index mapping near-duplicate texts to cache keys"""
+
+    def __init__(self, num_perm: int = 64, bands: int = 16, threshold: float = 0.85,
+                 shingle_size: int = 3, max_entries: int = 10000):
+        if num_perm % bands:
+            raise ValueError("num_perm must be divisible by bands")
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.threshold = threshold
+        self.shingle_size = shingle_size
+        self.max_entries = max_entries
+        rng = random.Random(1)
+        self._perms = [(rng.randrange(1, _MERSENNE_PRIME), rng.randrange(0, _MERSENNE_PRIME))
+                       for _ in range(num_perm)]
+        # cache key -> (namespace, signature), in LRU order
+        self._entries: "OrderedDict[str, Tuple[str, Tuple[int, ...]]]" = OrderedDict()
+        self._buckets: Dict[Tuple[str, int, Tuple[int, ...]], Set[str]] = {}
+        self.lookups = 0
+        self.matches = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _shingles(self, text: str) -> Set[str]:
+        words = _WORD.findall(normalize_text(text).lower())
+        if len(words) < self.shingle_size:
+            return {" ".join(words)} if words else set()
+        return {" ".join(words[i:i + self.shingle_size]) for i in range(len(words) - self.shingle_size + 1)}
+
+    def signature(self, text: str) -> Tuple[int, ...]:
+        """MinHash signature of the word shingles in text"""
+        hashes = [int.from_bytes(hashlib.blake2b(s.encode("utf-8"), digest_size=8).digest(), "big")
+                  for s in self._shingles(text)]
+        if not hashes:
+            return tuple([_MERSENNE_PRIME] * self.num_perm)
+        return tuple(min((a * h + b) % _MERSENNE_PRIME for h in hashes) for a, b in self._perms)
+
+    def _bands(self, namespace: str, signature: Tuple[int, ...]) -> List[Tuple[str, int, Tuple[int, ...]]]:
+        return [(namespace, band, signature[band * self.rows:(band + 1) * self.rows])
+                for band in range(self.bands)]
+
+    def add(self, namespace: str, key: str, signature: Tuple[int, ...]):
+        """Index a cache key, evicting the least recently used entry when full"""
+        self._remove(key)
+        self._entries[key] = (namespace, signature)
+        for bucket in self._bands(namespace, signature):
+            self._buckets.setdefault(bucket, set()).add(key)
+        while len(self._entries) > self.max_entries:
+            self._remove(next(iter(self._entries)))
+
+    def _remove(self, key: str):
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        for bucket in self._bands(*entry):
+            keys = self._buckets.get(bucket)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._buckets[bucket]
+
+    def lookup(self, namespace: str, signature: Tuple[int, ...]) -> Optional[str]:
+        """Best indexed key whose estimated Jaccard similarity meets the threshold"""
+        self.lookups += 1
+        candidates: Set[str] = set()
+        for bucket in self._bands(namespace, signature):
+            candidates |= self._buckets.get(bucket, set())
+
+        best_key, best_score = None, self.threshold
+        for key in candidates:
+            other = self._entries[key][1]
+            score = sum(1 for x, y in zip(signature, other) if x == y) / self.num_perm
+            if score >= best_score:
+                best_key, best_score = key, score
+
+        if best_key is not None:
+            self.matches += 1
+            self._entries.move_to_end(best_key)
+        return best_key
+
+    def get_stats(self) -> Dict[str, int]:
+        """Index size and match counters"""
+        return {"entries": len(self._entries), "lookups": self.lookups, "matches": self.matches}
+
+# Approximate matching is opt-in; exact canonical keys are always used
+CHAT_CACHE_APPROXIMATE = os.getenv('CHAT_CACHE_APPROXIMATE', 'false').lower() == 'true'
+
+# Global near-duplicate index instance
+chat_similarity_index = MinHashIndex(
+    threshold=float(os.getenv('CHAT_CACHE_SIMILARITY_THRESHOLD', '0.85')),
+    max_entries=int(os.getenv('CHAT_CACHE_INDEX_MAX_ENTRIES', '10000'))
+)
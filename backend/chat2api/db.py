@@ -0,0 +1,193 @@
+"""
+Shared Postgres access for the trend updaters
+One asyncpg pool per process sized to the configured concurrency, hot statements prepared
+once per connection, and acquire-wait and query latency histograms
+"""
+
+import os
+import time
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Optional
+import asyncpg
+from metrics import LatencyHistogram
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+class TrendConnection(asyncpg.Connection):
+    """Connection that runs registered hot statements through its own prepared statements"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._prepared: Dict[str, asyncpg.prepared_stmt.PreparedStatement] = {}
+
+    async def prepare_hot_statements(self):
+        """Prepare every registered statement; ones whose tables don't exist yet are prepared on first use"""
+        for name, sql in database.statements.items():
+            try:
+                self._prepared[sql] = await self.prepare(sql)
+            except asyncpg.PostgresError as e:
+                logger.debug(f"Deferring prepare of {name}: {e}")
+
+    async def _hot(self, sql: str) -> Optional[asyncpg.prepared_stmt.PreparedStatement]:
+        statement = self._prepared.get(sql)
+        if statement is None and sql in database.statement_names:
+            statement = self._prepared[sql] = await self.prepare(sql)
+        return statement
+
+    async def execute(self, query: str, *args, timeout: Optional[float] = None) -> str:
+        started = time.monotonic()
+        try:
+            statement = await self._hot(query) if args else None
+            if statement is None:
+                return await super().execute(query, *args, timeout=timeout)
+            await statement.fetch(*args, timeout=timeout)
+            return statement.get_statusmsg()
+        finally:
+            database.observe_query(query, time.monotonic() - started)
+
+    async def executemany(self, command: str, args, *, timeout: Optional[float] = None):
+        started = time.monotonic()
+        try:
+            statement = await self._hot(command)
+            if statement is None:
+                return await super().executemany(command, args, timeout=timeout)
+            return await statement.executemany(args, timeout=timeout)
+        finally:
+            database.observe_query(command, time.monotonic() - started)
+
+    async def fetch(self, query: str, *args, timeout: Optional[float] = None, record_class=None):
+        started = time.monotonic()
+        try:
+            statement = await self._hot(query) if record_class is None else None
+            if statement is None:
+                return await super().fetch(query, *args, timeout=timeout, record_class=record_class)
+            return await statement.fetch(*args, timeout=timeout)
+        finally:
+            database.observe_query(query, time.monotonic() - started)
+
+    async def fetchrow(self, query: str, *args, timeout: Optional[float] = None, record_class=None):
+        started = time.monotonic()
+        try:
+            statement = await self._hot(query) if record_class is None else None
+            if statement is None:
+                return await super().fetchrow(query, *args, timeout=timeout, record_class=record_class)
+            return await statement.fetchrow(*args, timeout=timeout)
+        finally:
+            database.observe_query(query, time.monotonic() - started)
+
+    async def fetchval(self, query: str, *args, column: int = 0, timeout: Optional[float] = None):
+        started = time.monotonic()
+        try:
+            statement = await self._hot(query)
+            if statement is None:
+                return await super().fetchval(query, *args, column=column, timeout=timeout)
+            return await statement.fetchval(*args, column=column, timeout=timeout)
+        finally:
+            database.observe_query(query, time.monotonic() - started)
+
+class Database:
+    """The process-wide pool, shared by every updater that connects to it"""
+
+    def __init__(self):
+        self.supabase_url = os.getenv('SUPABASE_URL')
+        self.supabase_key = os.getenv('SUPABASE_SERVICE_ROLE_KEY')
+        self.min_size = int(os.getenv('DB_POOL_MIN_SIZE', '2'))
+        # Explicit maximum; otherwise sized from the concurrency the callers ask for
+        self.max_size_override = int(os.getenv('DB_POOL_MAX_SIZE', '0'))
+        self.pool: Optional[asyncpg.Pool] = None
+        # Largest concurrency any caller has declared, so the pool fits whichever connects first
+        self._planned_concurrency = 0
+        self._users = 0
+        self._lock = asyncio.Lock()
+
+        # Registered hot statements: name -> SQL, and SQL -> name for lookups
+        self.statements: Dict[str, str] = {}
+        self.statement_names: Dict[str, str] = {}
+
+        self.acquire_wait = LatencyHistogram()
+        self.query_latency: Dict[str, LatencyHistogram] = {}
+
+    def register_statement(self, name: str, sql: str):
+        """Mark sql as hot: it is prepared on every connection and timed under name"""
+        self.statements[name] = sql
+        self.statement_names[sql] = name
+
+    def plan_connections(self, concurrency: int):
+        """Declare up front how many connections a caller will hold at once"""
+        self._planned_concurrency = max(self._planned_concurrency, concurrency)
+
+    async def connect(self, concurrency: int = 1) -> 'Database':
+        """Open the pool on first use; concurrency is how many connections the caller may hold at once"""
+        async with self._lock:
+            needed = max(self.min_size, concurrency + 2)
+            if self.pool is None:
+                wanted = self.max_size_override or max(needed, self._planned_concurrency + 2)
+                if not all([self.supabase_url, self.supabase_key]):
+                    raise ValueError("Missing required Supabase environment variables")
+                self.pool = await asyncpg.create_pool(
+                    host=self.supabase_url.replace('https://', '').replace('http://', ''),
+                    port=5432,
+                    user='postgres',
+                    password=self.supabase_key,
+                    database='postgres',
+                    min_size=min(self.min_size, wanted),
+                    max_size=wanted,
+                    connection_class=TrendConnection,
+                    init=lambda conn: conn.prepare_hot_statements()
+                )
+                logger.info(f"Database pool created (max {wanted} connections)")
+            elif not self.max_size_override and needed > self.pool.get_max_size():
+                # The pool can't grow while others hold it; running undersized would stall this caller
+                raise RuntimeError(f"Database pool holds at most {self.pool.get_max_size()} connections, "
+                                   f"fewer than the {needed} needed; call database.plan_connections() "
+                                   f"before the first connect or set DB_POOL_MAX_SIZE")
+            self._users += 1
+        return self
+
+    async def close(self):
+        """Release this caller's use of the pool; the last one closes it"""
+        async with self._lock:
+            self._users = max(0, self._users - 1)
+            if self._users == 0 and self.pool is not None:
+                await self.pool.close()
+                self.pool = None
+                logger.info("Database pool closed")
+
+    @asynccontextmanager
+    async def acquire(self) -> AsyncIterator[TrendConnection]:
+        """Borrow a pooled connection, recording how long the wait took"""
+        if self.pool is None:
+            raise RuntimeError("Database pool is not connected")
+        started = time.monotonic()
+        async with self.pool.acquire() as conn:
+            self.acquire_wait.observe(time.monotonic() - started)
+            yield conn
+
+    def observe_query(self, sql: str, seconds: float):
+        name = self.statement_names.get(sql, 'other')
+        histogram = self.query_latency.get(name)
+        if histogram is None:
+            histogram = self.query_latency[name] = LatencyHistogram()
+        histogram.observe(seconds)
+
+    def get_stats(self) -> Dict[str, Any]:
+        pool = None
+        if self.pool is not None:
+            pool = {
+                "size": self.pool.get_size(),
+                "idle": self.pool.get_idle_size(),
+                "max_size": self.pool.get_max_size()
+            }
+        return {
+            "pool": pool,
+            "users": self._users,
+            "acquire_wait": self.acquire_wait.snapshot(),
+            "queries": {name: histogram.snapshot() for name, histogram in self.query_latency.items()}
+        }
+
+# Global database instance
+database = Database()
@@ -0,0 +1,84 @@
+"""
+Cached AI generation helpers for chat2api
+Cache keys, single-flight generation and stale-while-revalidate on top of the tiered response cache
+"""
+
+import os
+import time
+import asyncio
+import logging
+from typing import Any, Dict, Optional
+from cache_service import response_cache
+from request_coalescer import request_coalescer
+
+logger = logging.getLogger(__name__)
+
+CACHE_TTL = 604800  # 1 week (7 days)
+# How long past its soft expiry a stale-while-revalidate entry may still be served
+CACHE_STALE_TTL = int(os.getenv("CACHE_STALE_TTL", "604800"))
+
+# Background revalidation tasks, kept referenced until they finish
+_revalidation_tasks = set()
+
+def get_cache_key(request_type: str, **kwargs) -> str:
+    """Generate cache key for requests"""
+    key_parts = [request_type]
+    for k, v in sorted(kwargs.items()):
+        if v is not None:
+            key_parts.append(f"{k}:{v}")
+    return ":".join(key_parts)
+
+async def get_cached_response(cache_key: str) -> Optional[Dict[str, Any]]:
+    """Get cached response from the in-process cache or Redis"""
+    return await response_cache.get(cache_key)
+
+async def cache_response(cache_key: str, response: Dict[str, Any], ttl: int = CACHE_TTL):
+    """Cache response in the in-process cache and Redis"""
+    await response_cache.set(cache_key, response, ttl)
+
+async def get_or_generate(cache_key: str, producer, ttl: int = CACHE_TTL):
+    """Return a cached response, or run producer once per key across concurrent requests"""
+    cached = await get_cached_response(cache_key)
+    if cached:
+        return cached
+    return await request_coalescer.run(cache_key, producer, ttl)
+
+def make_swr_entry(value: Any, ttl: int) -> Dict[str, Any]:
+    """Wrap a value with its soft (revalidate) and hard (evict) expiries"""
+    now = time.time()
+    return {"value": value, "soft_expiry": now + ttl, "hard_expiry": now + ttl + CACHE_STALE_TTL}
+
+def is_fresh_swr_entry(entry: Any) -> bool:
+    """True for a stale-while-revalidate entry that is still within its soft TTL"""
+    return isinstance(entry, dict) and "soft_expiry" in entry and entry["soft_expiry"] > time.time()
+
+async def cache_swr_response(cache_key: str, value: Any, ttl: int = CACHE_TTL):
+    """Cache a value as a stale-while-revalidate entry"""
+    await cache_response(cache_key, make_swr_entry(value, ttl), ttl + CACHE_STALE_TTL)
+
+async def get_or_generate_swr(cache_key: str, producer, ttl: int = CACHE_TTL):
+    """Serve fresh or stale cached values immediately, refreshing stale ones in the background"""
+    async def produce_entry():
+        return make_swr_entry(await producer(), ttl)
+    
+    def generate_entry():
+        return request_coalescer.run(cache_key, produce_entry, ttl + CACHE_STALE_TTL,
+                                     accept=is_fresh_swr_entry)
+    
+    entry = await get_cached_response(cache_key)
+    if isinstance(entry, dict) and "soft_expiry" in entry:
+        if entry["soft_expiry"] <= time.time():
+            # Drop the local copy so the refresh sees entries other workers already renewed
+            response_cache.l1.delete(cache_key)
+            task = asyncio.create_task(generate_entry())
+            _revalidation_tasks.add(task)
+            task.add_done_callback(_finish_revalidation)
+        return entry["value"]
+    
+    entry = await generate_entry()
+    return entry["value"]
+
+def _finish_revalidation(task: asyncio.Task):
+    _revalidation_tasks.discard(task)
+    if not task.cancelled() and task.exception() is not None:
+        logger.warning(f"Background cache revalidation failed: {task.exception()}")
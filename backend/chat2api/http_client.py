@@ -0,0 +1,226 @@
+"""
+Shared upstream HTTP client for chat2api
+One application-scoped httpx.AsyncClient with pooled keep-alive connections to OpenAI,
+plus connection metrics for the aiohttp sessions the trend updaters keep
+"""
+
+import os
+import time
+import logging
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Optional
+import httpx
+import aiohttp
+from metrics import LatencyHistogram
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+class UpstreamHTTPClient:
+    """Pooled HTTP client with per-phase timeouts and pool saturation metrics"""
+
+    def __init__(self):
+        self.max_connections = int(os.getenv('OPENAI_MAX_CONNECTIONS', '100'))
+        self.max_keepalive_connections = int(os.getenv('OPENAI_MAX_KEEPALIVE_CONNECTIONS', '20'))
+        self.keepalive_expiry = float(os.getenv('OPENAI_KEEPALIVE_EXPIRY', '30'))
+        self.connect_timeout = float(os.getenv('OPENAI_CONNECT_TIMEOUT', '5'))
+        self.read_timeout = float(os.getenv('OPENAI_READ_TIMEOUT', '60'))
+        self.write_timeout = float(os.getenv('OPENAI_WRITE_TIMEOUT', '10'))
+        self.pool_timeout = float(os.getenv('OPENAI_POOL_TIMEOUT', '5'))
+        self.http2 = os.getenv('OPENAI_HTTP2', 'true').lower() == 'true' and HTTP2_AVAILABLE
+        self.client: Optional[httpx.AsyncClient] = None
+
+        # Metrics
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.requests = 0
+        self.errors = 0
+        self.pool_timeouts = 0
+        self.latency = LatencyHistogram()
+
+    async def start(self):
+        """Create the shared client"""
+        if self.client is not None:
+            return
+        self.client = httpx.AsyncClient(
+            http2=self.http2,
+            limits=httpx.Limits(
+                max_connections=self.max_connections,
+                max_keepalive_connections=self.max_keepalive_connections,
+                keepalive_expiry=self.keepalive_expiry
+            ),
+            timeout=httpx.Timeout(
+                connect=self.connect_timeout,
+                read=self.read_timeout,
+                write=self.write_timeout,
+                pool=self.pool_timeout
+            )
+        )
+        logger.info(f"Upstream HTTP client started (max {self.max_connections} connections, http2={self.http2})")
+
+    async def close(self):
+        """Close the shared client and its pooled connections"""
+        if self.client is not None:
+            await self.client.aclose()
+            self.client = None
+
+    def _get_client(self) -> httpx.AsyncClient:
+        if self.client is None:
+            raise RuntimeError("Upstream HTTP client used before startup")
+        return self.client
+
+    def _enter(self):
+        self.requests += 1
+        self.in_flight += 1
+        if self.in_flight > self.max_in_flight:
+            self.max_in_flight = self.in_flight
+
+    def _exit(self, start: float, error: Optional[BaseException]):
+        self.in_flight -= 1
+        self.latency.observe(time.perf_counter() - start)
+        if isinstance(error, httpx.PoolTimeout):
+            self.pool_timeouts += 1
+        if error is not None:
+            self.errors += 1
+
+    async def post(self, url: str, **kwargs: Any) -> httpx.Response:
+        """POST through the shared pool"""
+        client = self._get_client()
+        start = time.perf_counter()
+        error = None
+        self._enter()
+        try:
+            return await client.post(url, **kwargs)
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            self._exit(start, error)
+
+    @asynccontextmanager
+    async def stream(self, method: str, url: str, **kwargs: Any) -> AsyncIterator[httpx.Response]:
+        """Open a streaming request; the connection returns to the pool on exit"""
+        client = self._get_client()
+        start = time.perf_counter()
+        error = None
+        self._enter()
+        try:
+            async with client.stream(method, url, **kwargs) as response:
+                yield response
+        except BaseException as e:
+            error = e
+            raise
+        finally:
+            self._exit(start, error)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Pool configuration and saturation metrics"""
+        return {
+            "http2": self.http2,
+            "max_connections": self.max_connections,
+            "in_flight": self.in_flight,
+            "max_in_flight": self.max_in_flight,
+            "saturation": round(self.in_flight / self.max_connections, 4) if self.max_connections else 0.0,
+            "peak_saturation": round(self.max_in_flight / self.max_connections, 4) if self.max_connections else 0.0,
+            "requests": self.requests,
+            "errors": self.errors,
+            "pool_timeouts": self.pool_timeouts,
+            "latency": self.latency.snapshot()
+        }
+
+class ConnectionMetrics:
+    """Connection reuse, pool waits and DNS cache hits for aiohttp sessions, fed by a TraceConfig"""
+
+    def __init__(self):
+        self.requests = 0
+        self.errors = 0
+        self.connections_created = 0
+        self.connections_reused = 0
+        self.queued = 0
+        self.dns_cache_hits = 0
+        self.dns_cache_misses = 0
+        self.connect_latency = LatencyHistogram()
+        self.queue_wait = LatencyHistogram()
+        self.latency = LatencyHistogram()
+        # Connector limits of the sessions reporting here, for sizing against concurrency
+        self.limits: Dict[str, int] = {}
+
+    def trace_config(self) -> aiohttp.TraceConfig:
+        """TraceConfig to pass to aiohttp.ClientSession(trace_configs=[...])"""
+        trace = aiohttp.TraceConfig()
+
+        async def on_request_start(session, context, params):
+            context.started = time.monotonic()
+
+        async def on_request_end(session, context, params):
+            self.requests += 1
+            self.latency.observe(time.monotonic() - context.started)
+
+        async def on_request_exception(session, context, params):
+            self.requests += 1
+            self.errors += 1
+
+        async def on_queued_start(session, context, params):
+            self.queued += 1
+            context.queued = time.monotonic()
+
+        async def on_queued_end(session, context, params):
+            self.queue_wait.observe(time.monotonic() - context.queued)
+
+        async def on_create_start(session, context, params):
+            context.connecting = time.monotonic()
+
+        async def on_create_end(session, context, params):
+            self.connections_created += 1
+            self.connect_latency.observe(time.monotonic() - context.connecting)
+
+        async def on_reuse(session, context, params):
+            self.connections_reused += 1
+
+        async def on_dns_hit(session, context, params):
+            self.dns_cache_hits += 1
+
+        async def on_dns_miss(session, context, params):
+            self.dns_cache_misses += 1
+
+        trace.on_request_start.append(on_request_start)
+        trace.on_request_end.append(on_request_end)
+        trace.on_request_exception.append(on_request_exception)
+        trace.on_connection_queued_start.append(on_queued_start)
+        trace.on_connection_queued_end.append(on_queued_end)
+        trace.on_connection_create_start.append(on_create_start)
+        trace.on_connection_create_end.append(on_create_end)
+        trace.on_connection_reuseconn.append(on_reuse)
+        trace.on_dns_cache_hit.append(on_dns_hit)
+        trace.on_dns_cache_miss.append(on_dns_miss)
+        return trace
+
+    def get_stats(self) -> Dict[str, Any]:
+        connections = self.connections_created + self.connections_reused
+        return {
+            "limits": self.limits,
+            "requests": self.requests,
+            "errors": self.errors,
+            "connections_created": self.connections_created,
+            "connections_reused": self.connections_reused,
+            "reuse_ratio": round(self.connections_reused / connections, 4) if connections else 0.0,
+            "queued": self.queued,
+            "dns_cache_hits": self.dns_cache_hits,
+            "dns_cache_misses": self.dns_cache_misses,
+            "connect_latency": self.connect_latency.snapshot(),
+            "queue_wait": self.queue_wait.snapshot(),
+            "latency": self.latency.snapshot()
+        }
+
+# Global client instance for OpenAI forwarding
+openai_http_client = UpstreamHTTPClient()
+
+# Connection metrics for the language-specific trend updater's chat2api session
+chat2api_connection_metrics = ConnectionMetrics()
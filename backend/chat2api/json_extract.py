@@ -0,0 +1,161 @@
+"""
+JSON extraction for LLM responses
+Incrementally finds the first balanced JSON value in model output (prose, code fences
+and trailing text included) and validates it against a small JSON Schema subset
+"""
+
+import re
+import json
+from typing import Any, Dict, List, Optional
+
+_CLOSERS = {"{": "}", "[": "]"}
+# Characters that change scanner state outside string literals
+_STRUCTURAL = re.compile(r'["{}\[\]]')
+# A complete string literal, escapes included
+_STRING = re.compile(r'"(?:[^"\\]|\\.)*"', re.DOTALL)
+_decoder = json.JSONDecoder()
+
+class JSONExtractionError(ValueError):
+    """No complete JSON value of the expected kind was found"""
+
+class JSONSchemaError(ValueError):
+    """An extracted value does not match its schema"""
+
+class JSONValueScanner:
+    """Locates the first balanced, parseable JSON object or array in text fed chunk by chunk
+
+    Already-scanned characters are never rescanned unless a candidate turns out
+    not to be JSON, so feeding a streamed response costs O(total length).
+    """
+
+    def __init__(self, openers: str = "{["):
+        self.openers = openers
+        self._text = ""
+        self._pos = 0
+        self._start = -1
+        self._stack: List[str] = []
+        self.value: Any = None
+        self.done = False
+
+    def feed(self, chunk: str) -> bool:
+        """Add text; returns True once a complete JSON value has been found"""
+        if self.done or not chunk:
+            return self.done
+        self._text += chunk
+        self._scan()
+        return self.done
+
+    def finish(self) -> bool:
+        """Mark the end of input; an opener that never closed is retried as stray text"""
+        while not self.done and self._start != -1:
+            self._reset_candidate()
+            self._scan()
+        return self.done
+
+    def _reset_candidate(self):
+        # Resume the search just after the opener that did not lead to JSON
+        self._pos = self._start + 1
+        self._start = -1
+        self._stack = []
+
+    def _scan(self):
+        text = self._text
+        while self._pos < len(text):
+            if self._start == -1:
+                starts = [i for i in (text.find(o, self._pos) for o in self.openers) if i != -1]
+                if not starts:
+                    self._pos = len(text)
+                    return
+                self._start = self._pos = min(starts)
+
+            # Jump straight to the next character that can change state
+            match = _STRUCTURAL.search(text, self._pos)
+            if match is None:
+                self._pos = len(text)
+                return
+            char = match.group()
+            if char == '"':
+                literal = _STRING.match(text, match.start())
+                if literal is None:
+                    # String still arriving; rescan it once more text is fed
+                    self._pos = match.start()
+                    return
+                self._pos = literal.end()
+                continue
+            if char in _CLOSERS:
+                self._stack.append(_CLOSERS[char])
+            elif char != self._stack.pop():
+                self._reset_candidate()
+                continue
+            self._pos = match.end()
+            if not self._stack:
+                try:
+                    self.value = json.loads(text[self._start:self._pos])
+                except ValueError:
+                    self._reset_candidate()
+                    continue
+                self.done = True
+                return
+
+    def result(self) -> Any:
+        """The extracted value; raises if the text held no complete JSON value"""
+        if not self.done:
+            raise JSONExtractionError("No complete JSON value found in response")
+        return self.value
+
+def extract_json(text: str, openers: str = "{[", schema: Optional[Dict[str, Any]] = None) -> Any:
+    """First JSON object or array in text, optionally validated against schema"""
+    value = _decode_first(text or "", openers)
+    if schema is not None:
+        validate_schema(value, schema)
+    return value
+
+def _decode_first(text: str, openers: str) -> Any:
+    """Whole-text equivalent of JSONValueScanner: the C decoder tries each opener in turn"""
+    pos = 0
+    while True:
+        starts = [i for i in (text.find(o, pos) for o in openers) if i != -1]
+        if not starts:
+            raise JSONExtractionError("No complete JSON value found in response")
+        start = min(starts)
+        try:
+            return _decoder.raw_decode(text, start)[0]
+        except ValueError:
+            pos = start + 1
+
+_TYPE_CHECKS = {
+    "object": lambda v: isinstance(v, dict),
+    "array": lambda v: isinstance(v, list),
+    "string": lambda v: isinstance(v, str),
+    "number": lambda v: isinstance(v, (int, float)) and not isinstance(v, bool),
+    "integer": lambda v: isinstance(v, int) and not isinstance(v, bool),
+    "boolean": lambda v: isinstance(v, bool),
+    "null": lambda v: v is None
+}
+
+def validate_schema(value: Any, schema: Dict[str, Any], path: str = "$"):
+    """Validate against the type, enum, minimum, maximum, required, properties and items keywords"""
+    expected = schema.get("type")
+    if expected is not None:
+        types = expected if isinstance(expected, list) else [expected]
+        if not any(_TYPE_CHECKS[t](value) for t in types):
+            raise JSONSchemaError(f"{path}: expected {' or '.join(types)}, got {type(value).__name__}")
+
+    if "enum" in schema and value not in schema["enum"]:
+        raise JSONSchemaError(f"{path}: {value!r} is not one of {schema['enum']}")
+    if _TYPE_CHECKS["number"](value):
+        if "minimum" in schema and value < schema["minimum"]:
+            raise JSONSchemaError(f"{path}: {value} is below {schema['minimum']}")
+        if "maximum" in schema and value > schema["maximum"]:
+            raise JSONSchemaError(f"{path}: {value} is above {schema['maximum']}")
+
+    if isinstance(value, dict):
+        for key in schema.get("required", []):
+            if key not in value:
+                raise JSONSchemaError(f"{path}: missing required field '{key}'")
+        for key, subschema in schema.get("properties", {}).items():
+            if key in value:
+                validate_schema(value[key], subschema, f"{path}.{key}")
+    elif isinstance(value, list) and "items" in schema:
+        for i, item in enumerate(value):
+            validate_schema(item, schema["items"], f"{path}[{i}]")
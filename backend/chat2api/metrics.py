@@ -0,0 +1,55 @@
+"""
+Lightweight in-process metrics for chat2api
+Counters and latency histograms exposed through the /api/metrics endpoint
+"""
+
+import bisect
+from typing import Dict, Any, List
+
+# Histogram bucket upper bounds in milliseconds
+DEFAULT_LATENCY_BUCKETS_MS = [1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000]
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram with count, sum and max"""
+
+    def __init__(self, buckets_ms: List[float] = None):
+        self.buckets_ms = list(buckets_ms or DEFAULT_LATENCY_BUCKETS_MS)
+        # One extra slot for observations above the last bound
+        self.counts = [0] * (len(self.buckets_ms) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def observe(self, seconds: float):
+        """Record a single latency observation given in seconds"""
+        ms = seconds * 1000.0
+        self.counts[bisect.bisect_left(self.buckets_ms, ms)] += 1
+        self.count += 1
+        self.total_ms += ms
+        if ms > self.max_ms:
+            self.max_ms = ms
+
+    def percentile(self, pct: float) -> float:
+        """Approximate percentile (upper bucket bound) in milliseconds"""
+        if not self.count:
+            return 0.0
+        threshold = self.count * pct / 100.0
+        seen = 0
+        for i, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if seen >= threshold:
+                return self.buckets_ms[i] if i < len(self.buckets_ms) else self.max_ms
+        return self.max_ms
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return a JSON-serializable view of the histogram"""
+        buckets = {f"le_{bound}": count for bound, count in zip(self.buckets_ms, self.counts)}
+        buckets["le_inf"] = self.counts[-1]
+        return {
+            "count": self.count,
+            "avg_ms": round(self.total_ms / self.count, 3) if self.count else 0.0,
+            "p50_ms": self.percentile(50),
+            "p99_ms": self.percentile(99),
+            "max_ms": round(self.max_ms, 3),
+            "buckets": buckets
+        }
@@ -0,0 +1,75 @@
+"""
+Request and response models for chat2api
+Pydantic models shared by the API routers
+"""
+
+from pydantic import BaseModel
+from typing import List, Optional, Dict, Any
+
+class ChatMessage(BaseModel):
+    role: str
+    content: str
+
+class ChatRequest(BaseModel):
+    model: str = "gpt-3.5-turbo"
+    messages: List[ChatMessage]
+    temperature: float = 0.7
+    max_tokens: int = 2000
+    stream: bool = False
+
+class ChatResponse(BaseModel):
+    id: str
+    object: str = "chat.completion"
+    created: int
+    model: str
+    choices: List[Dict[str, Any]]
+    usage: Dict[str, int]
+
+class JobMarketRequest(BaseModel):
+    industry: Optional[str] = "technology"
+    location: Optional[str] = "United States"
+    limit: int = 50
+
+class CareerData(BaseModel):
+    id: str
+    title: str
+    description: str
+    skills: List[str]
+    salary: str
+    experience: str
+    level: str  # E, I, A, X
+    industry: str
+    jobTitles: List[str]
+    certifications: List[str]
+    requirements: Dict[str, Any]
+
+class MarketTrendsRequest(BaseModel):
+    industries: Optional[List[str]] = None
+
+class SkillsRequest(BaseModel):
+    skill_name: Optional[str] = None
+
+class SkillsAssessmentRequest(BaseModel):
+    skills: List[str]
+    experience_level: str
+    current_role: str
+    experience_details: str
+    selected_career_goal: str
+    goals_details: str
+
+class CareerUpdateRequest(BaseModel):
+    careerId: str
+    updates: Dict[str, Any]
+
+class CareerRoadmapRequest(BaseModel):
+    careerId: str
+    currentLevel: str
+    targetLevel: str
+    skills: List[str]
+    experience: str
+
+class CareerSearchRequest(BaseModel):
+    skills: Optional[List[str]] = None
+    salary: Optional[Dict[str, int]] = None
+    level: Optional[str] = None
+    category: Optional[str] = None
@@ -9,12 +9,20 @@ import json
 import asyncio
 import logging
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Tuple
+from typing import AsyncIterator, Dict, Iterable, List, Optional, Sequence, Tuple
 import aiohttp
-import asyncpg
-from dataclasses import dataclass
+from dataclasses import asdict
 import time
 from translation_service import translation_service
+from async_pipeline import AsyncPipeline, PipelineStage
+from rate_limiter import rate_limiters, estimate_tokens
+from db import database
+from trend_models import CareerTrendData, trend_upsert_sql, trend_upsert_args
+from json_extract import extract_json, JSONExtractionError, JSONSchemaError
+from response_parsers import TREND_ANALYSIS_SCHEMA
+from trend_checkpoints import TrendCheckpointStore
+from progress_reporter import progress_registry
+from batch_writer import BatchWriter, Statement
 
 # Configure logging
 logging.basicConfig(
@@ -27,26 +35,28 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-@dataclass
-class CareerTrendData:
-    """Data structure for career trend information"""
-    career_id: str
-    trend_score: float  # 0-10 scale
-    trend_direction: str  # 'rising', 'stable', 'declining'
-    demand_level: str  # 'high', 'medium', 'low'
-    growth_rate: float  # Percentage
-    market_insights: str
-    key_skills_trending: List[str]
-    salary_trend: str
-    job_availability_score: float  # 0-10 scale
-    top_locations: List[str]
-    remote_work_trend: float  # 0-10 scale
-    industry_impact: str
-    automation_risk: float  # 0-10 scale
-    future_outlook: str
-    confidence_score: float  # 0-10 scale
-    currency_code: str = 'USD'  # Default to USD
-    salary_data: Dict = None  # Salary data by region/currency
+HISTORY_INSERT_SQL = """
+INSERT INTO career_trend_history (career_id, trend_data, currency_code, month_year)
+VALUES ($1, $2, $3, $4)
+"""
+
+TRANSLATION_UPSERT_SQL = """
+INSERT INTO career_trend_translations (
+    career_id, language_code, market_insights, salary_trend,
+    industry_impact, future_outlook, created_at, updated_at
+) VALUES ($1, $2, $3, $4, $5, $6, NOW(), NOW())
+ON CONFLICT (career_id, language_code) DO UPDATE SET
+    market_insights = EXCLUDED.market_insights,
+    salary_trend = EXCLUDED.salary_trend,
+    industry_impact = EXCLUDED.industry_impact,
+    future_outlook = EXCLUDED.future_outlook,
+    updated_at = NOW()
+"""
+
+# Hot statements, prepared once on every pooled connection
+database.register_statement('trend_upsert', trend_upsert_sql())
+database.register_statement('history_insert', HISTORY_INSERT_SQL)
+database.register_statement('translation_upsert', TRANSLATION_UPSERT_SQL)
 
 class MonthlyTrendUpdater:
     """Main class for updating career trends monthly"""
@@ -61,8 +71,24 @@ class MonthlyTrendUpdater:
             raise ValueError("Missing required Supabase environment variables")
         
         self.db_pool = None
+        self.batch_writer = None
         self.session = None
         
+        # Per-stage concurrency of the update pipeline
+        self.analyze_concurrency = int(os.getenv('TREND_ANALYZE_CONCURRENCY', '4'))
+        # Saves mostly wait on the batch writer, so enough of them to fill a batch
+        self.save_concurrency = int(os.getenv('TREND_SAVE_CONCURRENCY', os.getenv('DB_WRITE_BATCH_SIZE', '20')))
+        self.translate_concurrency = int(os.getenv('TREND_TRANSLATE_CONCURRENCY', '2'))
+        # Analysis and translation workers each may hold a connection, while saves go through the
+        # batch writer; declared now so the shared pool is big enough even if another updater opens it
+        self.db_concurrency = self.analyze_concurrency + self.translate_concurrency + 2
+        database.plan_connections(self.db_concurrency)
+        self.pipeline_queue_size = int(os.getenv('TREND_PIPELINE_QUEUE_SIZE', '0'))
+        # Careers fetched per keyset page when scanning for due careers
+        self.scan_page_size = int(os.getenv('TREND_SCAN_PAGE_SIZE', '100'))
+        # 'incremental' rolls up only industries whose careers were updated in the run
+        self.industry_rollup_mode = os.getenv('TREND_INDUSTRY_ROLLUP', 'full')
+        
         # Currency mapping for regions
         self.currency_mapping = {
             'north-america': 'USD',
@@ -118,16 +144,10 @@ class MonthlyTrendUpdater:
     async def initialize(self):
         """Initialize database connection and HTTP session"""
         try:
-            # Create database connection pool
-            self.db_pool = await asyncpg.create_pool(
-                host=self.supabase_url.replace('https://', '').replace('http://', ''),
-                port=5432,
-                user='postgres',
-                password=self.supabase_key,
-                database='postgres',
-                min_size=5,
-                max_size=20
-            )
+            # Shared process pool
+            self.db_pool = await database.connect(self.db_concurrency)
+            # Trend, history, translation and checkpoint writes share one transaction per batch
+            self.batch_writer = BatchWriter(self.db_pool)
             
             # Create HTTP session
             self.session = aiohttp.ClientSession()
@@ -143,36 +163,72 @@ class MonthlyTrendUpdater:
     
     async def cleanup(self):
         """Clean up resources"""
+        if self.batch_writer:
+            await self.batch_writer.flush()
         if self.db_pool:
             await self.db_pool.close()
         if self.session:
             await self.session.close()
         await translation_service.cleanup()
     
-    async def get_careers_to_update(self) -> List[Dict]:
-        """Get careers that need trend updates"""
+    async def get_careers_to_update(self, cutoff: datetime) -> AsyncIterator[List[Dict]]:
+        """Yield pages of careers that need trend updates, walking the whole catalog by keyset
+        
+        Careers without trend data come first, then careers whose next_update_due is at or
+        before cutoff (the run's start time, so rows saved during the run are not revisited).
+        """
+        columns = "c.id, c.title, c.industry, c.skills, c.level, c.description"
         try:
-            async with self.db_pool.acquire() as conn:
-                # Get careers that haven't been updated in the last month
-                query = """
-                SELECT c.id, c.title, c.industry, c.skills, c.level, c.description
-                FROM careers c
-                LEFT JOIN career_trends ct ON c.id = ct.career_id
-                WHERE ct.last_updated IS NULL 
-                   OR ct.last_updated < NOW() - INTERVAL '1 month'
-                ORDER BY c.industry, c.title
-                LIMIT 100
-                """
-                
-                rows = await conn.fetch(query)
-                careers = [dict(row) for row in rows]
-                
-                logger.info(f"Found {len(careers)} careers to update")
-                return careers
+            # Careers never analysed, paged by id
+            last_id = ''
+            while True:
+                async with self.db_pool.acquire() as conn:
+                    rows = await conn.fetch(f"""
+                    SELECT {columns}
+                    FROM careers c
+                    WHERE c.id > $1
+                      AND NOT EXISTS (
+                          SELECT 1 FROM career_trends ct
+                          WHERE ct.career_id = c.id AND ct.next_update_due IS NOT NULL
+                      )
+                    ORDER BY c.id
+                    LIMIT $2
+                    """, last_id, self.scan_page_size)
+                if not rows:
+                    break
+                last_id = rows[-1]['id']
+                yield [dict(row) for row in rows]
+            
+            # Due careers, paged by (next_update_due, career_id) on idx_career_trends_due
+            last_due = None
+            while True:
+                async with self.db_pool.acquire() as conn:
+                    if last_due is None:
+                        rows = await conn.fetch(f"""
+                        SELECT {columns}, ct.next_update_due
+                        FROM career_trends ct
+                        JOIN careers c ON c.id = ct.career_id
+                        WHERE ct.next_update_due <= $1
+                        ORDER BY ct.next_update_due, ct.career_id
+                        LIMIT $2
+                        """, cutoff, self.scan_page_size)
+                    else:
+                        rows = await conn.fetch(f"""
+                        SELECT {columns}, ct.next_update_due
+                        FROM career_trends ct
+                        JOIN careers c ON c.id = ct.career_id
+                        WHERE ct.next_update_due <= $1
+                          AND (ct.next_update_due, ct.career_id) > ($3, $4)
+                        ORDER BY ct.next_update_due, ct.career_id
+                        LIMIT $2
+                        """, cutoff, self.scan_page_size, last_due, last_id)
+                if not rows:
+                    break
+                last_due, last_id = rows[-1]['next_update_due'], rows[-1]['id']
+                yield [{key: value for key, value in row.items() if key != 'next_update_due'} for row in rows]
                 
         except Exception as e:
             logger.error(f"Failed to get careers to update: {e}")
-            return []
     
     async def analyze_career_trend(self, career: Dict) -> Optional[CareerTrendData]:
         """Use chat2api to analyze career trends"""
@@ -180,6 +236,10 @@ class MonthlyTrendUpdater:
             # Prepare prompt for chat2api
             prompt = self._create_trend_analysis_prompt(career)
             
+            # Wait for request and token budget on the shared limiter
+            limiter = rate_limiters.get('chat2api', 'gpt-4')
+            reserved = await limiter.acquire(estimate_tokens(prompt, 2000))
+            
             # Call chat2api
             async with self.session.post(
                 f"{self.chat2api_url}/api/v1/chat/completions",
@@ -205,10 +265,13 @@ class MonthlyTrendUpdater:
             ) as response:
                 
                 if response.status != 200:
+                    limiter.record(response.status, response.headers)
                     logger.error(f"Chat2API request failed: {response.status}")
                     return None
                 
                 result = await response.json()
+                limiter.record(response.status, response.headers, reserved,
+                               (result.get('usage') or {}).get('total_tokens'))
                 content = result['choices'][0]['message']['content']
                 
                 # Parse the response
@@ -275,16 +338,15 @@ class MonthlyTrendUpdater:
     def _parse_trend_response(self, content: str, career_id: str) -> Optional[CareerTrendData]:
         """Parse the chat2api response into structured data"""
         try:
-            # Extract JSON from response
-            start_idx = content.find('{')
-            end_idx = content.rfind('}') + 1
-            
-            if start_idx == -1 or end_idx == 0:
+            # Extract the first JSON object, ignoring surrounding prose and code fences
+            try:
+                data = extract_json(content, "{", TREND_ANALYSIS_SCHEMA)
+            except JSONExtractionError:
                 logger.error(f"No JSON found in response for {career_id}")
                 return None
-            
-            json_str = content[start_idx:end_idx]
-            data = json.loads(json_str)
+            except JSONSchemaError as e:
+                logger.error(f"Invalid trend data for {career_id}: {e}")
+                return None
             
             # Extract salary information for currency conversion
             salary_info = data.get('salary_info', {})
@@ -324,108 +386,55 @@ class MonthlyTrendUpdater:
             logger.error(f"Failed to parse trend response for {career_id}: {e}")
             return None
     
-    async def save_trend_data(self, trend_data: CareerTrendData) -> bool:
-        """Save trend data to Supabase"""
+    async def save_trend_data(self, trend_data: CareerTrendData, extra_statements: Sequence[Statement] = ()) -> bool:
+        """Save trend data to Supabase, batched with other careers' saves into one transaction
+        
+        extra_statements are committed atomically with the trend data.
+        """
         try:
-            async with self.db_pool.acquire() as conn:
-                # Insert or update career trend
-                query = """
-                INSERT INTO career_trends (
-                    career_id, trend_score, trend_direction, demand_level, growth_rate,
-                    market_insights, key_skills_trending, salary_trend, job_availability_score,
-                    top_locations, remote_work_trend, industry_impact, automation_risk,
-                    future_outlook, confidence_score, next_update_due
-                ) VALUES (
-                    $1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $12, $13, $14, $15, $16
-                )
-                ON CONFLICT (career_id) DO UPDATE SET
-                    trend_score = EXCLUDED.trend_score,
-                    trend_direction = EXCLUDED.trend_direction,
-                    demand_level = EXCLUDED.demand_level,
-                    growth_rate = EXCLUDED.growth_rate,
-                    market_insights = EXCLUDED.market_insights,
-                    key_skills_trending = EXCLUDED.key_skills_trending,
-                    salary_trend = EXCLUDED.salary_trend,
-                    job_availability_score = EXCLUDED.job_availability_score,
-                    top_locations = EXCLUDED.top_locations,
-                    remote_work_trend = EXCLUDED.remote_work_trend,
-                    industry_impact = EXCLUDED.industry_impact,
-                    automation_risk = EXCLUDED.automation_risk,
-                    future_outlook = EXCLUDED.future_outlook,
-                    confidence_score = EXCLUDED.confidence_score,
-                    last_updated = NOW(),
-                    next_update_due = EXCLUDED.next_update_due
-                """
-                
-                next_update = datetime.now() + timedelta(days=30)
-                
-                await conn.execute(
-                    query,
-                    trend_data.career_id,
-                    trend_data.trend_score,
-                    trend_data.trend_direction,
-                    trend_data.demand_level,
-                    trend_data.growth_rate,
-                    trend_data.market_insights,
-                    trend_data.key_skills_trending,
-                    trend_data.salary_trend,
-                    trend_data.job_availability_score,
-                    trend_data.top_locations,
-                    trend_data.remote_work_trend,
-                    trend_data.industry_impact,
-                    trend_data.automation_risk,
-                    trend_data.future_outlook,
-                    trend_data.confidence_score,
-                    trend_data.currency_code,
-                    trend_data.salary_data,
-                    next_update
-                )
-                
-                # Save to history
-                history_query = """
-                INSERT INTO career_trend_history (career_id, trend_data, currency_code, month_year)
-                VALUES ($1, $2, $3, $4)
-                """
-                
-                current_month = datetime.now().strftime('%Y-%m')
-                trend_json = {
-                    'trend_score': trend_data.trend_score,
-                    'trend_direction': trend_data.trend_direction,
-                    'demand_level': trend_data.demand_level,
-                    'growth_rate': trend_data.growth_rate,
-                    'market_insights': trend_data.market_insights,
-                    'key_skills_trending': trend_data.key_skills_trending,
-                    'salary_trend': trend_data.salary_trend,
-                    'job_availability_score': trend_data.job_availability_score,
-                    'top_locations': trend_data.top_locations,
-                    'remote_work_trend': trend_data.remote_work_trend,
-                    'industry_impact': trend_data.industry_impact,
-                    'automation_risk': trend_data.automation_risk,
-                    'future_outlook': trend_data.future_outlook,
-                    'confidence_score': trend_data.confidence_score
-                }
-                
-                await conn.execute(
-                    history_query,
-                    trend_data.career_id,
-                    json.dumps(trend_json),
-                    trend_data.currency_code,
-                    current_month
-                )
-                
-                logger.info(f"Saved trend data for {trend_data.career_id}")
-                
-                # Save translations for all languages
-                await self.save_trend_translations(trend_data)
-                
-                return True
+            # Insert or update career trend
+            next_update = datetime.now() + timedelta(days=30)
+            query = trend_upsert_sql()
+            trend_args = trend_upsert_args(trend_data, next_update)
+            
+            # Save to history
+            current_month = datetime.now().strftime('%Y-%m')
+            trend_json = {
+                'trend_score': trend_data.trend_score,
+                'trend_direction': trend_data.trend_direction,
+                'demand_level': trend_data.demand_level,
+                'growth_rate': trend_data.growth_rate,
+                'market_insights': trend_data.market_insights,
+                'key_skills_trending': trend_data.key_skills_trending,
+                'salary_trend': trend_data.salary_trend,
+                'job_availability_score': trend_data.job_availability_score,
+                'top_locations': trend_data.top_locations,
+                'remote_work_trend': trend_data.remote_work_trend,
+                'industry_impact': trend_data.industry_impact,
+                'automation_risk': trend_data.automation_risk,
+                'future_outlook': trend_data.future_outlook,
+                'confidence_score': trend_data.confidence_score
+            }
+            
+            history_args = (
+                trend_data.career_id,
+                json.dumps(trend_json),
+                trend_data.currency_code,
+                current_month
+            )
+            
+            await self.batch_writer.write([(query, trend_args), (HISTORY_INSERT_SQL, history_args), *extra_statements])
+            
+            logger.info(f"Saved trend data for {trend_data.career_id}")
+            
+            return True
                 
         except Exception as e:
             logger.error(f"Failed to save trend data for {trend_data.career_id}: {e}")
             return False
     
-    async def save_trend_translations(self, trend_data: CareerTrendData):
-        """Save trend data translations for all supported languages"""
+    async def save_trend_translations(self, trend_data: CareerTrendData, extra_statements: Sequence[Statement] = ()):
+        """Save trend data translations for all supported languages in one batched write"""
         try:
             # Convert trend data to dict for translation
             trend_dict = {
@@ -438,104 +447,97 @@ class MonthlyTrendUpdater:
             # Get translations for all languages
             translations = await translation_service.translate_trend_data(trend_dict)
             
-            # Save translations to database
-            async with self.db_pool.acquire() as conn:
-                for language_code, translation in translations.items():
-                    if language_code == 'en':
-                        continue  # Skip English as it's already saved
-                    
-                    # Insert or update trend translation
-                    translation_query = """
-                    INSERT INTO career_trend_translations (
-                        career_id, language_code, market_insights, salary_trend,
-                        industry_impact, future_outlook, created_at, updated_at
-                    ) VALUES ($1, $2, $3, $4, $5, $6, NOW(), NOW())
-                    ON CONFLICT (career_id, language_code) DO UPDATE SET
-                        market_insights = EXCLUDED.market_insights,
-                        salary_trend = EXCLUDED.salary_trend,
-                        industry_impact = EXCLUDED.industry_impact,
-                        future_outlook = EXCLUDED.future_outlook,
-                        updated_at = NOW()
-                    """
-                    
-                    await conn.execute(
-                        translation_query,
-                        trend_data.career_id,
-                        language_code,
-                        translation.get('market_insights', ''),
-                        translation.get('salary_trend', ''),
-                        translation.get('industry_impact', ''),
-                        translation.get('future_outlook', '')
-                    )
-                    
-                    logger.info(f"Saved trend translation for {trend_data.career_id} in {language_code}")
+            # Insert or update trend translations
+            statements = [
+                (TRANSLATION_UPSERT_SQL, (
+                    trend_data.career_id,
+                    language_code,
+                    translation.get('market_insights', ''),
+                    translation.get('salary_trend', ''),
+                    translation.get('industry_impact', ''),
+                    translation.get('future_outlook', '')
+                ))
+                for language_code, translation in translations.items()
+                if language_code != 'en'  # Skip English as it's already saved
+            ]
+            
+            await self.batch_writer.write(statements + list(extra_statements))
+            
+            logger.info(f"Saved trend translations for {trend_data.career_id} in {len(statements)} languages")
                 
         except Exception as e:
             logger.error(f"Failed to save trend translations for {trend_data.career_id}: {e}")
     
-    async def update_industry_trends(self):
-        """Update industry-level trend summaries"""
+    async def update_industry_trends(self, industries: Optional[Iterable[str]] = None):
+        """Update industry-level trend summaries with one set-based upsert
+        
+        industries limits the rollup to those industries; None recomputes every industry.
+        """
         try:
+            industry_filter = list(industries) if industries is not None else None
+            if industry_filter == []:
+                return
+            
+            current_month = datetime.now().strftime('%Y-%m')
+            
+            # Top five careers come from a window rank and emerging skills from a lateral
+            # unnest, so every industry is aggregated and upserted in one statement
+            industry_query = """
+            WITH recent AS (
+                SELECT
+                    c.industry, ct.career_id, ct.trend_score, ct.trend_direction, ct.key_skills_trending,
+                    ROW_NUMBER() OVER (PARTITION BY c.industry ORDER BY ct.trend_score DESC, ct.career_id) AS score_rank
+                FROM career_trends ct
+                JOIN careers c ON c.id = ct.career_id
+                WHERE ct.last_updated >= NOW() - INTERVAL '1 month'
+                  AND c.industry IS NOT NULL
+                  AND ($2::text[] IS NULL OR c.industry = ANY($2::text[]))
+            ),
+            skills AS (
+                SELECT r.industry, ARRAY_AGG(DISTINCT skill ORDER BY skill) AS emerging_skills
+                FROM recent r
+                CROSS JOIN LATERAL unnest(r.key_skills_trending) AS skill
+                GROUP BY r.industry
+            ),
+            rollup AS (
+                SELECT
+                    industry,
+                    COUNT(*) AS total_careers,
+                    AVG(trend_score) AS avg_trend_score,
+                    COUNT(*) FILTER (WHERE trend_direction = 'rising') AS rising_careers,
+                    COUNT(*) FILTER (WHERE trend_direction = 'stable') AS stable_careers,
+                    COUNT(*) FILTER (WHERE trend_direction = 'declining') AS declining_careers,
+                    ARRAY_AGG(career_id ORDER BY score_rank) FILTER (WHERE score_rank <= 5) AS top_trending_careers
+                FROM recent
+                GROUP BY industry
+            )
+            INSERT INTO industry_trends (
+                industry, month_year, avg_trend_score, total_careers,
+                rising_careers, stable_careers, declining_careers,
+                top_trending_careers, emerging_skills
+            )
+            SELECT
+                r.industry, $1, r.avg_trend_score, r.total_careers,
+                r.rising_careers, r.stable_careers, r.declining_careers,
+                r.top_trending_careers, COALESCE(s.emerging_skills, '{}')
+            FROM rollup r
+            LEFT JOIN skills s ON s.industry = r.industry
+            ON CONFLICT (industry, month_year) DO UPDATE SET
+                avg_trend_score = EXCLUDED.avg_trend_score,
+                total_careers = EXCLUDED.total_careers,
+                rising_careers = EXCLUDED.rising_careers,
+                stable_careers = EXCLUDED.stable_careers,
+                declining_careers = EXCLUDED.declining_careers,
+                top_trending_careers = EXCLUDED.top_trending_careers,
+                emerging_skills = EXCLUDED.emerging_skills,
+                updated_at = NOW()
+            """
+            
             async with self.db_pool.acquire() as conn:
-                # Get all industries
-                industries_query = "SELECT DISTINCT industry FROM careers"
-                industries = await conn.fetch(industries_query)
-                
-                current_month = datetime.now().strftime('%Y-%m')
-                
-                for industry_row in industries:
-                    industry = industry_row['industry']
-                    
-                    # Get trend data for this industry
-                    trend_query = """
-                    SELECT 
-                        COUNT(*) as total_careers,
-                        AVG(trend_score) as avg_trend_score,
-                        COUNT(CASE WHEN trend_direction = 'rising' THEN 1 END) as rising_careers,
-                        COUNT(CASE WHEN trend_direction = 'stable' THEN 1 END) as stable_careers,
-                        COUNT(CASE WHEN trend_direction = 'declining' THEN 1 END) as declining_careers,
-                        ARRAY_AGG(career_id ORDER BY trend_score DESC LIMIT 5) as top_trending_careers,
-                        ARRAY_AGG(DISTINCT unnest(key_skills_trending)) as emerging_skills
-                    FROM career_trends ct
-                    JOIN careers c ON c.id = ct.career_id
-                    WHERE c.industry = $1 AND ct.last_updated >= NOW() - INTERVAL '1 month'
-                    """
-                    
-                    trend_data = await conn.fetchrow(trend_query, industry)
-                    
-                    if trend_data and trend_data['total_careers'] > 0:
-                        # Insert or update industry trend
-                        industry_query = """
-                        INSERT INTO industry_trends (
-                            industry, month_year, avg_trend_score, total_careers,
-                            rising_careers, stable_careers, declining_careers,
-                            top_trending_careers, emerging_skills
-                        ) VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9)
-                        ON CONFLICT (industry, month_year) DO UPDATE SET
-                            avg_trend_score = EXCLUDED.avg_trend_score,
-                            total_careers = EXCLUDED.total_careers,
-                            rising_careers = EXCLUDED.rising_careers,
-                            stable_careers = EXCLUDED.stable_careers,
-                            declining_careers = EXCLUDED.declining_careers,
-                            top_trending_careers = EXCLUDED.top_trending_careers,
-                            emerging_skills = EXCLUDED.emerging_skills,
-                            updated_at = NOW()
-                        """
-                        
-                        await conn.execute(
-                            industry_query,
-                            industry,
-                            current_month,
-                            float(trend_data['avg_trend_score']),
-                            trend_data['total_careers'],
-                            trend_data['rising_careers'],
-                            trend_data['stable_careers'],
-                            trend_data['declining_careers'],
-                            trend_data['top_trending_careers'],
-                            trend_data['emerging_skills']
-                        )
-                        
-                        logger.info(f"Updated industry trends for {industry}")
+                status = await conn.execute(industry_query, current_month, industry_filter)
+            
+            # Status is "INSERT 0 <rows>"
+            logger.info(f"Updated industry trends for {status.split()[-1]} industries")
                 
         except Exception as e:
             logger.error(f"Failed to update industry trends: {e}")
@@ -546,6 +548,7 @@ class MonthlyTrendUpdater:
         current_month = datetime.now().strftime('%Y-%m')
         
         logger.info(f"Starting monthly trend update for {current_month}")
+        progress = None
         
         try:
             # Create update log entry
@@ -565,61 +568,104 @@ class MonthlyTrendUpdater:
                     0  # Will update later
                 )
             
-            # Get careers to update
-            careers = await self.get_careers_to_update()
+            checkpoints = TrendCheckpointStore(self.db_pool, current_month)
+            await checkpoints.ensure_table()
+            cutoff = datetime.now()
+            # Progress reaches trend_update_log in coalesced writes and /api/trends/progress live
+            progress = progress_registry.start('monthly', self.db_pool, log_id)
             
-            if not careers:
-                logger.info("No careers need updating")
-                return
+            async def candidate_pages():
+                # Careers an interrupted attempt at this month's run left unfinished come first;
+                # their saved trend_update_checkpoints let them skip stages already done
+                yield await checkpoints.get_unfinished_careers()
+                async for page in self.get_careers_to_update(cutoff):
+                    yield page
             
-            # Update log with total count
-            async with self.db_pool.acquire() as conn:
-                await conn.execute(
-                    "UPDATE trend_update_log SET total_careers = $1 WHERE id = $2",
-                    len(careers), log_id
-                )
+            async def careers_to_process():
+                # Only careers leased to this run are processed; a career seen twice (resumed
+                # and due) is already leased the second time, so it is never processed twice
+                async for page in candidate_pages():
+                    if not page:
+                        continue
+                    claimed = await checkpoints.claim([career['id'] for career in page])
+                    for career in page:
+                        if career['id'] in claimed:
+                            progress.add_total()
+                            yield career
             
-            # Process careers
-            successful_updates = 0
-            failed_updates = 0
+            # Process careers: analysis, persistence and translation run as
+            # separate stages with their own worker pools and bounded queues
             errors = []
+            changed_industries = set()
             
-            for i, career in enumerate(careers):
-                try:
-                    logger.info(f"Processing career {i+1}/{len(careers)}: {career['title']}")
-                    
-                    # Analyze trend
-                    trend_data = await self.analyze_career_trend(career)
-                    
-                    if trend_data:
-                        # Save trend data
-                        if await self.save_trend_data(trend_data):
-                            successful_updates += 1
-                        else:
-                            failed_updates += 1
-                            errors.append(f"Failed to save trend data for {career['id']}")
-                    else:
-                        failed_updates += 1
-                        errors.append(f"Failed to analyze trend for {career['id']}")
-                    
-                    # Update progress
-                    async with self.db_pool.acquire() as conn:
-                        await conn.execute(
-                            "UPDATE trend_update_log SET processed_careers = $1 WHERE id = $2",
-                            i + 1, log_id
-                        )
-                    
-                    # Rate limiting - wait between requests
-                    await asyncio.sleep(1)
-                    
-                except Exception as e:
-                    failed_updates += 1
-                    error_msg = f"Error processing {career['id']}: {str(e)}"
-                    errors.append(error_msg)
-                    logger.error(error_msg)
+            async def analyze(career: Dict) -> Optional[CareerTrendData]:
+                checkpoint = checkpoints.get(career['id'])
+                if checkpoint.reached('analyzed') and checkpoint.trend_data:
+                    # Analysed before the interruption; don't pay for the LLM call again
+                    return CareerTrendData(**checkpoint.trend_data)
+                trend_data = await self.analyze_career_trend(career)
+                if trend_data:
+                    await checkpoints.advance(career['id'], 'analyzed', asdict(trend_data))
+                return trend_data
+            
+            # The checkpoint UPDATEs ride in the same batched transaction as the data they record
+            async def save(trend_data: CareerTrendData) -> Optional[CareerTrendData]:
+                checkpoint = checkpoints.get(trend_data.career_id)
+                if not checkpoint.reached('saved'):
+                    previous_stage = checkpoint.stage
+                    if not await self.save_trend_data(trend_data, [checkpoints.advance_statement(trend_data.career_id, 'saved')]):
+                        checkpoint.stage = previous_stage
+                        return None
+                return trend_data
+            
+            async def translate(trend_data: CareerTrendData) -> CareerTrendData:
+                await self.save_trend_translations(trend_data, [checkpoints.advance_statement(trend_data.career_id, 'translated')])
+                return trend_data
+            
+            async def on_career_done(career: Dict, result, stage: Optional[str], error: Optional[BaseException]):
+                if result is not None:
+                    changed_industries.add(career['industry'])
+                if error is not None:
+                    errors.append(f"Error processing {career['id']}: {str(error)}")
+                    await checkpoints.record_error(career['id'], str(error))
+                elif stage == 'analyze':
+                    errors.append(f"Failed to analyze trend for {career['id']}")
+                elif stage == 'save':
+                    errors.append(f"Failed to save trend data for {career['id']}")
+                
+                await progress.item_done(failed=result is None)
+            
+            pipeline = AsyncPipeline([
+                PipelineStage('analyze', progress.timed('analyze', analyze), self.analyze_concurrency, self.pipeline_queue_size),
+                PipelineStage('save', progress.timed('save', save), self.save_concurrency, self.pipeline_queue_size),
+                PipelineStage('translate', progress.timed('translate', translate), self.translate_concurrency, self.pipeline_queue_size)
+            ], on_item_done=on_career_done)
+            try:
+                # The scan only fetches the next page once the pipeline has room for it
+                result = await pipeline.run(careers_to_process())
+            finally:
+                # Unfinished careers become claimable by a retry straight away
+                await checkpoints.release()
+            
+            if progress.total == 0:
+                await progress.finish()
+                logger.info("No careers need updating")
+                return
+            
+            # A career counts as updated once its trend data is saved
+            successful_updates = result.stages['save'].processed
+            failed_updates = result.stages['analyze'].dropped + result.stages['save'].dropped
+            logger.info(f"Pipeline finished in {result.duration_seconds:.1f}s: " +
+                        ", ".join(f"{name} {stats.as_dict()}" for name, stats in result.stages.items()))
             
             # Update industry trends
-            await self.update_industry_trends()
+            if self.industry_rollup_mode == 'incremental':
+                await self.update_industry_trends(changed_industries)
+            else:
+                await self.update_industry_trends()
+            
+            # The final log update below carries the final counters
+            await progress.finish('completed' if failed_updates == 0 else 'completed_with_errors', flush=False)
             
             # Calculate final metrics
             end_time = time.time()
@@ -634,7 +680,9 @@ class MonthlyTrendUpdater:
                     failed_updates = $3,
                     errors = $4,
                     end_time = $5,
-                    duration_minutes = $6
+                    duration_minutes = $6,
+                    total_careers = $8,
+                    processed_careers = $9
                 WHERE id = $7
                 """
                 
@@ -646,13 +694,17 @@ class MonthlyTrendUpdater:
                     json.dumps(errors),
                     datetime.now(),
                     duration_minutes,
-                    log_id
+                    log_id,
+                    progress.total,
+                    progress.processed
                 )
             
             logger.info(f"Monthly update completed: {successful_updates} successful, {failed_updates} failed")
             
         except Exception as e:
             logger.error(f"Monthly update failed: {e}")
+            if progress is not None:
+                await progress.finish('failed')
             
             # Update log with error status
             try:
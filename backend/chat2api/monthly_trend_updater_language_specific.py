@@ -5,15 +5,24 @@ Uses chat2api to analyze career trends and update Supabase database with languag
 """
 
 import os
-import json
 import asyncio
 import logging
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Tuple
+from dataclasses import replace
+from functools import lru_cache
+from typing import AsyncIterator, Dict, List, Optional, Tuple
 import aiohttp
-import asyncpg
-from dataclasses import dataclass
 import time
+from db import database
+from schema_manager import trend_schema
+from trend_models import CareerTrendData, trend_upsert_sql, trend_upsert_args
+from json_extract import extract_json, validate_schema, JSONExtractionError, JSONSchemaError
+from response_parsers import (
+    TREND_ANALYSIS_SCHEMA, MULTILINGUAL_TREND_ANALYSIS_SCHEMA, LOCALIZED_TREND_SCHEMA, LOCALIZED_TREND_FIELDS
+)
+from rate_limiter import rate_limiters, estimate_tokens
+from progress_reporter import progress_registry
+from http_client import chat2api_connection_metrics
 
 # Configure logging
 logging.basicConfig(
@@ -26,26 +35,35 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-@dataclass
-class CareerTrendData:
-    """Data structure for career trend information"""
-    career_id: str
-    trend_score: float  # 0-10 scale
-    trend_direction: str  # 'rising', 'stable', 'declining'
-    demand_level: str  # 'high', 'medium', 'low'
-    growth_rate: float  # Percentage
-    market_insights: str
-    key_skills_trending: List[str]
-    salary_trend: str
-    job_availability_score: float  # 0-10 scale
-    top_locations: List[str]
-    remote_work_trend: float  # 0-10 scale
-    industry_impact: str
-    automation_risk: float  # 0-10 scale
-    future_outlook: str
-    confidence_score: float  # 0-10 scale
-    currency_code: str = 'USD'  # Default to USD
-    salary_data: Dict = None  # Salary data by region/currency
+CAREER_CONTENT_COLUMNS = ('title', 'description', 'skills', 'job_titles', 'certifications', 'requirements')
+
+@lru_cache(maxsize=None)
+def career_contents_sql(languages: Tuple[str, ...]) -> str:
+    """One page of core careers with their content in every language, one row per (career, language)"""
+    columns = ", ".join(CAREER_CONTENT_COLUMNS)
+    contents = "\n        UNION ALL\n".join(
+        f"        SELECT '{language}' AS language, career_id, {columns} FROM careers_{language}"
+        for language in languages
+    )
+    return f"""
+    SELECT c.id AS career_id, t.language, {", ".join(f"t.{column}" for column in CAREER_CONTENT_COLUMNS)}
+    FROM (SELECT id FROM careers_core WHERE id > $1 ORDER BY id LIMIT $2) c
+    LEFT JOIN (
+{contents}
+    ) t ON t.career_id = c.id
+    ORDER BY c.id, t.language
+    """
+
+LANGUAGE_NAMES = {'en': 'English', 'ja': 'Japanese', 'de': 'German', 'es': 'Spanish', 'fr': 'French'}
+
+@lru_cache(maxsize=None)
+def career_content_sql(language: str) -> str:
+    """Lookup of one career's content in careers_{language}"""
+    return f"""
+    SELECT title, description, skills, job_titles, certifications, requirements
+    FROM careers_{language}
+    WHERE career_id = $1
+    """
 
 class MonthlyTrendUpdaterLanguageSpecific:
     def __init__(self):
@@ -53,9 +71,21 @@ class MonthlyTrendUpdaterLanguageSpecific:
         self.supabase_url = os.getenv('SUPABASE_URL')
         self.supabase_service_key = os.getenv('SUPABASE_SERVICE_ROLE_KEY')
         self.db_pool = None
+        self.session: Optional[aiohttp.ClientSession] = None
+        
+        # Connection pool for chat2api: keep-alive connections and cached DNS across careers
+        self.connection_limit = int(os.getenv('CHAT2API_CONNECTION_LIMIT', '10'))
+        self.connection_limit_per_host = int(os.getenv('CHAT2API_CONNECTION_LIMIT_PER_HOST', '10'))
+        self.dns_cache_ttl = int(os.getenv('CHAT2API_DNS_CACHE_TTL', '300'))
+        self.keepalive_timeout = float(os.getenv('CHAT2API_KEEPALIVE_TIMEOUT', '60'))
+        self.request_timeout = float(os.getenv('CHAT2API_REQUEST_TIMEOUT', '120'))
         
         # Supported languages
         self.supported_languages = ['en', 'ja', 'de', 'es', 'fr']
+        # Careers loaded per content query
+        self.content_page_size = int(os.getenv('TREND_CONTENT_PAGE_SIZE', '200'))
+        # Analyze each career once for all languages instead of once per language
+        self.multilingual_analysis = os.getenv('TREND_MULTILINGUAL_ANALYSIS', 'true').lower() == 'true'
         
         # Currency mapping for regions
         self.currency_mapping = {
@@ -68,25 +98,46 @@ class MonthlyTrendUpdaterLanguageSpecific:
         }
 
     async def initialize(self):
-        """Initialize database connection"""
+        """Initialize database connection and HTTP session"""
         try:
-            # Parse Supabase URL to get connection details
-            if self.supabase_url:
-                # Extract database URL from Supabase URL
-                db_url = f"postgresql://postgres:{self.supabase_service_key}@{self.supabase_url.replace('https://', '').replace('http://', '')}/postgres"
-                self.db_pool = await asyncpg.create_pool(db_url)
-                logger.info("Database connection pool created successfully")
-            else:
-                raise ValueError("SUPABASE_URL environment variable not set")
+            # Registered before connecting so new connections prepare them
+            for language in self.supported_languages:
+                database.register_statement(f'career_content_{language}', career_content_sql(language))
+                database.register_statement(f'trend_upsert_{language}', trend_upsert_sql(f'career_trends_{language}'))
+            # Shared process pool; languages and careers are processed one at a time
+            self.db_pool = await database.connect(1)
+            # Every language's trend table is migrated once, in one transaction, before any save
+            await trend_schema.ensure_languages(self.supported_languages)
+            
+            # One session for the whole run instead of one per analysis
+            if self.session is None or self.session.closed:
+                connector = aiohttp.TCPConnector(
+                    limit=self.connection_limit,
+                    limit_per_host=self.connection_limit_per_host,
+                    ttl_dns_cache=self.dns_cache_ttl,
+                    keepalive_timeout=self.keepalive_timeout
+                )
+                self.session = aiohttp.ClientSession(
+                    connector=connector,
+                    timeout=aiohttp.ClientTimeout(total=self.request_timeout),
+                    trace_configs=[chat2api_connection_metrics.trace_config()]
+                )
+                chat2api_connection_metrics.limits = {
+                    "limit": self.connection_limit,
+                    "limit_per_host": self.connection_limit_per_host
+                }
         except Exception as e:
             logger.error(f"Failed to initialize database connection: {e}")
             raise
 
     async def close(self):
-        """Close database connection"""
+        """Close HTTP session and database connection"""
+        if self.session:
+            await self.session.close()
+            self.session = None
         if self.db_pool:
             await self.db_pool.close()
-            logger.info("Database connection closed")
+            self.db_pool = None
 
     def get_currency_for_region(self, region: str) -> str:
         """Get currency code for a given region"""
@@ -133,18 +184,51 @@ class MonthlyTrendUpdaterLanguageSpecific:
         """Get career content for a specific language"""
         try:
             async with self.db_pool.acquire() as conn:
-                table_name = f"careers_{language}"
-                query = f"""
-                SELECT title, description, skills, job_titles, certifications, requirements
-                FROM {table_name}
-                WHERE career_id = $1
-                """
-                row = await conn.fetchrow(query, career_id)
+                row = await conn.fetchrow(career_content_sql(language), career_id)
                 return dict(row) if row else None
         except Exception as e:
             logger.error(f"Failed to fetch career content for {career_id} in {language}: {e}")
             return None
 
+    async def iter_career_contents(self) -> AsyncIterator[Dict]:
+        """Yield {'id', 'contents': {language: content}} for every core career, in id order
+        
+        Each page of careers is loaded for all languages with one UNION ALL query
+        instead of one lookup per career and language.
+        """
+        async with self.db_pool.acquire() as conn:
+            # Languages whose careers_{lang} table is missing simply have no content
+            rows = await conn.fetch(
+                "SELECT language FROM unnest($1::text[]) AS language WHERE to_regclass('careers_' || language) IS NOT NULL",
+                self.supported_languages
+            )
+        languages = tuple(language for language in self.supported_languages if language in {row['language'] for row in rows})
+        if not languages:
+            logger.error("No careers_{lang} tables found")
+            return
+        
+        query = career_contents_sql(languages)
+        last_id = ''
+        while True:
+            async with self.db_pool.acquire() as conn:
+                rows = await conn.fetch(query, last_id, self.content_page_size)
+            if not rows:
+                return
+            
+            # Rows arrive grouped by career; fold each group into one record
+            career = None
+            for row in rows:
+                if career is None or row['career_id'] != career['id']:
+                    if career is not None:
+                        yield career
+                    career = {'id': row['career_id'], 'contents': {}}
+                if row['language'] is not None:
+                    career['contents'][row['language']] = {
+                        key: row[key] for key in CAREER_CONTENT_COLUMNS
+                    }
+            yield career
+            last_id = career['id']
+
     def _create_trend_analysis_prompt(self, career: Dict, language: str = 'en') -> str:
         """Create prompt for trend analysis"""
         
@@ -220,151 +304,215 @@ class MonthlyTrendUpdaterLanguageSpecific:
         """
         return prompt
 
+    def _create_multilingual_prompt(self, career: Dict, languages: List[str]) -> str:
+        """Create a prompt for one analysis with the text fields in every language"""
+        localized_example = ",\n".join(
+            f'                "{language}": {{"market_insights": "...", "salary_trend": "...", '
+            f'"industry_impact": "...", "future_outlook": "..."}}'
+            for language in languages
+        )
+        language_list = ", ".join(f"{code} ({LANGUAGE_NAMES.get(code, code)})" for code in languages)
+        
+        prompt = f"""
+        Analyze the current market trends for the following career and provide comprehensive trend data in JSON format.
+        
+        Career: {career['title']}
+        Description: {career['description']}
+        Skills: {', '.join(career['skills']) if career['skills'] else 'Not specified'}
+        Job Titles: {', '.join(career['job_titles']) if career['job_titles'] else 'Not specified'}
+        
+        Provide the analysis in the following JSON format:
+        {{
+            "trend_score": 7.5,
+            "trend_direction": "rising",
+            "demand_level": "high",
+            "growth_rate": 8.2,
+            "key_skills_trending": ["AI/ML", "Cloud Computing", "DevOps", "Cybersecurity"],
+            "job_availability_score": 8.0,
+            "top_locations": ["San Francisco", "Seattle", "Austin", "Boston"],
+            "remote_work_trend": 7.5,
+            "automation_risk": 3.5,
+            "confidence_score": 8.5,
+            "salary_info": {{
+                "base_salary": 85000,
+                "region": "north-america"
+            }},
+            "localized": {{
+{localized_example}
+            }}
+        }}
+        
+        Guidelines:
+        - trend_score: 0-10 scale rating of overall career trend
+        - trend_direction: "rising", "stable", or "declining"
+        - demand_level: "high", "medium", or "low"
+        - growth_rate: percentage growth rate
+        - key_skills_trending: list of trending skills
+        - job_availability_score: 0-10 scale of job availability
+        - top_locations: list of top hiring locations
+        - remote_work_trend: 0-10 scale of remote work availability
+        - automation_risk: 0-10 scale of automation risk
+        - confidence_score: 0-10 scale of analysis confidence
+        - salary_info.base_salary: average salary in USD for this role
+        - salary_info.region: "north-america", "europe", "asia-pacific", "south-america", "africa", or "middle-east"
+        - localized: one entry for each of {language_list}, each written in that language:
+          market_insights (detailed market analysis), salary_trend (salary trend description),
+          industry_impact (impact on industry) and future_outlook (future prospects)
+        
+        Provide current, accurate market data based on recent trends and job market analysis.
+        """
+        return prompt
+
     async def analyze_career_trend(self, career_id: str, career_content: Dict, language: str = 'en') -> Optional[CareerTrendData]:
         """Analyze career trend using chat2api"""
         try:
             prompt = self._create_trend_analysis_prompt(career_content, language)
-            
-            async with aiohttp.ClientSession() as session:
-                headers = {
-                    'Authorization': f'Bearer {self.chat2api_key}',
-                    'Content-Type': 'application/json'
-                }
-                
-                data = {
-                    'model': 'gpt-4',
-                    'messages': [
-                        {'role': 'user', 'content': prompt}
-                    ],
-                    'temperature': 0.3,
-                    'max_tokens': 2000
-                }
-                
-                async with session.post('https://api.chat2api.com/v1/chat/completions', 
-                                      headers=headers, json=data) as response:
-                    if response.status == 200:
-                        result = await response.json()
-                        content = result['choices'][0]['message']['content']
-                        return self._parse_trend_response(content, career_id, language)
-                    else:
-                        logger.error(f"Chat2API request failed with status {response.status}")
-                        return None
+            content = await self._request_analysis(prompt, 2000)
+            return self._parse_trend_response(content, career_id, language) if content else None
                         
         except Exception as e:
             logger.error(f"Failed to analyze trend for {career_id} in {language}: {e}")
             return None
 
+    async def analyze_career_trend_all_languages(self, career_id: str, contents: Dict[str, Dict],
+                                                 languages: List[str]) -> Dict[str, CareerTrendData]:
+        """Analyze a career once, with the text fields localized into every language
+        
+        Returns trend data per language; languages missing from the answer are left out.
+        """
+        try:
+            # The English content describes the career best; any language will do without it
+            career_content = contents.get('en') or next(iter(contents.values()))
+            prompt = self._create_multilingual_prompt(career_content, languages)
+            # The numeric fields come back once, the four text fields once per language
+            content = await self._request_analysis(prompt, 1000 + 500 * len(languages))
+            return self._parse_multilingual_response(content, career_id, languages) if content else {}
+            
+        except Exception as e:
+            logger.error(f"Failed to analyze trend for {career_id} in {', '.join(languages)}: {e}")
+            return {}
+
+    async def _request_analysis(self, prompt: str, max_tokens: int) -> Optional[str]:
+        """Send a trend analysis prompt to chat2api and return the reply text"""
+        headers = {
+            'Authorization': f'Bearer {self.chat2api_key}',
+            'Content-Type': 'application/json'
+        }
+        
+        data = {
+            'model': 'gpt-4',
+            'messages': [
+                {'role': 'user', 'content': prompt}
+            ],
+            'temperature': 0.3,
+            'max_tokens': max_tokens
+        }
+        
+        limiter = rate_limiters.get('chat2api', data['model'])
+        reserved = await limiter.acquire(estimate_tokens(prompt, data['max_tokens']))
+        
+        async with self.session.post('https://api.chat2api.com/v1/chat/completions', 
+                                     headers=headers, json=data) as response:
+            if response.status == 200:
+                result = await response.json()
+                limiter.record(response.status, response.headers, reserved,
+                               (result.get('usage') or {}).get('total_tokens'))
+                return result['choices'][0]['message']['content']
+            else:
+                limiter.record(response.status, response.headers)
+                logger.error(f"Chat2API request failed with status {response.status}")
+                return None
+
     def _parse_trend_response(self, content: str, career_id: str, language: str = 'en') -> Optional[CareerTrendData]:
         """Parse trend analysis response"""
         try:
-            # Extract JSON from response
-            start_idx = content.find('{')
-            end_idx = content.rfind('}') + 1
-            
-            if start_idx == -1 or end_idx == 0:
+            # Extract the first JSON object, ignoring surrounding prose and code fences
+            try:
+                data = extract_json(content, "{", TREND_ANALYSIS_SCHEMA)
+            except JSONExtractionError:
                 logger.error(f"No JSON found in response for {career_id}")
                 return None
-                
-            json_str = content[start_idx:end_idx]
-            data = json.loads(json_str)
-            
-            # Extract salary info
-            salary_info = data.get('salary_info', {})
-            base_salary = float(salary_info.get('base_salary', 75000))
-            region = salary_info.get('region', 'north-america')
-            
-            currency_code = self.get_currency_for_region(region)
-            salary_data = self.generate_salary_data(base_salary, currency_code)
-            
-            trend_data = CareerTrendData(
-                career_id=career_id,
-                trend_score=float(data.get('trend_score', 7.0)),
-                trend_direction=data.get('trend_direction', 'stable'),
-                demand_level=data.get('demand_level', 'medium'),
-                growth_rate=float(data.get('growth_rate', 5.0)),
-                market_insights=data.get('market_insights', 'Market analysis not available'),
-                key_skills_trending=data.get('key_skills_trending', []),
-                salary_trend=data.get('salary_trend', 'Salary trend not available'),
-                job_availability_score=float(data.get('job_availability_score', 6.0)),
-                top_locations=data.get('top_locations', []),
-                remote_work_trend=float(data.get('remote_work_trend', 6.0)),
-                industry_impact=data.get('industry_impact', 'Industry impact not analyzed'),
-                automation_risk=float(data.get('automation_risk', 5.0)),
-                future_outlook=data.get('future_outlook', 'Future outlook not available'),
-                confidence_score=float(data.get('confidence_score', 7.0)),
-                currency_code=currency_code,
-                salary_data=salary_data
-            )
+            except JSONSchemaError as e:
+                logger.error(f"Invalid trend data for {career_id}: {e}")
+                return None
             
-            return trend_data
+            return self._trend_data_from_json(data, career_id)
             
         except Exception as e:
             logger.error(f"Failed to parse trend response for {career_id} in {language}: {e}")
             return None
 
+    def _parse_multilingual_response(self, content: str, career_id: str, languages: List[str]) -> Dict[str, CareerTrendData]:
+        """Fan a multilingual analysis out into one CareerTrendData per language"""
+        try:
+            try:
+                data = extract_json(content, "{", MULTILINGUAL_TREND_ANALYSIS_SCHEMA)
+            except JSONExtractionError:
+                logger.error(f"No JSON found in multilingual response for {career_id}")
+                return {}
+            except JSONSchemaError as e:
+                logger.error(f"Invalid multilingual trend data for {career_id}: {e}")
+                return {}
+            
+            shared = self._trend_data_from_json(data, career_id)
+            results = {}
+            for language in languages:
+                localized = data['localized'].get(language)
+                try:
+                    validate_schema(localized, LOCALIZED_TREND_SCHEMA, f"$.localized.{language}")
+                except JSONSchemaError as e:
+                    logger.warning(f"Missing localized trend text for {career_id} in {language}: {e}")
+                    continue
+                results[language] = replace(shared, **{
+                    field: localized[field] for field in LOCALIZED_TREND_FIELDS if field in localized
+                })
+            return results
+            
+        except Exception as e:
+            logger.error(f"Failed to parse multilingual trend response for {career_id}: {e}")
+            return {}
+
+    def _trend_data_from_json(self, data: Dict, career_id: str) -> CareerTrendData:
+        """Build CareerTrendData from a validated analysis, with defaults for missing fields"""
+        # Extract salary info
+        salary_info = data.get('salary_info', {})
+        base_salary = float(salary_info.get('base_salary', 75000))
+        region = salary_info.get('region', 'north-america')
+        
+        currency_code = self.get_currency_for_region(region)
+        salary_data = self.generate_salary_data(base_salary, currency_code)
+        
+        return CareerTrendData(
+            career_id=career_id,
+            trend_score=float(data.get('trend_score', 7.0)),
+            trend_direction=data.get('trend_direction', 'stable'),
+            demand_level=data.get('demand_level', 'medium'),
+            growth_rate=float(data.get('growth_rate', 5.0)),
+            market_insights=data.get('market_insights', 'Market analysis not available'),
+            key_skills_trending=data.get('key_skills_trending', []),
+            salary_trend=data.get('salary_trend', 'Salary trend not available'),
+            job_availability_score=float(data.get('job_availability_score', 6.0)),
+            top_locations=data.get('top_locations', []),
+            remote_work_trend=float(data.get('remote_work_trend', 6.0)),
+            industry_impact=data.get('industry_impact', 'Industry impact not analyzed'),
+            automation_risk=float(data.get('automation_risk', 5.0)),
+            future_outlook=data.get('future_outlook', 'Future outlook not available'),
+            confidence_score=float(data.get('confidence_score', 7.0)),
+            currency_code=currency_code,
+            salary_data=salary_data
+        )
+
     async def save_trend_data(self, trend_data: CareerTrendData, language: str = 'en') -> bool:
         """Save trend data to language-specific table"""
         try:
+            # Migrated at startup; only a language added since then reaches the database here
+            await trend_schema.ensure_language(language)
             async with self.db_pool.acquire() as conn:
                 table_name = f"career_trends_{language}"
                 
-                # Check if table exists, if not, create it
-                await self.ensure_trend_table_exists(language)
-                
                 # Insert or update career trend
-                query = f"""
-                INSERT INTO {table_name} (
-                    career_id, trend_score, trend_direction, demand_level, growth_rate,
-                    market_insights, key_skills_trending, salary_trend, job_availability_score,
-                    top_locations, remote_work_trend, industry_impact, automation_risk,
-                    future_outlook, currency_code, salary_data, confidence_score, last_updated, next_update_due
-                ) VALUES (
-                    $1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $12, $13, $14, $15, $16, $17, NOW(), $18
-                )
-                ON CONFLICT (career_id) DO UPDATE SET
-                    trend_score = EXCLUDED.trend_score,
-                    trend_direction = EXCLUDED.trend_direction,
-                    demand_level = EXCLUDED.demand_level,
-                    growth_rate = EXCLUDED.growth_rate,
-                    market_insights = EXCLUDED.market_insights,
-                    key_skills_trending = EXCLUDED.key_skills_trending,
-                    salary_trend = EXCLUDED.salary_trend,
-                    job_availability_score = EXCLUDED.job_availability_score,
-                    top_locations = EXCLUDED.top_locations,
-                    remote_work_trend = EXCLUDED.remote_work_trend,
-                    industry_impact = EXCLUDED.industry_impact,
-                    automation_risk = EXCLUDED.automation_risk,
-                    future_outlook = EXCLUDED.future_outlook,
-                    currency_code = EXCLUDED.currency_code,
-                    salary_data = EXCLUDED.salary_data,
-                    confidence_score = EXCLUDED.confidence_score,
-                    last_updated = NOW(),
-                    next_update_due = EXCLUDED.next_update_due
-                """
-                
                 next_update = datetime.now() + timedelta(days=30)
-                
-                await conn.execute(
-                    query,
-                    trend_data.career_id,
-                    trend_data.trend_score,
-                    trend_data.trend_direction,
-                    trend_data.demand_level,
-                    trend_data.growth_rate,
-                    trend_data.market_insights,
-                    trend_data.key_skills_trending,
-                    trend_data.salary_trend,
-                    trend_data.job_availability_score,
-                    trend_data.top_locations,
-                    trend_data.remote_work_trend,
-                    trend_data.industry_impact,
-                    trend_data.automation_risk,
-                    trend_data.future_outlook,
-                    trend_data.currency_code,
-                    json.dumps(trend_data.salary_data) if trend_data.salary_data else None,
-                    trend_data.confidence_score,
-                    next_update
-                )
+                await conn.execute(trend_upsert_sql(table_name), *trend_upsert_args(trend_data, next_update))
                 
                 logger.info(f"Successfully saved trend data for {trend_data.career_id} in {language}")
                 return True
@@ -376,64 +524,7 @@ class MonthlyTrendUpdaterLanguageSpecific:
     async def ensure_trend_table_exists(self, language: str):
         """Ensure trend table exists for the given language"""
         try:
-            async with self.db_pool.acquire() as conn:
-                table_name = f"career_trends_{language}"
-                
-                # Check if table exists
-                check_query = """
-                SELECT EXISTS (
-                    SELECT FROM information_schema.tables 
-                    WHERE table_schema = 'public' 
-                    AND table_name = $1
-                )
-                """
-                exists = await conn.fetchval(check_query, table_name)
-                
-                if not exists:
-                    # Create table
-                    create_query = f"""
-                    CREATE TABLE {table_name} (
-                        career_id TEXT PRIMARY KEY REFERENCES careers_core(id) ON DELETE CASCADE,
-                        trend_score DECIMAL(3,2) NOT NULL CHECK (trend_score >= 0 AND trend_score <= 10),
-                        trend_direction TEXT NOT NULL CHECK (trend_direction IN ('rising', 'stable', 'declining')),
-                        demand_level TEXT NOT NULL CHECK (demand_level IN ('high', 'medium', 'low')),
-                        growth_rate DECIMAL(5,2),
-                        market_insights TEXT,
-                        key_skills_trending TEXT[],
-                        salary_trend TEXT,
-                        job_availability_score DECIMAL(3,2) CHECK (job_availability_score >= 0 AND job_availability_score <= 10),
-                        top_locations TEXT[],
-                        remote_work_trend DECIMAL(3,2) CHECK (remote_work_trend >= 0 AND remote_work_trend <= 10),
-                        industry_impact TEXT,
-                        automation_risk DECIMAL(3,2) CHECK (automation_risk >= 0 AND automation_risk <= 10),
-                        future_outlook TEXT,
-                        currency_code TEXT DEFAULT 'USD',
-                        salary_data JSONB,
-                        confidence_score DECIMAL(3,2) CHECK (confidence_score >= 0 AND confidence_score <= 10),
-                        last_updated TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
-                        next_update_due TIMESTAMP WITH TIME ZONE DEFAULT (NOW() + INTERVAL '1 month'),
-                        created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
-                        updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
-                    )
-                    """
-                    await conn.execute(create_query)
-                    
-                    # Enable RLS
-                    await conn.execute(f"ALTER TABLE {table_name} ENABLE ROW LEVEL SECURITY")
-                    
-                    # Create RLS policies
-                    await conn.execute(f"""
-                        CREATE POLICY "Allow public read access to {table_name}" 
-                        ON {table_name} FOR SELECT USING (true)
-                    """)
-                    
-                    await conn.execute(f"""
-                        CREATE POLICY "Allow service role to manage {table_name}" 
-                        ON {table_name} FOR ALL USING ((select auth.role()) = 'service_role')
-                    """)
-                    
-                    logger.info(f"Created trend table {table_name}")
-                
+            await trend_schema.ensure_language(language)
         except Exception as e:
             logger.error(f"Failed to ensure trend table exists for {language}: {e}")
 
@@ -442,36 +533,55 @@ class MonthlyTrendUpdaterLanguageSpecific:
         logger.info("Starting monthly trend update for all languages...")
         
         try:
-            # Get all careers from core table
-            careers = await self.get_careers_from_core_table()
-            logger.info(f"Found {len(careers)} careers to update")
+            # Live progress for /api/trends/progress; this updater keeps no trend_update_log row
+            progress = progress_registry.start('language_specific')
             
             total_updates = 0
             successful_updates = 0
             failed_updates = 0
             errors = []
             
-            for language in self.supported_languages:
-                logger.info(f"Processing language: {language}")
+            # Careers stream in pages with their content for every language already attached
+            i = 0
+            content_start = time.monotonic()
+            async for career in self.iter_career_contents():
+                progress.observe('content', time.monotonic() - content_start)
+                i += 1
+                career_id = career['id']
+                logger.info(f"Processing career {i}: {career_id}")
+                progress.add_total(len(self.supported_languages))
+                
+                contents = {}
+                for language in self.supported_languages:
+                    if language in career['contents']:
+                        contents[language] = career['contents'][language]
+                    else:
+                        logger.warning(f"No content found for {career_id} in {language}, skipping")
+                        await progress.item_done()
                 
-                for i, career in enumerate(careers):
+                # One analysis for every language: the numbers are shared, the text is localized
+                analyses = {}
+                if self.multilingual_analysis and contents:
+                    stage_start = time.monotonic()
+                    analyses = await self.analyze_career_trend_all_languages(career_id, contents, list(contents))
+                    progress.observe('analyze', time.monotonic() - stage_start)
+                
+                for language, career_content in contents.items():
                     try:
-                        career_id = career['id']
-                        logger.info(f"Processing career {i+1}/{len(careers)}: {career_id} in {language}")
-                        
-                        # Get career content for this language
-                        career_content = await self.get_career_content_for_language(career_id, language)
-                        
-                        if not career_content:
-                            logger.warning(f"No content found for {career_id} in {language}, skipping")
-                            continue
-                        
-                        # Analyze trend
-                        trend_data = await self.analyze_career_trend(career_id, career_content, language)
+                        saved = False
+                        trend_data = analyses.get(language)
+                        if trend_data is None:
+                            # Single-language analysis, also covering languages the combined answer left out
+                            stage_start = time.monotonic()
+                            trend_data = await self.analyze_career_trend(career_id, career_content, language)
+                            progress.observe('analyze', time.monotonic() - stage_start)
                         
                         if trend_data:
                             # Save trend data
-                            if await self.save_trend_data(trend_data, language):
+                            stage_start = time.monotonic()
+                            saved = await self.save_trend_data(trend_data, language)
+                            progress.observe('save', time.monotonic() - stage_start)
+                            if saved:
                                 successful_updates += 1
                             else:
                                 failed_updates += 1
@@ -481,14 +591,17 @@ class MonthlyTrendUpdaterLanguageSpecific:
                             errors.append(f"Failed to analyze trend for {career_id} in {language}")
                         
                         total_updates += 1
-                        
-                        # Rate limiting
-                        await asyncio.sleep(1)
+                        await progress.item_done(failed=not saved)
                         
                     except Exception as e:
                         logger.error(f"Error processing {career_id} in {language}: {e}")
                         failed_updates += 1
                         errors.append(f"Error processing {career_id} in {language}: {str(e)}")
+                        await progress.item_done(failed=True)
+                
+                content_start = time.monotonic()
+            
+            await progress.finish('completed' if failed_updates == 0 else 'completed_with_errors')
             
             # Log summary
             logger.info(f"Update completed for all languages:")
@@ -0,0 +1,142 @@
+"""
+Progress reporting for trend update runs
+Keeps run counters in memory, writes them to trend_update_log every N items or T seconds,
+and exposes live rate, ETA and per-stage latency for the progress endpoint
+"""
+
+import os
+import time
+import logging
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, Optional
+from metrics import LatencyHistogram
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Stage latencies include LLM calls, so the buckets reach further than the request defaults
+STAGE_LATENCY_BUCKETS_MS = [10, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 20000, 30000, 60000, 120000]
+
+class ProgressReporter:
+    """Counters for one run, flushed to trend_update_log in coalesced writes"""
+
+    def __init__(self, name: str, db_pool=None, log_id=None):
+        self.name = name
+        self.db_pool = db_pool
+        self.log_id = log_id
+        self.flush_every = int(os.getenv('TREND_PROGRESS_FLUSH_EVERY', '25'))
+        self.flush_interval = float(os.getenv('TREND_PROGRESS_FLUSH_SECONDS', '10'))
+
+        self.status = 'running'
+        self.started_at = datetime.utcnow()
+        self.finished_at: Optional[datetime] = None
+        self._started = time.monotonic()
+        self._finished: Optional[float] = None
+
+        # Total grows while the run is still discovering work
+        self.total = 0
+        self.processed = 0
+        self.failed = 0
+        self.stage_latency: Dict[str, LatencyHistogram] = {}
+
+        self.flushes = 0
+        self._flushed_processed = 0
+        self._last_flush = self._started
+        self._flushing = False
+
+    def add_total(self, count: int = 1):
+        self.total += count
+
+    def observe(self, stage: str, seconds: float):
+        """Record how long one item spent in stage"""
+        histogram = self.stage_latency.get(stage)
+        if histogram is None:
+            histogram = self.stage_latency[stage] = LatencyHistogram(STAGE_LATENCY_BUCKETS_MS)
+        histogram.observe(seconds)
+
+    def timed(self, stage: str, handler: Callable[[Any], Awaitable[Any]]) -> Callable[[Any], Awaitable[Any]]:
+        """Wrap a pipeline stage handler so its latency is recorded under stage"""
+        async def timed_handler(item: Any) -> Any:
+            started = time.monotonic()
+            try:
+                return await handler(item)
+            finally:
+                self.observe(stage, time.monotonic() - started)
+        return timed_handler
+
+    async def item_done(self, failed: bool = False):
+        """Count a finished item; writes progress once enough items or time have passed"""
+        self.processed += 1
+        if failed:
+            self.failed += 1
+        if (self.processed - self._flushed_processed >= self.flush_every
+                or time.monotonic() - self._last_flush >= self.flush_interval):
+            await self.flush()
+
+    async def flush(self):
+        """Write the current counters to trend_update_log"""
+        if self.db_pool is None or self.log_id is None or self._flushing:
+            return
+        self._flushing = True
+        processed, total = self.processed, self.total
+        try:
+            async with self.db_pool.acquire() as conn:
+                await conn.execute(
+                    """UPDATE trend_update_log SET
+                        processed_careers = GREATEST(COALESCE(processed_careers, 0), $1),
+                        total_careers = GREATEST(COALESCE(total_careers, 0), $2)
+                    WHERE id = $3""",
+                    processed, total, self.log_id
+                )
+            self.flushes += 1
+            self._flushed_processed = processed
+            self._last_flush = time.monotonic()
+        except Exception as e:
+            logger.warning(f"Failed to write progress for {self.name}: {e}")
+        finally:
+            self._flushing = False
+
+    async def finish(self, status: str = 'completed', flush: bool = True):
+        """Stop the clock; flush=False when the caller's own final log update carries the counters"""
+        if flush:
+            await self.flush()
+        self.status = status
+        self.finished_at = datetime.utcnow()
+        self._finished = time.monotonic()
+
+    def snapshot(self) -> Dict[str, Any]:
+        elapsed = (self._finished or time.monotonic()) - self._started
+        rate = self.processed / elapsed if elapsed > 0 else 0.0
+        remaining = max(0, self.total - self.processed)
+        return {
+            "status": self.status,
+            "started_at": self.started_at.isoformat(),
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None,
+            "total": self.total,
+            "processed": self.processed,
+            "failed": self.failed,
+            "elapsed_seconds": round(elapsed, 1),
+            "rate_per_minute": round(rate * 60, 2),
+            "eta_seconds": round(remaining / rate, 1) if rate > 0 and self.status == 'running' else None,
+            "stage_latency": {stage: histogram.snapshot() for stage, histogram in self.stage_latency.items()},
+            "log_writes": self.flushes
+        }
+
+class ProgressRegistry:
+    """Latest run of each updater in this process"""
+
+    def __init__(self):
+        self._runs: Dict[str, ProgressReporter] = {}
+
+    def start(self, name: str, db_pool=None, log_id=None) -> ProgressReporter:
+        """Begin tracking a run, replacing the previous run of the same name"""
+        reporter = ProgressReporter(name, db_pool, log_id)
+        self._runs[name] = reporter
+        return reporter
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {name: reporter.snapshot() for name, reporter in self._runs.items()}
+
+# Global progress registry
+progress_registry = ProgressRegistry()
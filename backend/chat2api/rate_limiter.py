@@ -0,0 +1,197 @@
+"""
+Adaptive LLM rate limiter
+Requests-per-minute and tokens-per-minute token buckets per provider/model that back off
+on 429 responses and Retry-After headers and recover towards the configured quota
+"""
+
+import os
+import json
+import time
+import asyncio
+import logging
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, Optional
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+def estimate_tokens(text: str, max_tokens: int = 0) -> int:
+    """Rough token cost of a request: prompt characters / 4 plus the completion budget"""
+    return len(text) // 4 + max_tokens
+
+def parse_retry_after(headers: Any) -> Optional[float]:
+    """Seconds to wait from retry-after-ms or Retry-After (delta seconds or HTTP date)"""
+    if not headers:
+        return None
+    value = headers.get('retry-after-ms')
+    if value:
+        try:
+            return float(value) / 1000
+        except ValueError:
+            pass
+    value = headers.get('retry-after')
+    if not value:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    try:
+        return max(0.0, (parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return None
+
+class TokenBucket:
+    """Token bucket whose balance may go negative: callers reserve first and wait off the debt"""
+
+    def __init__(self, per_minute: float, burst_seconds: float):
+        self.rate = per_minute / 60.0
+        self.capacity = max(1.0, self.rate * burst_seconds)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+
+    def refill(self, now: float, scale: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate * scale)
+        self.updated = now
+
+    def reserve(self, amount: float, now: float, scale: float) -> float:
+        """Take amount now; returns the seconds until the balance is no longer negative"""
+        self.refill(now, scale)
+        self.tokens -= amount
+        return 0.0 if self.tokens >= 0 else -self.tokens / (self.rate * scale)
+
+    def refund(self, amount: float):
+        self.tokens = min(self.capacity, self.tokens + amount)
+
+class ModelRateLimiter:
+    """RPM and TPM limits for one provider/model"""
+
+    # Multiplicative decrease on 429, additive recovery on success
+    BACKOFF_FACTOR = 0.5
+    RECOVERY_STEP = 0.02
+    MIN_SCALE = 0.1
+
+    def __init__(self, name: str, rpm: float, tpm: float, burst_seconds: float):
+        self.name = name
+        self.rpm = rpm
+        self.tpm = tpm
+        self.requests = TokenBucket(rpm, burst_seconds)
+        self.tokens = TokenBucket(tpm, burst_seconds) if tpm > 0 else None
+        # Fraction of the configured quota currently allowed
+        self.scale = 1.0
+        self.blocked_until = 0.0
+
+        # Counters
+        self.acquired = 0
+        self.throttled = 0
+        self.wait_seconds = 0.0
+
+    async def acquire(self, tokens: int = 0) -> float:
+        """Wait for capacity for one request of about tokens tokens
+
+        Returns the tokens actually reserved, at most one bucket's capacity; settle against that.
+        """
+        now = time.monotonic()
+        # Reserving happens without awaiting, so concurrent callers queue up in order
+        wait = self.requests.reserve(1, now, self.scale)
+        reserved = 0
+        if self.tokens is not None and tokens:
+            reserved = min(tokens, self.tokens.capacity)
+            wait = max(wait, self.tokens.reserve(reserved, now, self.scale))
+        wait = max(wait, self.blocked_until - now)
+
+        waited = 0.0
+        try:
+            while wait > 0:
+                await asyncio.sleep(wait)
+                waited += wait
+                # A 429 seen while sleeping pushes everyone back
+                wait = self.blocked_until - time.monotonic()
+        except asyncio.CancelledError:
+            # A caller that gives up while queued hands its reservation back
+            self.requests.refund(1)
+            if reserved:
+                self.tokens.refund(reserved)
+            raise
+
+        self.acquired += 1
+        self.wait_seconds += waited
+        return reserved
+
+    def record(self, status: int, headers: Any = None, reserved_tokens: int = 0,
+               used_tokens: Optional[int] = None):
+        """Feed back a response: adapt to 429s and return unused token reservations"""
+        now = time.monotonic()
+        if used_tokens is not None:
+            self.settle(reserved_tokens, used_tokens)
+
+        # Settle the buckets at the old rate before changing it
+        self.requests.refill(now, self.scale)
+        if self.tokens is not None:
+            self.tokens.refill(now, self.scale)
+
+        if status == 429:
+            self.throttled += 1
+            self.scale = max(self.MIN_SCALE, self.scale * self.BACKOFF_FACTOR)
+            retry_after = parse_retry_after(headers)
+            # Without a hint, wait for one request slot at the reduced rate
+            pause = retry_after if retry_after is not None else 1.0 / (self.requests.rate * self.scale)
+            self.blocked_until = max(self.blocked_until, now + pause)
+            logger.warning(f"Rate limited on {self.name}; pausing {pause:.1f}s at {self.scale:.0%} of quota")
+        elif 200 <= status < 300 and self.scale < 1.0:
+            self.scale = min(1.0, self.scale + self.RECOVERY_STEP)
+
+    def settle(self, reserved_tokens: int, used_tokens: int):
+        """Return the part of a token reservation a finished or abandoned request didn't use"""
+        if self.tokens is not None and reserved_tokens > used_tokens:
+            self.tokens.refund(reserved_tokens - used_tokens)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "rpm": self.rpm,
+            "tpm": self.tpm,
+            "scale": round(self.scale, 3),
+            "acquired": self.acquired,
+            "throttled": self.throttled,
+            "wait_seconds": round(self.wait_seconds, 3),
+            "blocked_for": round(max(0.0, self.blocked_until - time.monotonic()), 3)
+        }
+
+class RateLimiterRegistry:
+    """Shared limiters keyed by provider and model"""
+
+    def __init__(self):
+        self.default_rpm = float(os.getenv('LLM_RPM_LIMIT', '60'))
+        self.default_tpm = float(os.getenv('LLM_TPM_LIMIT', '90000'))
+        self.burst_seconds = float(os.getenv('LLM_RATE_BURST_SECONDS', '10'))
+        # Per-model quotas, e.g. {"openai:gpt-4": {"rpm": 500, "tpm": 30000}}
+        try:
+            self.overrides = json.loads(os.getenv('LLM_RATE_LIMITS', '{}'))
+        except ValueError:
+            logger.error("Ignoring LLM_RATE_LIMITS: not valid JSON")
+            self.overrides = {}
+        self._limiters: Dict[str, ModelRateLimiter] = {}
+
+    def get(self, provider: str, model: str) -> ModelRateLimiter:
+        """Limiter for provider/model, created on first use"""
+        name = f"{provider}:{model}"
+        limiter = self._limiters.get(name)
+        if limiter is None:
+            quota = self.overrides.get(name) or self.overrides.get(provider) or {}
+            limiter = ModelRateLimiter(
+                name,
+                float(quota.get('rpm', self.default_rpm)),
+                float(quota.get('tpm', self.default_tpm)),
+                self.burst_seconds
+            )
+            self._limiters[name] = limiter
+        return limiter
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Counters for every limiter in use"""
+        return {name: limiter.get_stats() for name, limiter in self._limiters.items()}
+
+# Global limiter registry shared by every LLM caller
+rate_limiters = RateLimiterRegistry()
@@ -0,0 +1,126 @@
+"""
+Single-flight request coalescing for chat2api
+Ensures only one upstream generation runs per cache key at a time, within a worker
+through shared asyncio tasks and across workers through a Redis lock
+"""
+
+import os
+import time
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, Optional
+from cache_service import TieredCache, response_cache
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+class RequestCoalescer:
+    """Coalesces concurrent cache misses for the same key into one producer call"""
+
+    def __init__(self, cache: TieredCache):
+        self.cache = cache
+        # Upper bound on how long one generation may hold the cross-worker lock
+        self.lock_timeout = float(os.getenv('COALESCE_LOCK_TIMEOUT', '60'))
+        self.poll_interval = float(os.getenv('COALESCE_POLL_INTERVAL', '0.25'))
+        self._inflight: Dict[str, asyncio.Task] = {}
+
+        # Counters
+        self.leaders = 0
+        self.local_waiters = 0
+        self.remote_waits = 0
+        self.remote_hits = 0
+        self.lock_timeouts = 0
+
+    async def run(self, key: str, producer: Callable[[], Awaitable[Any]], ttl: int,
+                  accept: Optional[Callable[[Any], bool]] = None) -> Any:
+        """Return the producer result for key, sharing one in-flight generation
+
+        accept decides whether a value another worker cached is good enough to
+        return instead of generating; by default any non-empty value is.
+        """
+        task = self._inflight.get(key)
+        if task is None:
+            self.leaders += 1
+            # The generation runs as its own task so a disconnecting caller
+            # does not cancel the work other waiters depend on
+            task = asyncio.create_task(self._produce(key, producer, ttl, accept or bool))
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._forget(key, t))
+        else:
+            self.local_waiters += 1
+        return await asyncio.shield(task)
+
+    def _forget(self, key: str, task: asyncio.Task):
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        # Mark the exception as retrieved even if every waiter went away
+        if not task.cancelled():
+            task.exception()
+
+    async def _produce(self, key: str, producer: Callable[[], Awaitable[Any]], ttl: int,
+                       accept: Callable[[Any], bool]) -> Any:
+        redis = self.cache.redis
+        if redis is None:
+            return await self._generate(key, producer, ttl)
+
+        lock_name = f"lock:{key}"
+        lock = redis.lock(lock_name, timeout=self.lock_timeout)
+        try:
+            acquired = await lock.acquire(blocking=False)
+        except Exception as e:
+            logger.debug(f"Coalescing lock unavailable for {key}: {e}")
+            return await self._generate(key, producer, ttl)
+
+        if acquired:
+            try:
+                # Another worker may have filled the key between our miss and the lock
+                cached = await self.cache.get(key)
+                if accept(cached):
+                    return cached
+                return await self._generate(key, producer, ttl)
+            finally:
+                try:
+                    await lock.release()
+                except Exception:
+                    # Lock expired while generating; nothing left to release
+                    pass
+
+        # Another worker is generating this key: wait for its result
+        self.remote_waits += 1
+        deadline = time.monotonic() + self.lock_timeout
+        while time.monotonic() < deadline:
+            await asyncio.sleep(self.poll_interval)
+            cached = await self.cache.get(key)
+            if accept(cached):
+                self.remote_hits += 1
+                return cached
+            try:
+                if not await redis.exists(lock_name):
+                    # The other worker finished without caching a result
+                    break
+            except Exception:
+                break
+        else:
+            self.lock_timeouts += 1
+
+        return await self._generate(key, producer, ttl)
+
+    async def _generate(self, key: str, producer: Callable[[], Awaitable[Any]], ttl: int) -> Any:
+        result = await producer()
+        await self.cache.set(key, result, ttl)
+        return result
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Coalescing counters"""
+        return {
+            "in_flight": len(self._inflight),
+            "leaders": self.leaders,
+            "local_waiters": self.local_waiters,
+            "remote_waits": self.remote_waits,
+            "remote_hits": self.remote_hits,
+            "lock_timeouts": self.lock_timeouts
+        }
+
+# Global coalescer instance
+request_coalescer = RequestCoalescer(response_cache)
@@ -0,0 +1,204 @@
+"""
+AI response parsers for chat2api
+Turn free-form model output into the JSON structures the API returns
+"""
+
+from datetime import datetime
+from typing import List, Dict, Any
+from json_extract import extract_json
+
+# Schemas for the values each prompt asks for
+_OBJECT_LIST = {"type": "array", "items": {"type": "object"}}
+_STRING_LIST = {"type": "array", "items": {"type": "string"}}
+
+JOBS_SCHEMA = {"type": ["array", "object"]}
+TRENDS_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "trendingSkills": _OBJECT_LIST,
+        "emergingRoles": _OBJECT_LIST,
+        "industryInsights": _OBJECT_LIST
+    }
+}
+SKILLS_SCHEMA = _OBJECT_LIST
+ASSESSMENT_SCHEMA = {
+    "type": "object",
+    "required": ["careerPaths"],
+    "properties": {
+        "careerPaths": _OBJECT_LIST,
+        "skillDevelopment": _OBJECT_LIST,
+        "roadmap": {"type": "object"}
+    }
+}
+CAREERS_SCHEMA = _OBJECT_LIST
+CAREER_SCHEMA = {"type": "object"}
+ROADMAP_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "shortTerm": {"type": "array"},
+        "mediumTerm": {"type": "array"},
+        "longTerm": {"type": "array"}
+    }
+}
+MARKET_DATA_SCHEMA = {"type": "object"}
+
+# Trend analysis returned to the monthly trend updaters; ranges mirror the
+# career_trends CHECK constraints so bad generations never reach the database
+_SCORE = {"type": "number", "minimum": 0, "maximum": 10}
+TREND_ANALYSIS_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "trend_score": _SCORE,
+        "trend_direction": {"enum": ["rising", "stable", "declining"]},
+        "demand_level": {"enum": ["high", "medium", "low"]},
+        "growth_rate": {"type": "number"},
+        "market_insights": {"type": "string"},
+        "key_skills_trending": _STRING_LIST,
+        "salary_trend": {"type": "string"},
+        "job_availability_score": _SCORE,
+        "top_locations": _STRING_LIST,
+        "remote_work_trend": _SCORE,
+        "industry_impact": {"type": "string"},
+        "automation_risk": _SCORE,
+        "future_outlook": {"type": "string"},
+        "confidence_score": _SCORE,
+        "salary_info": {
+            "type": "object",
+            "properties": {
+                "base_salary": {"type": "number", "minimum": 0},
+                "region": {"type": "string"}
+            }
+        }
+    }
+}
+
+# Trend analysis with the text fields repeated per language under "localized"
+LOCALIZED_TREND_FIELDS = ("market_insights", "salary_trend", "industry_impact", "future_outlook")
+MULTILINGUAL_TREND_ANALYSIS_SCHEMA = {
+    **TREND_ANALYSIS_SCHEMA,
+    "required": ["localized"],
+    "properties": {
+        **TREND_ANALYSIS_SCHEMA["properties"],
+        "localized": {"type": "object"}
+    }
+}
+LOCALIZED_TREND_SCHEMA = {
+    "type": "object",
+    "properties": {field: {"type": "string"} for field in LOCALIZED_TREND_FIELDS}
+}
+# {"translations": {"<id>": {"<language code>": "<translation>"}}}
+BATCH_TRANSLATION_SCHEMA = {
+    "type": "object",
+    "required": ["translations"],
+    "properties": {"translations": {"type": "object"}}
+}
+
+def parse_job_response(response: str) -> List[Dict[str, Any]]:
+    """Parse AI response into job data format"""
+    try:
+        data = extract_json(response, schema=JOBS_SCHEMA)
+        if isinstance(data, list):
+            return data
+        elif 'jobs' in data:
+            return data['jobs']
+    except ValueError:
+        pass
+    
+    # Return fallback data if parsing fails
+    return [
+        {
+            "id": "fallback-1",
+            "title": "Software Engineer",
+            "company": "Tech Company",
+            "location": "Remote",
+            "salary": {"min": 80000, "max": 120000, "currency": "USD"},
+            "skills": ["JavaScript", "React", "Node.js"],
+            "experience": "Mid Level",
+            "type": "full-time",
+            "postedDate": datetime.utcnow().isoformat(),
+            "demand": "high",
+            "growthRate": 15,
+            "industry": "Technology",
+            "description": "Fallback job data when APIs are unavailable."
+        }
+    ]
+
+def parse_trends_response(response: str) -> Dict[str, Any]:
+    """Parse AI response into trends format"""
+    try:
+        return extract_json(response, "{", TRENDS_SCHEMA)
+    except ValueError:
+        pass
+    
+    # Return fallback trends
+    return {
+        "trendingSkills": [
+            {"skill": "AI/ML", "demand": 95, "growth": 25, "salary": 120000},
+            {"skill": "Cybersecurity", "demand": 90, "growth": 20, "salary": 110000}
+        ],
+        "emergingRoles": [
+            {"title": "AI Engineer", "description": "Build AI models", "growth": 30, "skills": ["Python", "ML"]}
+        ],
+        "industryInsights": [
+            {"industry": "Technology", "growth": 15, "jobCount": 50000, "avgSalary": 95000}
+        ]
+    }
+
+def parse_skills_response(response: str) -> List[Dict[str, Any]]:
+    """Parse AI response into skills format"""
+    try:
+        return extract_json(response, "[", SKILLS_SCHEMA)
+    except ValueError:
+        pass
+    
+    # Return fallback skills data
+    return [
+        {
+            "skill": "JavaScript",
+            "demand": 90,
+            "salary": 95000,
+            "growth": 15,
+            "relatedSkills": ["TypeScript", "React"],
+            "certifications": ["AWS Certified Developer"]
+        }
+    ]
+
+def parse_assessment_response(response: str) -> Dict[str, Any]:
+    """Parse AI response into assessment recommendations format"""
+    try:
+        return extract_json(response, "{", ASSESSMENT_SCHEMA)
+    except ValueError as e:
+        # Throw error instead of returning fallback data
+        raise ValueError(f"Failed to parse assessment recommendations from AI response: {e}") from e
+
+def parse_careers_response(response: str) -> List[Dict[str, Any]]:
+    """Parse AI response into careers list format"""
+    try:
+        return extract_json(response, "[", CAREERS_SCHEMA)
+    except ValueError as e:
+        # Throw error instead of returning fallback data
+        raise ValueError(f"Failed to parse careers data from AI response: {e}") from e
+
+def parse_single_career_response(response: str) -> Dict[str, Any]:
+    """Parse AI response into single career format"""
+    try:
+        return extract_json(response, "{", CAREER_SCHEMA)
+    except ValueError as e:
+        # Throw error instead of returning fallback data
+        raise ValueError(f"Failed to parse career data from AI response: {e}") from e
+
+def parse_roadmap_response(response: str) -> Dict[str, Any]:
+    """Parse AI response into roadmap format"""
+    try:
+        return extract_json(response, "{", ROADMAP_SCHEMA)
+    except ValueError as e:
+        # Throw error instead of returning fallback data
+        raise ValueError(f"Failed to parse roadmap data from AI response: {e}") from e
+
+def parse_market_data_response(response: str) -> Dict[str, Any]:
+    """Parse AI response into market data format"""
+    try:
+        return extract_json(response, "{", MARKET_DATA_SCHEMA)
+    except ValueError as e:
+        # Throw error instead of returning fallback data
+        raise ValueError(f"Failed to parse market data from AI response: {e}") from e
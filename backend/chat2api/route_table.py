@@ -0,0 +1,67 @@
+"""
+Route table checks for chat2api
+Detects duplicate and shadowed routes and resolves which handler serves a request
+"""
+
+import re
+import logging
+from typing import Iterable, List, Optional, Tuple
+from starlette.routing import BaseRoute, Match, Route
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+_PATH_PARAM = re.compile(r"\{[^}]+\}")
+
+def flatten_routes(routes: Iterable[BaseRoute]) -> List[BaseRoute]:
+    """Routes in match order; newer FastAPI versions keep included routers nested"""
+    flat: List[BaseRoute] = []
+    for route in routes:
+        included = getattr(route, "original_router", None)
+        if included is not None:
+            flat.extend(flatten_routes(included.routes))
+        else:
+            flat.append(route)
+    return flat
+
+def _http_routes(routes: Iterable[BaseRoute]) -> List[Tuple[int, Route]]:
+    return [(i, route) for i, route in enumerate(flatten_routes(routes))
+            if isinstance(route, Route) and route.methods]
+
+def find_route_conflicts(routes: Iterable[BaseRoute]) -> List[str]:
+    """Describe every route that can never be reached because an earlier one takes its requests"""
+    http_routes = _http_routes(routes)
+    conflicts = []
+    for index, route in http_routes:
+        shape = _PATH_PARAM.sub("{}", route.path)
+        for method in sorted(route.methods):
+            for earlier_index, earlier in http_routes:
+                if earlier_index >= index or method not in earlier.methods:
+                    continue
+                if _PATH_PARAM.sub("{}", earlier.path) == shape:
+                    conflicts.append(f"{method} {route.path} ({route.name}) duplicates "
+                                     f"{earlier.path} ({earlier.name})")
+                    break
+                # A static path matched by an earlier parameterized route is shadowed
+                if "{" not in route.path and earlier.path_regex.match(route.path):
+                    conflicts.append(f"{method} {route.path} ({route.name}) is shadowed by "
+                                     f"{earlier.path} ({earlier.name})")
+                    break
+    return conflicts
+
+def check_route_table(app) -> None:
+    """Fail startup if any route is duplicated or shadowed"""
+    conflicts = find_route_conflicts(app.routes)
+    if conflicts:
+        raise RuntimeError("Unreachable routes registered:\n  " + "\n  ".join(conflicts))
+    logger.info(f"Route table OK ({len(_http_routes(app.routes))} HTTP routes)")
+
+def resolve_route(app, method: str, path: str) -> Optional[Route]:
+    """The route the router would dispatch method/path to, mirroring Starlette's first-match rule"""
+    scope = {"type": "http", "method": method.upper(), "path": path, "root_path": ""}
+    for route in flatten_routes(app.routes):
+        match, _ = route.matches(scope)
+        if match == Match.FULL:
+            return route
+    return None
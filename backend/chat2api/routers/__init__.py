@@ -0,0 +1,14 @@
+"""
+API routers for chat2api
+ROUTERS is the registration order; within the app, earlier routes win when paths overlap
+"""
+
+from routers import health, careers, trending, market, chat
+
+ROUTERS = [
+    health.router,
+    careers.router,
+    trending.router,
+    market.router,
+    chat.router
+]
@@ -0,0 +1,199 @@
+"""
+Career routes
+Catalog-backed career listing, details and search plus AI-generated roadmaps and market data
+
+Static paths are registered before /api/careers/{career_id} so they are never
+captured as a career ID; test_route_precedence.py guards this ordering.
+"""
+
+from datetime import datetime
+from fastapi import APIRouter, HTTPException
+from models import CareerUpdateRequest, CareerRoadmapRequest, CareerSearchRequest
+from ai_client import generate_ai_json
+from generation_cache import get_cache_key, get_or_generate, get_or_generate_swr
+from response_parsers import (
+    parse_careers_response, parse_roadmap_response, parse_market_data_response
+)
+from career_catalog import career_catalog
+from supabase_career_service import supabase_career_service
+from scheduler import monthly_scheduler
+
+router = APIRouter()
+
+# Static paths
+@router.get("/api/careers")
+async def get_all_careers():
+    """Get all available careers with current market data"""
+    # Never empty: the catalog starts from the static fallback and keeps its last good snapshot
+    return career_catalog.all()
+
+@router.get("/api/careers/search")
+async def search_careers(q: str = ""):
+    """Search careers by query"""
+    try:
+        return career_catalog.search(q)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error searching careers: {str(e)}")
+
+@router.post("/api/careers/search")
+async def search_careers_by_criteria(request: CareerSearchRequest):
+    """Search careers based on criteria"""
+    salary_min = request.salary.get('min') if request.salary else None
+    salary_max = request.salary.get('max') if request.salary else None
+    
+    # Deterministic search over the indexed catalog; the LLM is only asked
+    # when nothing in the catalog matches
+    results = career_catalog.structured_search(
+        skills=request.skills,
+        salary_min=salary_min,
+        salary_max=salary_max,
+        level=request.level,
+        category=request.category
+    )
+    if results:
+        return results
+    
+    cache_key = get_cache_key("career_search", 
+                             skills=",".join(request.skills or []),
+                             salary_min=salary_min,
+                             salary_max=salary_max,
+                             level=request.level,
+                             category=request.category)
+    
+    try:
+        prompt = f"""Search for careers matching these criteria:
+
+Skills: {', '.join(request.skills or [])}
+Salary Range: {request.salary.get('min') if request.salary else 'Any'} - {request.salary.get('max') if request.salary else 'Any'}
+Level: {request.level or 'Any'}
+Category: {request.category or 'Any'}
+
+Return matching careers with current market data in JSON format."""
+        
+        async def produce():
+            response = await generate_ai_json(prompt)
+            return parse_careers_response(response)
+        
+        return await get_or_generate(cache_key, produce, ttl=3600)  # Cache for 1 hour
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/api/careers/update")
+async def force_career_update():
+    """Force an immediate career data update (admin endpoint)"""
+    try:
+        await monthly_scheduler.force_update()
+        return {"message": "Career data update initiated", "timestamp": datetime.utcnow().isoformat()}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to update career data: {str(e)}")
+
+@router.get("/api/careers/stats")
+async def get_career_stats():
+    """Get career data statistics"""
+    try:
+        stats = await supabase_career_service.get_career_stats()
+        return stats
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to get career stats: {str(e)}")
+
+@router.get("/api/careers/update-status")
+async def get_update_status():
+    """Check if career data should be updated"""
+    try:
+        should_update = await supabase_career_service.should_update_careers()
+        return {
+            "should_update": should_update,
+            "timestamp": datetime.utcnow().isoformat()
+        }
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to check update status: {str(e)}")
+
+@router.post("/api/careers/roadmap")
+async def generate_career_roadmap(request: CareerRoadmapRequest):
+    """Generate personalized career roadmap"""
+    cache_key = get_cache_key("career_roadmap", 
+                             career_id=request.careerId,
+                             current_level=request.currentLevel,
+                             target_level=request.targetLevel)
+    
+    try:
+        prompt = f"""Generate a personalized career roadmap for transitioning from {request.currentLevel} to {request.targetLevel} in {request.careerId}.
+
+Current Skills: {', '.join(request.skills)}
+Current Experience: {request.experience}
+
+Provide a detailed roadmap with:
+1. Short-term goals (3-6 months)
+2. Medium-term goals (6-12 months) 
+3. Long-term goals (1+ years)
+
+Each goal should be specific, actionable, and include:
+- Skills to develop
+- Certifications to obtain
+- Experience to gain
+- Milestones to achieve
+
+Return in JSON format with shortTerm, mediumTerm, and longTerm arrays."""
+        
+        async def produce():
+            response = await generate_ai_json(prompt)
+            return parse_roadmap_response(response)
+        
+        return await get_or_generate(cache_key, produce, ttl=604800)  # Cache for 1 week
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+# Parameterized paths
+@router.get("/api/careers/{career_id}")
+async def get_career_data(career_id: str):
+    """Get specific career data with current market information"""
+    career = career_catalog.get(career_id)
+    # Unknown IDs stop here: generating for arbitrary IDs would let callers run up LLM costs
+    if not career:
+        raise HTTPException(status_code=404, detail="Career not found")
+    return career
+
+@router.put("/api/careers/{career_id}")
+async def update_career_data(career_id: str, request: CareerUpdateRequest):
+    """Per-career edits are not supported; careers come from the catalog"""
+    # Generated edits used to go to a cache nothing reads, so they cost a generation and changed nothing
+    if not career_catalog.get(career_id):
+        raise HTTPException(status_code=404, detail="Career not found")
+    raise HTTPException(
+        status_code=501,
+        detail="Career updates are not supported; career data is refreshed from the catalog"
+    )
+
+@router.post("/api/careers/{career_id}/refresh")
+async def refresh_career_data(career_id: str):
+    """Per-career refreshes are not supported; use /api/careers/update to refresh the catalog"""
+    if not career_catalog.get(career_id):
+        raise HTTPException(status_code=404, detail="Career not found")
+    raise HTTPException(
+        status_code=501,
+        detail="Per-career refresh is not supported; use POST /api/careers/update to refresh all careers"
+    )
+
+@router.get("/api/careers/{career_id}/market")
+async def get_career_market_data(career_id: str):
+    """Get current market data for a specific career"""
+    cache_key = get_cache_key("career_market", career_id=career_id)
+    
+    try:
+        prompt = f"""Provide current market data for {career_id} including:
+
+1. Job demand score (0-100)
+2. Growth rate percentage
+3. Average salary range
+4. Number of current job openings
+5. Market trends and outlook
+
+Return in JSON format with demand, growth, averageSalary, jobOpenings, and lastUpdated fields."""
+        
+        async def produce():
+            response = await generate_ai_json(prompt)
+            return parse_market_data_response(response)
+        
+        return await get_or_generate_swr(cache_key, produce, ttl=86400)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
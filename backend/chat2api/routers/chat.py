@@ -0,0 +1,100 @@
+"""
+Chat completion routes
+OpenAI-compatible /v1/chat/completions with exact, approximate and streaming caches
+"""
+
+import os
+from contextlib import aclosing
+from typing import List, AsyncIterator
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
+from models import ChatMessage, ChatRequest
+from ai_client import UpstreamFallback, forward_to_openai, forward_to_openai_stream
+from generation_cache import CACHE_TTL, get_cache_key, get_cached_response, cache_response
+from request_coalescer import request_coalescer
+from chat_cache import (
+    CHAT_CACHE_APPROXIMATE, chat_request_digest, chat_params_namespace, chat_similarity_index
+)
+
+CHAT_CACHE_TTL = int(os.getenv("CHAT_CACHE_TTL", str(CACHE_TTL)))
+
+router = APIRouter()
+
+@router.post("/v1/chat/completions")
+async def chat_completions(request: ChatRequest):
+    """Main chat completions endpoint compatible with OpenAI API"""
+    if request.stream:
+        return StreamingResponse(
+            stream_chat_completion(request),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+        )
+    
+    try:
+        cache_key = get_chat_cache_key("chat_completion", request)
+        cached = await get_cached_response(cache_key)
+        if cached:
+            return cached
+        
+        # Near-duplicate prompts with identical sampling parameters (opt-in)
+        namespace, signature = None, None
+        if CHAT_CACHE_APPROXIMATE:
+            namespace = chat_params_namespace(request.model, request.temperature, request.max_tokens)
+            signature = chat_similarity_index.signature(chat_messages_text(request.messages))
+            similar_key = chat_similarity_index.lookup(namespace, signature)
+            if similar_key:
+                cached = await get_cached_response(similar_key)
+                if cached:
+                    return cached
+        
+        # Forward to OpenAI or use fallback
+        async def produce():
+            return await forward_to_openai(request)
+        
+        try:
+            response = await request_coalescer.run(cache_key, produce, CHAT_CACHE_TTL)
+        except UpstreamFallback as fallback:
+            # Served once, never cached or indexed, so the next request retries upstream
+            return fallback.response
+        if signature is not None:
+            chat_similarity_index.add(namespace, cache_key, signature)
+        
+        return response
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+def get_chat_cache_key(request_type: str, request: ChatRequest) -> str:
+    """Cache key from a canonical hash of the normalized messages and sampling parameters"""
+    digest = chat_request_digest([(msg.role, msg.content) for msg in request.messages],
+                                 request.model, request.temperature, request.max_tokens)
+    return get_cache_key(request_type, digest=digest)
+
+def chat_messages_text(messages: List[ChatMessage]) -> str:
+    """Flatten messages into the text used for near-duplicate matching"""
+    return "\n".join(f"{msg.role}: {msg.content}" for msg in messages)
+
+async def stream_chat_completion(request: ChatRequest) -> AsyncIterator[str]:
+    """Proxy a chat completion as Server-Sent Events, replaying from cache when possible"""
+    cache_key = get_chat_cache_key("chat_stream", request)
+    cached = await get_cached_response(cache_key)
+    if cached:
+        yield "".join(f"data: {payload}\n\n" for payload in cached) + "data: [DONE]\n\n"
+        return
+    
+    chunks: List[str] = []
+    completed = False
+    # Closed as soon as we stop reading, so the upstream stream and its token settlement
+    # don't wait for garbage collection
+    async with aclosing(forward_to_openai_stream(request)) as stream:
+        async for payload in stream:
+            if payload == "[DONE]":
+                completed = True
+                break
+            chunks.append(payload)
+            yield f"data: {payload}\n\n"
+    yield "data: [DONE]\n\n"
+    
+    # Only complete upstream streams are cached: fallbacks and broken streams end without
+    # [DONE], and a disconnect cancels this generator before here
+    if completed and chunks:
+        await cache_response(cache_key, chunks, CHAT_CACHE_TTL)
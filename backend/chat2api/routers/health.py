@@ -0,0 +1,45 @@
+"""
+Health and metrics routes
+Deployment health check and in-process cache, pool and catalog metrics
+"""
+
+from datetime import datetime
+from fastapi import APIRouter
+from cache_service import response_cache
+from http_client import openai_http_client, chat2api_connection_metrics
+from request_coalescer import request_coalescer
+from chat_cache import chat_similarity_index
+from career_catalog import career_catalog
+from rate_limiter import rate_limiters
+from db import database
+from translation_memory import translation_memory
+from scheduler import monthly_scheduler
+
+router = APIRouter()
+
+# Health check endpoint for deployment platforms
+@router.get("/health")
+async def health_check():
+    """Health check endpoint for deployment platforms"""
+    return {
+        "status": "healthy",
+        "timestamp": datetime.utcnow().isoformat(),
+        "scheduler_running": monthly_scheduler.running,
+        "redis_connected": response_cache.redis_available
+    }
+
+@router.get("/api/metrics")
+async def get_metrics():
+    """In-process cache, upstream pool, catalog and rate limiter metrics"""
+    return {
+        "cache": response_cache.get_stats(),
+        "coalescing": request_coalescer.get_stats(),
+        "upstream_http": openai_http_client.get_stats(),
+        "chat2api_http": chat2api_connection_metrics.get_stats(),
+        "chat_similarity_index": chat_similarity_index.get_stats(),
+        "career_catalog": career_catalog.get_stats(),
+        "rate_limits": rate_limiters.get_stats(),
+        "database": database.get_stats(),
+        "translation_memory": translation_memory.get_stats(),
+        "timestamp": datetime.utcnow().isoformat()
+    }
@@ -0,0 +1,132 @@
+"""
+Market insight routes
+AI-generated job market, trend and skills data served through the response cache
+"""
+
+from fastapi import APIRouter, HTTPException
+from models import JobMarketRequest, MarketTrendsRequest, SkillsRequest, SkillsAssessmentRequest
+from ai_client import generate_ai_json
+from generation_cache import get_cache_key, get_or_generate
+from response_parsers import (
+    parse_job_response, parse_trends_response, parse_skills_response, parse_assessment_response
+)
+
+router = APIRouter()
+
+@router.post("/api/jobs/market")
+async def get_job_market_data(request: JobMarketRequest):
+    """Get job market data for specific industry and location"""
+    cache_key = get_cache_key("job_market", 
+                             industry=request.industry, 
+                             location=request.location)
+    
+    try:
+        # Generate job market data using AI
+        prompt = f"""Find current job openings for {request.industry} positions in {request.location}. 
+        Return the data in JSON format with fields: id, title, company, location, salary (min, max, currency), 
+        skills, experience, type, postedDate, demand, growthRate, industry, description.
+        Generate {request.limit} realistic job postings."""
+        
+        async def produce():
+            response = await generate_ai_json(prompt)
+            return parse_job_response(response)
+        
+        return await get_or_generate(cache_key, produce)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/api/trends/market")
+async def get_market_trends(request: MarketTrendsRequest):
+    """Get market trends and insights"""
+    cache_key = get_cache_key("market_trends", 
+                             industries=",".join(request.industries) if request.industries else "all")
+    
+    try:
+        prompt = """Provide current market trends for technology and other industries including:
+        1. Trending skills with demand scores (0-100), growth rates, and salary estimates
+        2. Emerging job roles with descriptions, growth rates, and required skills
+        3. Industry insights with growth rates, job counts, and average salaries
+        Return in JSON format matching the MarketTrends interface."""
+        
+        async def produce():
+            response = await generate_ai_json(prompt)
+            return parse_trends_response(response)
+        
+        return await get_or_generate(cache_key, produce)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/api/skills/data")
+async def get_skills_data(request: SkillsRequest):
+    """Get skills assessment data"""
+    cache_key = get_cache_key("skills_data", skill_name=request.skill_name)
+    
+    try:
+        prompt = f"""Provide detailed information about {request.skill_name or 'in-demand technical skills'} including:
+        demand score (0-100), salary estimates, growth rate, related skills, and relevant certifications.
+        Return in JSON format matching the SkillsData interface."""
+        
+        async def produce():
+            response = await generate_ai_json(prompt)
+            return parse_skills_response(response)
+        
+        return await get_or_generate(cache_key, produce)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/api/skills/assessment")
+async def get_skills_assessment_recommendations(request: SkillsAssessmentRequest):
+    """Get personalized career recommendations based on skills assessment"""
+    cache_key = get_cache_key("skills_assessment", 
+                             skills=",".join(sorted(request.skills)),
+                             experience=request.experience_level,
+                             goal=request.selected_career_goal)
+    
+    try:
+        prompt = f"""Based on this skills assessment, provide personalized career recommendations:
+
+Skills: {', '.join(request.skills)}
+Experience Level: {request.experience_level}
+Current Role: {request.current_role}
+Experience Details: {request.experience_details}
+Career Goal: {request.selected_career_goal}
+Additional Goals: {request.goals_details}
+
+Please provide recommendations in this exact JSON format:
+{{
+  "careerPaths": [
+    {{
+      "title": "Job Title",
+      "match": "95%",
+      "description": "Why this career path matches",
+      "salary": "Salary range",
+      "growth": "Growth potential",
+      "requiredSkills": ["skill1", "skill2"],
+      "nextSteps": ["step1", "step2"]
+    }}
+  ],
+  "skillDevelopment": [
+    {{
+      "skill": "Skill Name",
+      "priority": "High/Medium/Low",
+      "timeline": "3-6 months",
+      "description": "Why this skill is important",
+      "resources": ["resource1", "resource2"]
+    }}
+  ],
+  "roadmap": {{
+    "shortTerm": ["Goal 1", "Goal 2"],
+    "mediumTerm": ["Goal 1", "Goal 2"],
+    "longTerm": ["Goal 1", "Goal 2"]
+  }}
+}}
+
+Make the recommendations highly personalized and actionable based on their specific skills, experience, and goals."""
+        
+        async def produce():
+            response = await generate_ai_json(prompt)
+            return parse_assessment_response(response)
+        
+        return await get_or_generate(cache_key, produce)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
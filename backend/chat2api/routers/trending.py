@@ -0,0 +1,129 @@
+"""
+Trending data and trend update routes
+Admin triggers and status for the monthly and language-specific trend updaters
+"""
+
+import json
+from datetime import datetime
+from fastapi import APIRouter, HTTPException
+from supabase_trending_service import supabase_trending_service
+from scheduler import monthly_scheduler
+from scheduler_language_specific import TrendUpdateScheduler
+from progress_reporter import progress_registry
+
+# Initialize language-specific scheduler
+trend_scheduler = TrendUpdateScheduler()
+
+router = APIRouter()
+
+# Trending data endpoints
+@router.get("/api/trending/skills")
+async def get_trending_skills():
+    """Get trending skills data"""
+    try:
+        # This would typically fetch from Supabase, but for now return sample data
+        # In production, this would be handled by the frontend Supabase service
+        return {"message": "Use Supabase client directly for trending skills"}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to get trending skills: {str(e)}")
+
+@router.get("/api/trending/industries")
+async def get_trending_industries():
+    """Get trending industries data"""
+    try:
+        return {"message": "Use Supabase client directly for trending industries"}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to get trending industries: {str(e)}")
+
+@router.get("/api/trending/roles")
+async def get_emerging_roles():
+    """Get emerging roles data"""
+    try:
+        return {"message": "Use Supabase client directly for emerging roles"}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to get emerging roles: {str(e)}")
+
+@router.post("/api/trending/update")
+async def force_trending_update():
+    """Force an immediate trending data update (admin endpoint)"""
+    try:
+        await monthly_scheduler.force_trending_update()
+        return {"message": "Trending data update initiated", "timestamp": datetime.utcnow().isoformat()}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to update trending data: {str(e)}")
+
+@router.get("/api/trending/stats")
+async def get_trending_stats():
+    """Get trending data statistics"""
+    try:
+        stats = await supabase_trending_service.get_trending_stats()
+        return stats
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to get trending stats: {str(e)}")
+
+@router.get("/api/trending/update-status")
+async def get_trending_update_status():
+    """Check if trending data should be updated"""
+    try:
+        should_update = await supabase_trending_service.should_update_trending_data()
+        return {
+            "should_update": should_update,
+            "timestamp": datetime.utcnow().isoformat()
+        }
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to check trending update status: {str(e)}")
+
+# Language-specific trend update endpoints
+@router.post("/api/trends/language-specific/update")
+async def force_language_specific_trend_update():
+    """Force an immediate language-specific trend update (admin endpoint)"""
+    try:
+        await trend_scheduler.run_immediate_update()
+        return {
+            "message": "Language-specific trend update initiated", 
+            "timestamp": datetime.utcnow().isoformat()
+        }
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to update language-specific trends: {str(e)}")
+
+@router.get("/api/trends/language-specific/status")
+async def get_language_specific_trend_status():
+    """Get status of language-specific trend updates"""
+    try:
+        try:
+            with open('last_update_status.json', 'r') as f:
+                status = json.load(f)
+        except FileNotFoundError:
+            status = {
+                "last_run": None,
+                "successful": 0,
+                "failed": 0,
+                "status": "never_run"
+            }
+        
+        return {
+            "status": status,
+            "timestamp": datetime.utcnow().isoformat()
+        }
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to get trend update status: {str(e)}")
+
+@router.get("/api/trends/progress")
+async def get_trend_update_progress():
+    """Live progress of trend update runs in this process (rate, ETA, per-stage latency)"""
+    return {
+        "runs": progress_registry.snapshot(),
+        "timestamp": datetime.utcnow().isoformat()
+    }
+
+@router.post("/api/trends/language-specific/schedule")
+async def schedule_language_specific_updates():
+    """Schedule language-specific trend updates"""
+    try:
+        trend_scheduler.schedule_monthly_updates()
+        return {
+            "message": "Language-specific trend updates scheduled",
+            "timestamp": datetime.utcnow().isoformat()
+        }
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to schedule updates: {str(e)}")
@@ -0,0 +1,126 @@
+"""
+Schema bootstrap for the language-specific trend tables
+Applies versioned migrations to career_trends_{lang} once per process and remembers
+which languages are ready, so update runs don't query the catalog per save
+"""
+
+import asyncio
+import logging
+from typing import Dict, Iterable, List, Set, Tuple
+from db import database
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Versioned migrations for career_trends_{lang}; {table} is the language's table name.
+# Each step is idempotent so tables created before versioning are adopted as they are.
+TREND_TABLE_MIGRATIONS: List[Tuple[int, str]] = [
+    (1, """
+    CREATE TABLE IF NOT EXISTS {table} (
+        career_id TEXT PRIMARY KEY REFERENCES careers_core(id) ON DELETE CASCADE,
+        trend_score DECIMAL(3,2) NOT NULL CHECK (trend_score >= 0 AND trend_score <= 10),
+        trend_direction TEXT NOT NULL CHECK (trend_direction IN ('rising', 'stable', 'declining')),
+        demand_level TEXT NOT NULL CHECK (demand_level IN ('high', 'medium', 'low')),
+        growth_rate DECIMAL(5,2),
+        market_insights TEXT,
+        key_skills_trending TEXT[],
+        salary_trend TEXT,
+        job_availability_score DECIMAL(3,2) CHECK (job_availability_score >= 0 AND job_availability_score <= 10),
+        top_locations TEXT[],
+        remote_work_trend DECIMAL(3,2) CHECK (remote_work_trend >= 0 AND remote_work_trend <= 10),
+        industry_impact TEXT,
+        automation_risk DECIMAL(3,2) CHECK (automation_risk >= 0 AND automation_risk <= 10),
+        future_outlook TEXT,
+        confidence_score DECIMAL(3,2) CHECK (confidence_score >= 0 AND confidence_score <= 10),
+        last_updated TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+        next_update_due TIMESTAMP WITH TIME ZONE DEFAULT (NOW() + INTERVAL '1 month'),
+        created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+        updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+    );
+    ALTER TABLE {table} ENABLE ROW LEVEL SECURITY;
+    DO $$
+    BEGIN
+        IF NOT EXISTS (SELECT 1 FROM pg_policies WHERE tablename = '{table}' AND policyname = 'Allow public read access to {table}') THEN
+            CREATE POLICY "Allow public read access to {table}" ON {table} FOR SELECT USING (true);
+        END IF;
+        IF NOT EXISTS (SELECT 1 FROM pg_policies WHERE tablename = '{table}' AND policyname = 'Allow service role to manage {table}') THEN
+            CREATE POLICY "Allow service role to manage {table}" ON {table} FOR ALL USING ((select auth.role()) = 'service_role');
+        END IF;
+    END $$;
+    """),
+    # Currency support
+    (2, """
+    ALTER TABLE {table}
+        ADD COLUMN IF NOT EXISTS currency_code TEXT DEFAULT 'USD',
+        ADD COLUMN IF NOT EXISTS salary_data JSONB;
+    """),
+]
+
+LATEST_VERSION = TREND_TABLE_MIGRATIONS[-1][0]
+
+# Serializes schema changes across processes for the length of the migrating transaction
+_MIGRATION_LOCK_KEY = 727001
+
+class TrendSchemaManager:
+    """Brings career_trends_{lang} tables to the latest migration, at most once per process"""
+
+    def __init__(self):
+        self._known: Set[str] = set()
+        self._lock = asyncio.Lock()
+
+    def trend_table(self, language: str) -> str:
+        return f"career_trends_{language}"
+
+    def is_ready(self, language: str) -> bool:
+        return language in self._known
+
+    async def ensure_language(self, language: str):
+        """Make sure language's trend table is migrated; free once it is known"""
+        if language not in self._known:
+            await self.ensure_languages([language])
+
+    async def ensure_languages(self, languages: Iterable[str]):
+        """Migrate every missing language's trend table in one transaction"""
+        async with self._lock:
+            pending = [language for language in dict.fromkeys(languages) if language not in self._known]
+            if not pending:
+                return
+
+            tables = {self.trend_table(language): language for language in pending}
+            async with database.acquire() as conn:
+                async with conn.transaction():
+                    await conn.execute("SELECT pg_advisory_xact_lock($1)", _MIGRATION_LOCK_KEY)
+                    await conn.execute("""
+                        CREATE TABLE IF NOT EXISTS schema_migrations (
+                            table_name TEXT NOT NULL,
+                            version INTEGER NOT NULL,
+                            applied_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+                            PRIMARY KEY (table_name, version)
+                        )
+                    """)
+                    rows = await conn.fetch("""
+                        SELECT table_name, MAX(version) AS version
+                        FROM schema_migrations
+                        WHERE table_name = ANY($1::text[])
+                        GROUP BY table_name
+                    """, list(tables))
+                    applied: Dict[str, int] = {row['table_name']: row['version'] for row in rows}
+
+                    for table in tables:
+                        current = applied.get(table, 0)
+                        for version, migration in TREND_TABLE_MIGRATIONS:
+                            if version <= current:
+                                continue
+                            await conn.execute(migration.format(table=table))
+                            await conn.execute(
+                                "INSERT INTO schema_migrations (table_name, version) VALUES ($1, $2)",
+                                table, version
+                            )
+                        if current < LATEST_VERSION:
+                            logger.info(f"Migrated {table} from version {current} to {LATEST_VERSION}")
+
+            self._known.update(pending)
+
+# Global schema manager
+trend_schema = TrendSchemaManager()
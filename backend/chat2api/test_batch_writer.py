@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Batch writer tests for chat2api
+Checks that concurrent writes share transactions and that a bad write only fails its own caller
+"""
+
+import sys
+import asyncio
+from contextlib import asynccontextmanager
+from batch_writer import BatchWriter
+
+class FakeTransaction:
+    def __init__(self, conn):
+        self.conn = conn
+
+    async def __aenter__(self):
+        self.conn.pending = []
+
+    async def __aexit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.conn.pool.committed.append(self.conn.pending)
+        else:
+            self.conn.pool.rolled_back += 1
+
+class FakeConnection:
+    def __init__(self, pool):
+        self.pool = pool
+        self.pending = []
+
+    def transaction(self):
+        return FakeTransaction(self)
+
+    async def executemany(self, sql, rows):
+        self.pool.calls.append((sql, len(rows)))
+        for row in rows:
+            if "bad" in row:
+                raise ValueError("constraint violated")
+        self.pending.append((sql, list(rows)))
+
+class FakePool:
+    def __init__(self):
+        self.calls = []
+        self.committed = []
+        self.rolled_back = 0
+
+    @asynccontextmanager
+    async def acquire(self):
+        yield FakeConnection(self)
+
+def test_full_batch_is_one_transaction():
+    """batch_size concurrent writes commit together, one executemany per distinct statement"""
+    async def run():
+        pool = FakePool()
+        writer = BatchWriter(pool, batch_size=3, max_delay=60)
+        await asyncio.gather(*(
+            writer.write([("UPSERT", (i,)), ("HISTORY", (i,))]) for i in range(3)
+        ))
+        assert len(pool.committed) == 1
+        # Statements keep first-seen order so history rows follow their upserts
+        assert [sql for sql, _ in pool.committed[0]] == ["UPSERT", "HISTORY"]
+        assert pool.calls == [("UPSERT", 3), ("HISTORY", 3)]
+        stats = writer.get_stats()
+        assert stats["batches"] == 1 and stats["writes"] == 3 and stats["statements"] == 6
+    asyncio.run(run())
+
+def test_partial_batch_flushes_after_max_delay():
+    """A batch that never fills is written once max_delay passes"""
+    async def run():
+        pool = FakePool()
+        writer = BatchWriter(pool, batch_size=100, max_delay=0.01)
+        await asyncio.wait_for(writer.write([("UPSERT", (1,))]), 1)
+        assert len(pool.committed) == 1 and writer.get_stats()["pending"] == 0
+    asyncio.run(run())
+
+def test_failed_batch_retries_writes_one_by_one():
+    """A bad row fails only its own write; the rest of the batch still commits"""
+    async def run():
+        pool = FakePool()
+        writer = BatchWriter(pool, batch_size=3, max_delay=60)
+        results = await asyncio.gather(
+            writer.write([("UPSERT", (1,))]),
+            writer.write([("UPSERT", ("bad",))]),
+            writer.write([("UPSERT", (3,))]),
+            return_exceptions=True
+        )
+        assert results[0] is None and results[2] is None
+        assert isinstance(results[1], ValueError)
+        # The combined batch rolled back, then each write got its own transaction
+        assert pool.rolled_back == 2
+        assert [rows for committed in pool.committed for _, rows in committed] == [[(1,)], [(3,)]]
+        stats = writer.get_stats()
+        assert stats["retried_batches"] == 1 and stats["writes"] == 2 and stats["batches"] == 0
+    asyncio.run(run())
+
+def test_single_failed_write_is_not_retried():
+    """A batch of one fails straight away instead of repeating the same transaction"""
+    async def run():
+        pool = FakePool()
+        writer = BatchWriter(pool, batch_size=1, max_delay=60)
+        try:
+            await writer.write([("UPSERT", ("bad",))])
+        except ValueError:
+            pass
+        else:
+            raise AssertionError("bad write succeeded")
+        assert len(pool.calls) == 1 and writer.get_stats()["retried_batches"] == 0
+    asyncio.run(run())
+
+def test_flush_writes_pending_and_waits():
+    """flush() sends whatever is queued and returns once it has committed"""
+    async def run():
+        pool = FakePool()
+        writer = BatchWriter(pool, batch_size=100, max_delay=60)
+        writes = [asyncio.create_task(writer.write([("UPSERT", (i,))])) for i in range(2)]
+        await asyncio.sleep(0)
+        await writer.flush()
+        assert len(pool.committed) == 1 and all(write.done() for write in writes)
+        await asyncio.gather(*writes)
+    asyncio.run(run())
+
+if __name__ == "__main__":
+    failed = 0
+    for test in (test_full_batch_is_one_transaction, test_partial_batch_flushes_after_max_delay,
+                 test_failed_batch_retries_writes_one_by_one, test_single_failed_write_is_not_retried,
+                 test_flush_writes_pending_and_waits):
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ {test.__name__}: {e}")
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+JSON extraction tests for chat2api
+Checks the streaming scanner, whole-text extraction and schema validation that gate LLM responses
+"""
+
+import sys
+from json_extract import (
+    JSONValueScanner, JSONExtractionError, JSONSchemaError, extract_json, validate_schema
+)
+from response_parsers import (
+    MULTILINGUAL_TREND_ANALYSIS_SCHEMA, LOCALIZED_TREND_SCHEMA, BATCH_TRANSLATION_SCHEMA
+)
+
+NESTED = '{"a": {"b": [1, {"c": "x}y]z"}]}, "d": "say \\"hi\\" {not json}", "e": "back\\\\slash"}'
+NESTED_VALUE = {"a": {"b": [1, {"c": "x}y]z"}]}, "d": 'say "hi" {not json}', "e": "back\\slash"}
+
+def assert_raises(error, func, *args):
+    try:
+        func(*args)
+    except error as e:
+        return e
+    raise AssertionError(f"{func.__name__}{args!r} did not raise {error.__name__}")
+
+def scan_chunks(chunks, openers="{["):
+    scanner = JSONValueScanner(openers)
+    for i, chunk in enumerate(chunks):
+        if scanner.feed(chunk):
+            return scanner, i
+    return scanner, None
+
+def test_chunk_split_input():
+    """Values split at every position, including inside strings and escapes, are found once complete"""
+    text = "Here you go: " + NESTED + " and some trailing prose"
+    for size in (1, 2, 3, 7, 64):
+        chunks = [text[i:i + size] for i in range(0, len(text), size)]
+        scanner, done_at = scan_chunks(chunks)
+        assert scanner.result() == NESTED_VALUE, size
+        # Done as soon as the closing brace arrives, before the trailing prose
+        end = len("Here you go: " + NESTED)
+        assert done_at == (end - 1) // size, (size, done_at)
+
+def test_prose_around_json():
+    """Prose, code fences and stray brackets around the value are skipped"""
+    assert extract_json('Sure! ```json\n{"x": 1}\n``` Hope that helps.') == {"x": 1}
+    assert extract_json('Use {braces} or [brackets] carefully: {"x": [1, 2]} done') == {"x": [1, 2]}
+    assert extract_json('Result: [1, 2, 3]. Also {"y": 2}') == [1, 2, 3]
+    assert extract_json('Result: [1, 2, 3]. Also {"y": 2}', "{") == {"y": 2}
+
+    scanner, _ = scan_chunks(['Use {braces', '} then ', '{"x": 1}'])
+    assert scanner.done and scanner.result() == {"x": 1}
+
+def test_nested_and_escaped_strings():
+    """Brackets and quotes inside string literals don't affect balancing"""
+    assert extract_json(NESTED) == NESTED_VALUE
+    assert extract_json('{"emoji": "\\u00e9\\n", "unicode": "日本語"}') == {"emoji": "é\n", "unicode": "日本語"}
+    scanner, done_at = scan_chunks(['{"q": "a \\', '"quoted\\" }', '"}'])
+    assert done_at == 2 and scanner.result() == {"q": 'a "quoted" }'}
+
+def test_truncated_json():
+    """A value cut off mid-way is never reported as complete"""
+    truncated = '{"translations": {"0": {"es": "Ingeniero de dat'
+    scanner, done_at = scan_chunks([truncated])
+    assert done_at is None
+    assert not scanner.finish()
+    assert_raises(JSONExtractionError, scanner.result)
+    assert_raises(JSONExtractionError, extract_json, truncated)
+    assert_raises(JSONExtractionError, extract_json, "No JSON here at all")
+    assert_raises(JSONExtractionError, extract_json, "")
+
+def test_unbalanced_opener_retried_on_finish():
+    """An opener that never closes is treated as prose once the input ends"""
+    scanner, done_at = scan_chunks(['{ oops [1, 2]'], "[")
+    assert done_at == 0 and scanner.result() == [1, 2]
+    scanner, done_at = scan_chunks(['{ oops ', '{"x": 1}'], "{")
+    assert done_at is None
+    assert scanner.finish() and scanner.result() == {"x": 1}
+
+def test_schema_failures():
+    """Type, required, enum and range violations name the offending path"""
+    schema = {
+        "type": "object",
+        "required": ["score"],
+        "properties": {
+            "score": {"type": "number", "minimum": 0, "maximum": 10},
+            "direction": {"enum": ["rising", "stable", "declining"]},
+            "skills": {"type": "array", "items": {"type": "string"}}
+        }
+    }
+    validate_schema({"score": 5, "direction": "rising", "skills": ["SQL"]}, schema)
+    cases = [
+        ([], "expected object"),
+        ({}, "missing required field 'score'"),
+        ({"score": "5"}, "$.score: expected number"),
+        ({"score": True}, "$.score: expected number"),
+        ({"score": 11}, "$.score: 11 is above 10"),
+        ({"score": -1}, "$.score: -1 is below 0"),
+        ({"score": 5, "direction": "up"}, "$.direction"),
+        ({"score": 5, "skills": ["SQL", 3]}, "$.skills[1]: expected string"),
+    ]
+    for value, message in cases:
+        error = assert_raises(JSONSchemaError, validate_schema, value, schema)
+        assert message in str(error), (value, str(error))
+
+    # extract_json validates what it extracts
+    assert_raises(JSONSchemaError, extract_json, 'Answer: {"score": 42}', "{", schema)
+
+def test_response_schemas():
+    """The localized-trend and batch-translation schemas accept good answers and reject bad ones"""
+    validate_schema({"translations": {"0": {"es": "Hola"}}}, BATCH_TRANSLATION_SCHEMA)
+    assert_raises(JSONSchemaError, validate_schema, {"0": {"es": "Hola"}}, BATCH_TRANSLATION_SCHEMA)
+    assert_raises(JSONSchemaError, validate_schema, {"translations": []}, BATCH_TRANSLATION_SCHEMA)
+
+    validate_schema({"market_insights": "Creciendo"}, LOCALIZED_TREND_SCHEMA)
+    assert_raises(JSONSchemaError, validate_schema, {"market_insights": ["Creciendo"]}, LOCALIZED_TREND_SCHEMA)
+
+    assert "localized" in MULTILINGUAL_TREND_ANALYSIS_SCHEMA["required"]
+    assert_raises(JSONSchemaError, validate_schema, {}, MULTILINGUAL_TREND_ANALYSIS_SCHEMA)
+    assert_raises(JSONSchemaError, validate_schema, {"localized": "es"}, MULTILINGUAL_TREND_ANALYSIS_SCHEMA)
+
+if __name__ == "__main__":
+    failed = 0
+    for test in (test_chunk_split_input, test_prose_around_json, test_nested_and_escaped_strings,
+                 test_truncated_json, test_unbalanced_opener_retried_on_finish, test_schema_failures,
+                 test_response_schemas):
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ {test.__name__}: {e}")
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+Rate limiter tests for chat2api
+Checks token bucket accounting, 429 backoff and that streamed requests settle their token reservations
+"""
+
+import gc
+import sys
+import json
+import asyncio
+from contextlib import aclosing, asynccontextmanager
+import ai_client
+from models import ChatMessage, ChatRequest
+from cache_service import response_cache
+from routers.chat import stream_chat_completion
+from rate_limiter import TokenBucket, ModelRateLimiter, parse_retry_after
+
+def test_token_bucket_reserve_and_refill():
+    """Reservations may overdraw the bucket; the debt is paid off at the refill rate"""
+    bucket = TokenBucket(per_minute=60, burst_seconds=10)
+    assert bucket.rate == 1.0 and bucket.capacity == 10.0
+    now = bucket.updated
+
+    assert bucket.reserve(10, now, 1.0) == 0.0
+    # Overdrawn by 5 tokens at 1 token/s
+    assert bucket.reserve(5, now, 1.0) == 5.0
+    # Half the quota doubles the wait for the same debt
+    assert bucket.reserve(1, now, 0.5) == 12.0
+
+    bucket.refill(now + 6, 1.0)
+    assert bucket.tokens == 0.0
+    bucket.refill(now + 100, 1.0)
+    assert bucket.tokens == bucket.capacity
+
+def test_token_bucket_refund_is_capped():
+    """Refunds never push the balance past capacity"""
+    bucket = TokenBucket(per_minute=600, burst_seconds=1)
+    now = bucket.updated
+    bucket.reserve(8, now, 1.0)
+    bucket.refund(3)
+    assert bucket.tokens == 5.0
+    bucket.refund(100)
+    assert bucket.tokens == bucket.capacity
+
+def test_settle_returns_unused_tokens():
+    """record and settle give back the part of a reservation that wasn't used"""
+    limiter = ModelRateLimiter("test", rpm=600, tpm=6000, burst_seconds=10)
+    start = limiter.tokens.tokens
+    asyncio.run(limiter.acquire(700))
+    assert limiter.tokens.tokens == start - 700
+
+    limiter.settle(700, 100)
+    assert abs(limiter.tokens.tokens - (start - 100)) < 1
+    # Using more than reserved is never refunded
+    limiter.settle(100, 500)
+    assert abs(limiter.tokens.tokens - (start - 100)) < 1
+
+    asyncio.run(limiter.acquire(300))
+    limiter.record(200, reserved_tokens=300, used_tokens=50)
+    assert abs(limiter.tokens.tokens - (start - 150)) < 1
+
+def test_oversized_estimate_settles_against_what_was_taken():
+    """An estimate above capacity reserves one bucket's worth, and only that is refunded"""
+    limiter = ModelRateLimiter("test", rpm=600, tpm=600, burst_seconds=10)
+    reserved = asyncio.run(limiter.acquire(500))
+    assert reserved == limiter.tokens.capacity == 100
+    assert abs(limiter.tokens.tokens) < 1
+    # Refunding against the 500 estimate would hand back tokens that were never taken
+    limiter.settle(reserved, 40)
+    assert abs(limiter.tokens.tokens - 60) < 1
+
+def test_backoff_on_429_and_recovery():
+    """A 429 halves the allowed rate and honours Retry-After; successes recover gradually"""
+    limiter = ModelRateLimiter("test", rpm=60, tpm=0, burst_seconds=10)
+    limiter.record(429, {"retry-after": "3"})
+    assert limiter.scale == 0.5 and limiter.throttled == 1
+    assert 2.5 < limiter.get_stats()["blocked_for"] <= 3.0
+
+    limiter.record(200)
+    assert abs(limiter.scale - (0.5 + ModelRateLimiter.RECOVERY_STEP)) < 1e-9
+    for _ in range(10):
+        limiter.record(429)
+    assert limiter.scale == ModelRateLimiter.MIN_SCALE
+
+    assert parse_retry_after({"retry-after-ms": "1500"}) == 1.5
+    assert parse_retry_after({"retry-after": "soon"}) is None
+    assert parse_retry_after(None) is None
+
+def test_cancelled_acquire_refunds_reservation():
+    """A caller cancelled while queued hands its request slot and tokens back"""
+    async def run():
+        limiter = ModelRateLimiter("test", rpm=60, tpm=600, burst_seconds=1)
+        await limiter.acquire(10)
+        requests_before = limiter.requests.tokens
+        tokens_before = limiter.tokens.tokens
+        waiter = asyncio.create_task(limiter.acquire(10))
+        await asyncio.sleep(0.01)
+        waiter.cancel()
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            pass
+        assert abs(limiter.requests.tokens - requests_before) < 0.1
+        assert abs(limiter.tokens.tokens - tokens_before) < 1
+    asyncio.run(run())
+
+class FakeStreamResponse:
+    def __init__(self, status_code, lines, fail_after=None):
+        self.status_code = status_code
+        self.headers = {}
+        self.lines = lines
+        self.fail_after = fail_after
+
+    async def aiter_lines(self):
+        for i, line in enumerate(self.lines):
+            if i == self.fail_after:
+                raise ai_client.httpx.ReadTimeout("read timed out")
+            yield line
+
+class FakeHTTPClient:
+    def __init__(self, response):
+        self.response = response
+
+    @asynccontextmanager
+    async def stream(self, *args, **kwargs):
+        yield self.response
+
+def stream_reservation(response, consume=None, proxy=False):
+    """Tokens left charged after streaming one request through forward_to_openai_stream"""
+    # A fresh, slowly refilling limiter per call so earlier 429s and refills don't blur the count
+    model = f"test-stream-{len(ai_client.rate_limiters._limiters)}"
+    limiter = ai_client.rate_limiters._limiters[f"openai:{model}"] = ModelRateLimiter(
+        model, rpm=600, tpm=60, burst_seconds=10000
+    )
+
+    async def run():
+        original_client, original_key = ai_client.openai_http_client, ai_client.OPENAI_API_KEY
+        ai_client.openai_http_client, ai_client.OPENAI_API_KEY = FakeHTTPClient(response), "test-key"
+        try:
+            request = ChatRequest(model=model, max_tokens=2000,
+                                  messages=[ChatMessage(role="user", content="x" * 400)], stream=True)
+            payloads = []
+            if proxy:
+                # The route's own generator, read to the end without closing anything from here
+                async for event in stream_chat_completion(request):
+                    payloads.append(event)
+                return limiter.tokens.capacity - limiter.tokens.tokens, payloads
+            async with aclosing(ai_client.forward_to_openai_stream(request)) as stream:
+                async for payload in stream:
+                    payloads.append(payload)
+                    if consume is not None and len(payloads) >= consume:
+                        break
+            return limiter.tokens.capacity - limiter.tokens.tokens, payloads
+        finally:
+            ai_client.openai_http_client, ai_client.OPENAI_API_KEY = original_client, original_key
+    return asyncio.run(run())
+
+def chunk_line(content):
+    return "data: " + json.dumps({"choices": [{"delta": {"content": content}}]})
+
+def test_stream_settles_reservation():
+    """Streams are charged for the prompt plus what was generated, not for max_tokens"""
+    lines = [chunk_line("y" * 40), chunk_line("y" * 40), "data: [DONE]"]
+    charged, payloads = stream_reservation(FakeStreamResponse(200, lines))
+    assert payloads[-1] == "[DONE]"
+    # 400 prompt characters and 80 completion characters at 4 characters a token
+    assert abs(charged - 120) < 5, charged
+
+    # Reported usage wins over the estimate
+    usage = "data: " + json.dumps({"choices": [], "usage": {"total_tokens": 333}})
+    charged, _ = stream_reservation(FakeStreamResponse(200, [chunk_line("y" * 40), usage, "data: [DONE]"]))
+    assert abs(charged - 333) < 5, charged
+
+def test_stream_refunds_on_refusal_error_and_disconnect():
+    """Refused, broken and abandoned streams don't keep the max_tokens reservation"""
+    charged, payloads = stream_reservation(FakeStreamResponse(429, []))
+    assert charged < 5 and "[DONE]" not in payloads
+
+    lines = [chunk_line("y" * 40), chunk_line("y" * 40), "data: [DONE]"]
+    charged, payloads = stream_reservation(FakeStreamResponse(200, lines, fail_after=1))
+    assert abs(charged - 110) < 5, charged
+    assert "error" in json.loads(payloads[-1])
+
+    charged, _ = stream_reservation(FakeStreamResponse(200, lines), consume=1)
+    assert abs(charged - 110) < 5, charged
+
+def test_proxy_settles_when_stream_ends():
+    """The chat route closes the upstream generator on [DONE], settling before the response ends"""
+    response_cache.redis = None
+    lines = [chunk_line("y" * 40), chunk_line("y" * 40), "data: [DONE]"]
+    gc.disable()
+    try:
+        charged, events = stream_reservation(FakeStreamResponse(200, lines), proxy=True)
+    finally:
+        gc.enable()
+    assert events[-1] == "data: [DONE]\n\n"
+    assert abs(charged - 120) < 5, charged
+
+if __name__ == "__main__":
+    failed = 0
+    for test in (test_token_bucket_reserve_and_refill, test_token_bucket_refund_is_capped,
+                 test_settle_returns_unused_tokens, test_oversized_estimate_settles_against_what_was_taken,
+                 test_backoff_on_429_and_recovery,
+                 test_cancelled_acquire_refunds_reservation, test_stream_settles_reservation,
+                 test_stream_refunds_on_refusal_error_and_disconnect, test_proxy_settles_when_stream_ends):
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ {test.__name__}: {e}")
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Route precedence tests for chat2api
+Checks that every request reaches the handler meant to serve it
+"""
+
+import sys
+from fastapi import FastAPI
+from main import app
+from route_table import check_route_table, find_route_conflicts, resolve_route
+
+# (method, path, expected handler)
+EXPECTED_ROUTES = [
+    ("GET", "/health", "health_check"),
+    ("GET", "/api/metrics", "get_metrics"),
+    ("GET", "/api/careers", "get_all_careers"),
+    ("GET", "/api/careers/search", "search_careers"),
+    ("POST", "/api/careers/search", "search_careers_by_criteria"),
+    ("GET", "/api/careers/stats", "get_career_stats"),
+    ("GET", "/api/careers/update-status", "get_update_status"),
+    ("POST", "/api/careers/update", "force_career_update"),
+    ("POST", "/api/careers/roadmap", "generate_career_roadmap"),
+    ("GET", "/api/careers/ai-engineer", "get_career_data"),
+    ("PUT", "/api/careers/ai-engineer", "update_career_data"),
+    ("POST", "/api/careers/ai-engineer/refresh", "refresh_career_data"),
+    ("GET", "/api/careers/ai-engineer/market", "get_career_market_data"),
+    ("POST", "/v1/chat/completions", "chat_completions"),
+]
+
+def test_no_unreachable_routes():
+    """No route is duplicated or shadowed by an earlier one"""
+    assert find_route_conflicts(app.routes) == []
+    check_route_table(app)
+
+def test_requests_reach_expected_handlers():
+    """Static career paths win over /api/careers/{career_id}"""
+    for method, path, handler in EXPECTED_ROUTES:
+        route = resolve_route(app, method, path)
+        assert route is not None, f"{method} {path} matched no route"
+        assert route.name == handler, f"{method} {path} served by {route.name}, expected {handler}"
+
+def test_shadowed_route_is_rejected():
+    """The startup check refuses a static path registered after a parameterized one"""
+    shadowed = FastAPI()
+
+    @shadowed.get("/api/careers/{career_id}")
+    async def get_career(career_id: str):
+        return career_id
+
+    @shadowed.get("/api/careers/search")
+    async def search():
+        return []
+
+    @shadowed.get("/api/careers/{career_id}")
+    async def get_career_again(career_id: str):
+        return career_id
+
+    conflicts = find_route_conflicts(shadowed.routes)
+    assert len(conflicts) == 2, conflicts
+    try:
+        check_route_table(shadowed)
+    except RuntimeError:
+        pass
+    else:
+        raise AssertionError("check_route_table accepted a shadowed route")
+
+if __name__ == "__main__":
+    failed = 0
+    for test in (test_no_unreachable_routes, test_requests_reach_expected_handlers, test_shadowed_route_is_rejected):
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ {test.__name__}: {e}")
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+Batch translation tests for chat2api
+Checks token-budget chunking, splitting of truncated answers and mapping results back to fields
+"""
+
+import sys
+import json
+import asyncio
+from cache_service import response_cache
+from translation_memory import translation_memory
+from translation_service import TranslationService, TruncatedCompletion
+
+LANGUAGES = ['es', 'fr', 'ja', 'ar']
+
+class FakeModel:
+    """Stands in for _complete: answers batch prompts in JSON and single prompts in plain text"""
+
+    def __init__(self, max_entries=None, drop=(), fail=False):
+        # Answers asking for more than max_entries translations come back cut off
+        self.max_entries = max_entries
+        self.drop = set(drop)
+        self.fail = fail
+        self.batch_calls = []
+        self.single_calls = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def __call__(self, system_prompt, prompt, max_tokens):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(0.001)
+            if "Texts to translate: [" not in prompt:
+                self.single_calls.append(prompt)
+                text = prompt.split("Text to translate: ")[1].strip()
+                language = prompt.split("from English to ")[1].split(".")[0]
+                return f'"{language}:{text}"'
+
+            items = json.loads(prompt.split("Texts to translate: ")[1].strip())
+            self.batch_calls.append((items, max_tokens))
+            if self.fail:
+                return None
+            entries = sum(len(item["languages"]) for item in items)
+            if self.max_entries is not None and entries > self.max_entries:
+                raise TruncatedCompletion("cut off")
+            translations = {
+                item["id"]: {
+                    code: f"{code}:{item['text']}"
+                    for code in item["languages"] if (item["text"], code) not in self.drop
+                }
+                for item in items
+            }
+            return "Here you go: " + json.dumps({"translations": translations})
+        finally:
+            self.in_flight -= 1
+
+def make_service(model, batch_max_tokens=3000, batch_concurrency=4):
+    translation_memory.l1.clear()
+    response_cache.redis = None
+    service = TranslationService()
+    service.openai_api_key = "test-key"
+    service.batch_max_tokens = batch_max_tokens
+    service.batch_concurrency = batch_concurrency
+    service._complete = model
+    return service
+
+def test_chunks_fit_token_budget():
+    """Chunks stay within budget, keep languages of a text together and split long texts by language"""
+    service = make_service(FakeModel(), batch_max_tokens=400)
+    short_texts = {f"Skill {i}": list(LANGUAGES) for i in range(20)}
+    long_text = "x" * 600
+    chunks = service._chunk_batch({**short_texts, long_text: list(LANGUAGES)})
+
+    covered = []
+    for chunk in chunks:
+        cost = sum(service._estimate_translation_tokens(text, language) for text, languages in chunk for language in languages)
+        assert cost <= 400 or len(chunk) == 1 and len(chunk[0][1]) == 1, (chunk, cost)
+        covered += [(text, language) for text, languages in chunk for language in languages]
+    assert sorted(covered) == sorted((text, language) for text in [*short_texts, long_text] for language in LANGUAGES)
+
+    # The long text's Japanese translation alone costs more than its Spanish one
+    assert service._estimate_translation_tokens(long_text, 'ja') > 2 * service._estimate_translation_tokens(long_text, 'es')
+    long_chunks = [languages for chunk in chunks for text, languages in chunk if text == long_text]
+    assert len(long_chunks) > 1
+
+def test_batch_maps_results_and_uses_memory():
+    """Every text and language maps back, and remembered translations skip the API"""
+    model = FakeModel()
+    service = make_service(model)
+    texts = ["Python", "SQL", "Python", "  ", "Data Engineer"]
+    results = asyncio.run(service.translate_batch(texts, ['en'] + LANGUAGES, 'skill_data'))
+    assert results['en'] == {"Python": "Python", "SQL": "SQL", "Data Engineer": "Data Engineer"}
+    for language in LANGUAGES:
+        assert results[language] == {text: f"{language}:{text}" for text in ["Python", "SQL", "Data Engineer"]}
+    assert len(model.batch_calls) == 1
+
+    # Same strings again: all from memory; one new string: one request for just that string
+    async def again():
+        first = await service.translate_batch(["Python", "SQL"], LANGUAGES, 'skill_data')
+        second = await service.translate_batch(["Python", "Go"], LANGUAGES, 'skill_data')
+        return first, second
+    first, second = asyncio.run(again())
+    assert first['ja']["SQL"] == "ja:SQL" and second['ar']["Go"] == "ar:Go"
+    assert len(model.batch_calls) == 2
+    assert [item["text"] for item in model.batch_calls[1][0]] == ["Go"]
+
+    # Contexts are remembered separately
+    asyncio.run(service.translate_batch(["Python"], ['es'], 'career_data'))
+    assert len(model.batch_calls) == 3
+
+def test_truncated_answers_are_split_and_retried():
+    """A cut-off answer is retried in halves; no translation silently stays in English"""
+    model = FakeModel(max_entries=3)
+    service = make_service(model, batch_concurrency=2)
+    texts = [f"Skill {i}" for i in range(5)]
+    results = asyncio.run(service.translate_batch(texts, LANGUAGES, 'skill_data'))
+    for language in LANGUAGES:
+        assert results[language] == {text: f"{language}:{text}" for text in texts}, language
+    # Only leaf-level pieces that still fail would go out singly; here every half fits
+    assert model.single_calls == []
+    # The pieces small enough to be answered cover every translation exactly once
+    answered = [
+        (item["text"], code)
+        for items, _ in model.batch_calls if sum(len(item["languages"]) for item in items) <= 3
+        for item in items for code in item["languages"]
+    ]
+    assert sorted(answered) == sorted((text, language) for text in texts for language in LANGUAGES)
+    assert model.max_in_flight <= 2
+
+def test_single_translations_as_last_resort():
+    """Entries dropped by the model, or too long for any batch, go through translate_text concurrently"""
+    model = FakeModel(max_entries=0, drop=())
+    service = make_service(model, batch_concurrency=3)
+    results = asyncio.run(service.translate_batch(["Python", "SQL"], ['es', 'fr'], 'skill_data'))
+    assert results['es'] == {"Python": "Spanish:Python", "SQL": "Spanish:SQL"}
+    assert len(model.single_calls) == 4
+    assert model.max_in_flight > 1
+
+    model = FakeModel(drop=[("SQL", "fr")])
+    service = make_service(model)
+    results = asyncio.run(service.translate_batch(["Python", "SQL"], ['es', 'fr'], 'skill_data'))
+    assert results['fr']["SQL"] == "French:SQL" and results['fr']["Python"] == "fr:Python"
+    assert len(model.batch_calls) == 1 and len(model.single_calls) == 1
+
+def test_failed_request_is_not_retried_per_string():
+    """A refused batch leaves its strings untranslated instead of fanning out into single requests"""
+    model = FakeModel(fail=True)
+    service = make_service(model)
+    results = asyncio.run(service.translate_batch(["Python", "SQL"], LANGUAGES, 'skill_data'))
+    assert all(results[language] == {} for language in LANGUAGES)
+    assert len(model.batch_calls) == 1 and model.single_calls == []
+
+def test_career_data_maps_back_to_fields():
+    """translate_career_data fills every field of every language from a few batch requests"""
+    model = FakeModel()
+    service = make_service(model)
+    career = {
+        'title': 'Data Engineer',
+        'description': 'Builds data pipelines',
+        'skills': ['Python', 'SQL'],
+        'jobTitles': ['Data Engineer', 'ETL Developer'],
+        'certifications': []
+    }
+    translations = asyncio.run(service.translate_career_data(career))
+    assert set(translations) == set(service.supported_languages)
+    assert translations['en']['skills'] == ['Python', 'SQL']
+    assert translations['de'] == {
+        'title': 'de:Data Engineer',
+        'description': 'de:Builds data pipelines',
+        'skills': ['de:Python', 'de:SQL'],
+        'jobTitles': ['de:Data Engineer', 'de:ETL Developer'],
+        'certifications': []
+    }
+    # One batch per context (career_data and skill_data) for all ten languages
+    assert len(model.batch_calls) == 2 and model.single_calls == []
+
+if __name__ == "__main__":
+    failed = 0
+    for test in (test_chunks_fit_token_budget, test_batch_maps_results_and_uses_memory,
+                 test_truncated_answers_are_split_and_retried, test_single_translations_as_last_resort,
+                 test_failed_request_is_not_retried_per_string, test_career_data_maps_back_to_fields):
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ {test.__name__}: {e}")
+    sys.exit(1 if failed else 0)
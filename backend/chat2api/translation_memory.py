@@ -0,0 +1,129 @@
+"""
+Translation memory for the translation service
+Remembers every translation by (normalized source text, target language, context, model) in a
+bounded in-process LRU in front of Redis, so only new or changed strings reach the API
+"""
+
+import os
+import json
+import hashlib
+import logging
+import unicodedata
+from typing import Dict, Iterable, List, Optional, Tuple
+from cache_service import LocalLRUCache, response_cache
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# (source text, target language, context)
+MemoryItem = Tuple[str, str, str]
+
+def normalize_text(text: str) -> str:
+    """Canonical form of a source string: NFC, trimmed, inner whitespace collapsed"""
+    return " ".join(unicodedata.normalize('NFC', text).split())
+
+class TranslationMemory:
+    """Translations keyed by source, language, context and model; L1 in process, L2 in Redis"""
+
+    def __init__(self):
+        # Translations of a given source don't go stale, so entries live long and only fall out by size
+        self.ttl = int(os.getenv('TRANSLATION_MEMORY_TTL', str(180 * 24 * 3600)))
+        self.l1 = LocalLRUCache(
+            max_entries=int(os.getenv('TRANSLATION_MEMORY_MAX_ENTRIES', '50000')),
+            max_bytes=int(os.getenv('TRANSLATION_MEMORY_MAX_BYTES', str(32 * 1024 * 1024)))
+        )
+
+        # Counters
+        self.l1_hits = 0
+        self.l2_hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.errors = 0
+
+    def key(self, text: str, target_language: str, context: str, model: str) -> str:
+        digest = hashlib.sha1(normalize_text(text).encode('utf-8')).hexdigest()
+        return f"tm:{model}:{context}:{target_language}:{digest}"
+
+    async def get(self, text: str, target_language: str, context: str, model: str) -> Optional[str]:
+        """Remembered translation of text, or None"""
+        found = await self.get_many([(text, target_language, context)], model)
+        return found.get((text, target_language, context))
+
+    async def get_many(self, items: Iterable[MemoryItem], model: str) -> Dict[MemoryItem, str]:
+        """Remembered translations for items, looking up every L1 miss in one Redis round trip"""
+        found: Dict[MemoryItem, str] = {}
+        missing: Dict[str, List[MemoryItem]] = {}
+        for item in dict.fromkeys(items):
+            key = self.key(item[0], item[1], item[2], model)
+            value = self.l1.get(key)
+            if value is not None:
+                self.l1_hits += 1
+                found[item] = value
+            else:
+                missing.setdefault(key, []).append(item)
+
+        if missing and response_cache.redis:
+            keys = list(missing)
+            try:
+                values = await response_cache.redis.mget(keys)
+            except Exception as e:
+                self.errors += 1
+                logger.debug(f"Translation memory lookup failed: {e}")
+                values = [None] * len(keys)
+            for key, raw in zip(keys, values):
+                if raw is None:
+                    continue
+                try:
+                    value = json.loads(raw)
+                except ValueError:
+                    continue
+                self.l1.set(key, value, self.ttl, len(raw))
+                for item in missing.pop(key):
+                    self.l2_hits += 1
+                    found[item] = value
+
+        self.misses += sum(len(pending) for pending in missing.values())
+        return found
+
+    async def put(self, text: str, target_language: str, context: str, model: str, translation: str):
+        await self.put_many({(text, target_language, context): translation}, model)
+
+    async def put_many(self, translations: Dict[MemoryItem, str], model: str):
+        """Remember translations in both tiers, writing Redis in one pipeline"""
+        if not translations:
+            return
+        entries = []
+        for (text, target_language, context), translation in translations.items():
+            key = self.key(text, target_language, context, model)
+            raw = json.dumps(translation)
+            self.l1.set(key, translation, self.ttl, len(raw))
+            entries.append((key, raw))
+        self.stores += len(entries)
+
+        if response_cache.redis:
+            try:
+                async with response_cache.redis.pipeline(transaction=False) as pipe:
+                    for key, raw in entries:
+                        pipe.setex(key, self.ttl, raw)
+                    await pipe.execute()
+            except Exception as e:
+                self.errors += 1
+                logger.debug(f"Translation memory store failed: {e}")
+
+    def get_stats(self) -> Dict[str, object]:
+        lookups = self.l1_hits + self.l2_hits + self.misses
+        return {
+            "redis_connected": response_cache.redis_available,
+            "l1_hits": self.l1_hits,
+            "l2_hits": self.l2_hits,
+            "misses": self.misses,
+            "hit_ratio": round((self.l1_hits + self.l2_hits) / lookups, 4) if lookups else 0.0,
+            "stores": self.stores,
+            "errors": self.errors,
+            "l1_entries": len(self.l1),
+            "l1_bytes": self.l1.current_bytes
+        }
+
+# Global translation memory instance
+translation_memory = TranslationMemory()
@@ -9,9 +9,14 @@ import json
 import asyncio
 import logging
 from datetime import datetime
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 import aiohttp
 from dataclasses import dataclass
+from rate_limiter import rate_limiters, estimate_tokens
+from json_extract import extract_json
+from response_parsers import BATCH_TRANSLATION_SCHEMA
+from cache_service import response_cache
+from translation_memory import translation_memory
 
 # Configure logging
 logging.basicConfig(
@@ -24,6 +29,21 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Context-aware system prompts for better translations
+CONTEXT_PROMPTS = {
+    "career_data": "You are a professional translator specializing in career and job market terminology.",
+    "trend_data": "You are a professional translator specializing in business and market analysis terminology.",
+    "skill_data": "You are a professional translator specializing in technical and professional skills terminology."
+}
+
+# Completion tokens per character of English source, by target language: non-Latin scripts
+# take several times the tokens of the same text in a Latin-script language
+TRANSLATION_TOKENS_PER_CHAR = {'ja': 1.0, 'zh': 1.0, 'ko': 1.0, 'ar': 0.8, 'ru': 0.8}
+DEFAULT_TRANSLATION_TOKENS_PER_CHAR = 0.4
+
+class TruncatedCompletion(ValueError):
+    """The model stopped at max_tokens, so its answer is incomplete"""
+
 @dataclass
 class TranslationRequest:
     """Data structure for translation requests"""
@@ -50,36 +70,45 @@ class TranslationService:
             'ru': 'Russian',
             'ar': 'Arabic'
         }
+        self.model = os.getenv('TRANSLATION_MODEL', 'gpt-3.5-turbo')
+        # Estimated completion tokens per batch request, and batch requests in flight at once
+        self.batch_max_tokens = int(os.getenv('TRANSLATION_BATCH_MAX_TOKENS', '3000'))
+        self.batch_concurrency = int(os.getenv('TRANSLATION_BATCH_CONCURRENCY', '4'))
         self.session = None
+        # Shares of the shared Redis pool taken by initialize() and not yet released
+        self._cache_shares = 0
         
     async def initialize(self):
-        """Initialize HTTP session"""
+        """Initialize HTTP session and the translation memory's Redis connection"""
         self.session = aiohttp.ClientSession()
+        # Reference counted, so releasing it never closes the pool under the API server
+        await response_cache.initialize()
+        self._cache_shares += 1
         logger.info("Translation service initialized")
         
     async def cleanup(self):
         """Clean up resources"""
         if self.session:
             await self.session.close()
+        if self._cache_shares:
+            self._cache_shares -= 1
+            await response_cache.close()
             
     async def translate_text(self, text: str, target_language: str, context: str = "career_data") -> Optional[str]:
-        """Translate a single text using OpenAI"""
+        """Translate a single text using OpenAI, reusing remembered translations"""
+        if target_language == 'en' or not text.strip():
+            return text  # No translation needed for English
+        
+        remembered = await translation_memory.get(text, target_language, context, self.model)
+        if remembered is not None:
+            return remembered
+            
         if not self.openai_api_key:
             logger.warning("No OpenAI API key available, skipping translation")
             return None
             
-        if target_language == 'en':
-            return text  # No translation needed for English
-            
         try:
-            # Create context-aware prompt for better translations
-            context_prompts = {
-                "career_data": "You are a professional translator specializing in career and job market terminology.",
-                "trend_data": "You are a professional translator specializing in business and market analysis terminology.",
-                "skill_data": "You are a professional translator specializing in technical and professional skills terminology."
-            }
-            
-            system_prompt = context_prompts.get(context, context_prompts["career_data"])
+            system_prompt = CONTEXT_PROMPTS.get(context, CONTEXT_PROMPTS["career_data"])
             
             prompt = f"""
             {system_prompt}
@@ -91,6 +120,221 @@ class TranslationService:
             Text to translate: {text}
             """
             
+            translated_text = await self._complete(system_prompt, prompt, 500)
+            if translated_text is None:
+                return None
+            
+            # Remove quotes if the AI wrapped the translation in quotes
+            if translated_text.startswith('"') and translated_text.endswith('"'):
+                translated_text = translated_text[1:-1]
+            
+            await translation_memory.put(text, target_language, context, self.model, translated_text)
+            return translated_text
+                
+        except Exception as e:
+            logger.error(f"Failed to translate text to {target_language}: {e}")
+            return None
+    
+    async def translate_batch(self, texts: List[str], target_languages: Optional[List[str]] = None,
+                              context: str = "career_data") -> Dict[str, Dict[str, str]]:
+        """Translate many texts into many languages in as few requests as the token budget allows
+        
+        Returns {language: {text: translation}}; texts that couldn't be translated are left out,
+        so callers fall back to the English source as translate_text's callers do.
+        """
+        languages = [code for code in (target_languages or self.supported_languages) if code in self.supported_languages]
+        unique_texts = [text for text in dict.fromkeys(texts) if isinstance(text, str) and text.strip()]
+        results: Dict[str, Dict[str, str]] = {language: {} for language in languages}
+        if 'en' in results:
+            results['en'] = {text: text for text in unique_texts}
+        
+        wanted = [(text, language, context) for text in unique_texts for language in languages if language != 'en']
+        remembered = await translation_memory.get_many(wanted, self.model)
+        for (text, language, _), translated_text in remembered.items():
+            results[language][text] = translated_text
+        
+        # Only new or changed texts reach the API, each with just the languages it still needs
+        missing: Dict[str, List[str]] = {}
+        for item in wanted:
+            if item not in remembered:
+                missing.setdefault(item[0], []).append(item[1])
+        if not missing:
+            return results
+        if not self.openai_api_key:
+            logger.warning("No OpenAI API key available, skipping translation")
+            return results
+        
+        semaphore = asyncio.Semaphore(self.batch_concurrency)
+        
+        async def run_chunk(chunk: List[Tuple[str, List[str]]]):
+            async with semaphore:
+                return await self._translate_chunk_or_split(chunk, context)
+        
+        async def run_single(text: str, language: str):
+            async with semaphore:
+                return text, language, await self.translate_text(text, language, context)
+        
+        chunks = self._chunk_batch(missing)
+        translated: Dict[Tuple[str, str, str], str] = {}
+        skipped: List[Tuple[str, str]] = []
+        unanswered = 0
+        for chunk_result, chunk_skipped, chunk_unanswered in await asyncio.gather(*(run_chunk(chunk) for chunk in chunks)):
+            for (text, language), translated_text in chunk_result.items():
+                translated[(text, language, context)] = translated_text
+            skipped.extend(chunk_skipped)
+            unanswered += chunk_unanswered
+        await translation_memory.put_many(translated, self.model)
+        
+        for (text, language, _), translated_text in translated.items():
+            results[language][text] = translated_text
+        # Entries the model dropped, or that still didn't fit once split down to one, get a request of their own
+        for text, language, translated_text in await asyncio.gather(*(run_single(*entry) for entry in skipped)):
+            if translated_text:
+                results[language][text] = translated_text
+        
+        if unanswered:
+            # Failed requests aren't retried string by string: that would only multiply the calls
+            logger.warning(f"{unanswered} translations stay in English after failed batch requests")
+        logger.info(f"Batch translated {len(missing)} texts in {len(chunks)} batches "
+                    f"({len(remembered)} of {len(wanted)} translations remembered, {len(skipped)} sent singly)")
+        return results
+    
+    def _chunk_batch(self, missing: Dict[str, List[str]]) -> List[List[Tuple[str, List[str]]]]:
+        """Pack (text, languages) pairs into requests whose estimated completion fits the token budget
+        
+        A long text whose languages don't fit one request is split across requests by language.
+        """
+        chunks: List[List[Tuple[str, List[str]]]] = []
+        chunk: List[Tuple[str, List[str]]] = []
+        chunk_tokens = 0
+        for text, languages in missing.items():
+            for language in languages:
+                cost = self._estimate_translation_tokens(text, language)
+                if chunk and chunk_tokens + cost > self.batch_max_tokens:
+                    chunks.append(chunk)
+                    chunk, chunk_tokens = [], 0
+                if chunk and chunk[-1][0] == text:
+                    chunk[-1][1].append(language)
+                else:
+                    chunk.append((text, [language]))
+                chunk_tokens += cost
+        if chunk:
+            chunks.append(chunk)
+        return chunks
+    
+    @staticmethod
+    def _estimate_translation_tokens(text: str, language: str) -> int:
+        """Completion tokens a translation of text into language is expected to take, JSON framing included"""
+        per_char = TRANSLATION_TOKENS_PER_CHAR.get(language, DEFAULT_TRANSLATION_TOKENS_PER_CHAR)
+        return int(len(text) * per_char) + 12
+    
+    @staticmethod
+    def _split_chunk(chunk: List[Tuple[str, List[str]]]) -> Optional[List[List[Tuple[str, List[str]]]]]:
+        """Halve a chunk by texts, or a single text by languages; None for a single translation"""
+        if len(chunk) > 1:
+            middle = len(chunk) // 2
+            return [chunk[:middle], chunk[middle:]]
+        text, languages = chunk[0]
+        if len(languages) > 1:
+            middle = len(languages) // 2
+            return [[(text, languages[:middle])], [(text, languages[middle:])]]
+        return None
+    
+    async def _translate_chunk_or_split(self, chunk: List[Tuple[str, List[str]]], context: str
+                                        ) -> Tuple[Dict[Tuple[str, str], str], List[Tuple[str, str]], int]:
+        """Translate a chunk, halving it whenever the answer comes back truncated or unparseable
+        
+        Returns the translations, the (text, language) pairs left for single requests, and how
+        many translations were lost to failed requests.
+        """
+        try:
+            result = await self._translate_chunk(chunk, context)
+        except ValueError as e:
+            halves = self._split_chunk(chunk)
+            if halves is None:
+                return {}, [(chunk[0][0], chunk[0][1][0])], 0
+            logger.info(f"Splitting a batch of {sum(len(languages) for _, languages in chunk)} translations: {e}")
+            translated: Dict[Tuple[str, str], str] = {}
+            skipped: List[Tuple[str, str]] = []
+            unanswered = 0
+            # The halves run in turn inside the caller's concurrency slot
+            for half in halves:
+                half_translated, half_skipped, half_unanswered = await self._translate_chunk_or_split(half, context)
+                translated.update(half_translated)
+                skipped.extend(half_skipped)
+                unanswered += half_unanswered
+            return translated, skipped, unanswered
+        
+        if result is None:
+            return {}, [], sum(len(languages) for _, languages in chunk)
+        skipped = [
+            (text, language)
+            for text, languages in chunk for language in languages
+            if (text, language) not in result
+        ]
+        return result, skipped, 0
+    
+    async def _translate_chunk(self, chunk: List[Tuple[str, List[str]]], context: str) -> Optional[Dict[Tuple[str, str], str]]:
+        """One structured request for a chunk; {(text, language): translation}, or None if the request failed
+        
+        Raises ValueError when the answer was cut off or isn't the JSON asked for.
+        """
+        system_prompt = CONTEXT_PROMPTS.get(context, CONTEXT_PROMPTS["career_data"])
+        items = [
+            {
+                "id": str(i),
+                "text": text,
+                "languages": {language: self.supported_languages[language] for language in languages}
+            }
+            for i, (text, languages) in enumerate(chunk)
+        ]
+        prompt = f"""
+        {system_prompt}
+        
+        Translate each English text below into every language listed for it.
+        Maintain professional terminology and ensure the translations are accurate for the career/job market context.
+        Return only JSON of the form {{"translations": {{"<id>": {{"<language code>": "<translation>"}}}}}},
+        with an entry for every id and language code, no explanations or additional text.
+        
+        Texts to translate: {json.dumps(items, ensure_ascii=False)}
+        """
+        max_tokens = sum(
+            self._estimate_translation_tokens(text, language) for text, languages in chunk for language in languages
+        ) + 100
+        
+        try:
+            content = await self._complete(system_prompt, prompt, max_tokens)
+        except ValueError:
+            raise
+        except Exception as e:
+            logger.error(f"Failed to batch translate {len(chunk)} texts: {e}")
+            return None
+        if content is None:
+            return None
+        data = extract_json(content, "{", BATCH_TRANSLATION_SCHEMA)
+        
+        translated = {}
+        for i, (text, languages) in enumerate(chunk):
+            entry = data["translations"].get(str(i))
+            if not isinstance(entry, dict):
+                continue
+            for language in languages:
+                value = entry.get(language)
+                if isinstance(value, str) and value.strip():
+                    translated[(text, language)] = value.strip()
+        return translated
+    
+    async def _complete(self, system_prompt: str, prompt: str, max_tokens: int) -> Optional[str]:
+        """One chat completion within the model's rate limits; None if the request was refused
+        
+        Raises TruncatedCompletion when the answer hit max_tokens.
+        """
+        limiter = rate_limiters.get("openai", self.model)
+        reserved = await limiter.acquire(estimate_tokens(system_prompt + prompt, max_tokens))
+        
+        # Refused, failed and cancelled requests give their whole reservation back
+        used = 0
+        try:
             async with self.session.post(
                 "https://api.openai.com/v1/chat/completions",
                 headers={
@@ -98,43 +342,54 @@ class TranslationService:
                     "Content-Type": "application/json"
                 },
                 json={
-                    "model": "gpt-3.5-turbo",
+                    "model": self.model,
                     "messages": [
                         {"role": "system", "content": system_prompt},
                         {"role": "user", "content": prompt}
                     ],
                     "temperature": 0.3,
-                    "max_tokens": 500
+                    "max_tokens": max_tokens
                 }
             ) as response:
-                
+                limiter.record(response.status, response.headers)
                 if response.status != 200:
                     logger.error(f"Translation request failed: {response.status}")
                     return None
                 
                 result = await response.json()
-                translated_text = result['choices'][0]['message']['content'].strip()
-                
-                # Remove quotes if the AI wrapped the translation in quotes
-                if translated_text.startswith('"') and translated_text.endswith('"'):
-                    translated_text = translated_text[1:-1]
-                
-                return translated_text
-                
-        except Exception as e:
-            logger.error(f"Failed to translate text to {target_language}: {e}")
-            return None
+                used = (result.get('usage') or {}).get('total_tokens', reserved)
+                choice = result['choices'][0]
+                if choice.get('finish_reason') == 'length':
+                    raise TruncatedCompletion(f"Completion cut off at {max_tokens} tokens")
+                return choice['message']['content'].strip()
+        finally:
+            limiter.settle(reserved, used)
     
     async def translate_career_data(self, career_data: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
         """Translate career data for all supported languages"""
         translations = {}
         
-        # Fields that need translation
-        translatable_fields = [
-            'title', 'description', 'skills', 'jobTitles', 'certifications'
-        ]
+        # Fields that need translation, with the context each is translated in
+        text_fields = {'title': 'career_data', 'description': 'career_data'}
+        list_fields = {'skills': 'skill_data', 'jobTitles': 'career_data', 'certifications': 'career_data'}
+        
+        # Every string of every field goes out in one batch per context, all languages at once
+        texts_by_context: Dict[str, List[str]] = {}
+        for field, context in text_fields.items():
+            if field in career_data:
+                texts_by_context.setdefault(context, []).append(career_data[field])
+        for field, context in list_fields.items():
+            texts_by_context.setdefault(context, []).extend(career_data.get(field) or [])
+        
+        languages = [code for code in self.supported_languages if code != 'en']
+        logger.info(f"Translating career data to {len(languages)} languages")
+        contexts = list(texts_by_context)
+        batches = await asyncio.gather(*(
+            self.translate_batch(texts_by_context[context], languages, context) for context in contexts
+        ))
+        translated_by_context = dict(zip(contexts, batches))
         
-        for language_code, language_name in self.supported_languages.items():
+        for language_code in self.supported_languages:
             if language_code == 'en':
                 # English is the source, no translation needed
                 translations[language_code] = {
@@ -145,69 +400,18 @@ class TranslationService:
                     'certifications': career_data.get('certifications', [])
                 }
                 continue
-                
-            logger.info(f"Translating career data to {language_name} ({language_code})")
             
             translation = {}
-            
-            # Translate title
-            if 'title' in career_data:
-                translated_title = await self.translate_text(
-                    career_data['title'], 
-                    language_code, 
-                    'career_data'
-                )
-                translation['title'] = translated_title or career_data['title']
-            
-            # Translate description
-            if 'description' in career_data:
-                translated_description = await self.translate_text(
-                    career_data['description'], 
-                    language_code, 
-                    'career_data'
-                )
-                translation['description'] = translated_description or career_data['description']
-            
-            # Translate skills array
-            if 'skills' in career_data:
-                translated_skills = []
-                for skill in career_data['skills']:
-                    translated_skill = await self.translate_text(
-                        skill, 
-                        language_code, 
-                        'skill_data'
-                    )
-                    translated_skills.append(translated_skill or skill)
-                translation['skills'] = translated_skills
-            
-            # Translate job titles array
-            if 'jobTitles' in career_data:
-                translated_job_titles = []
-                for job_title in career_data['jobTitles']:
-                    translated_job_title = await self.translate_text(
-                        job_title, 
-                        language_code, 
-                        'career_data'
-                    )
-                    translated_job_titles.append(translated_job_title or job_title)
-                translation['jobTitles'] = translated_job_titles
-            
-            # Translate certifications array
-            if 'certifications' in career_data:
-                translated_certifications = []
-                for cert in career_data['certifications']:
-                    translated_cert = await self.translate_text(
-                        cert, 
-                        language_code, 
-                        'career_data'
-                    )
-                    translated_certifications.append(translated_cert or cert)
-                translation['certifications'] = translated_certifications
+            for field, context in text_fields.items():
+                if field in career_data:
+                    lookup = translated_by_context[context][language_code]
+                    translation[field] = lookup.get(career_data[field]) or career_data[field]
+            for field, context in list_fields.items():
+                if field in career_data:
+                    lookup = translated_by_context[context][language_code]
+                    translation[field] = [lookup.get(value) or value for value in career_data[field] or []]
             
             translations[language_code] = translation
-            
-            # Rate limiting - wait between language translations
-            await asyncio.sleep(1)
         
         return translations
     
@@ -220,7 +424,15 @@ class TranslationService:
             'market_insights', 'salary_trend', 'industry_impact', 'future_outlook'
         ]
         
-        for language_code, language_name in self.supported_languages.items():
+        languages = [code for code in self.supported_languages if code != 'en']
+        logger.info(f"Translating trend data to {len(languages)} languages")
+        translated = await self.translate_batch(
+            [trend_data[field] for field in translatable_fields if field in trend_data],
+            languages,
+            'trend_data'
+        )
+        
+        for language_code in self.supported_languages:
             if language_code == 'en':
                 # English is the source, no translation needed
                 translations[language_code] = {
@@ -230,51 +442,13 @@ class TranslationService:
                     'future_outlook': trend_data.get('future_outlook', '')
                 }
                 continue
-                
-            logger.info(f"Translating trend data to {language_name} ({language_code})")
             
             translation = {}
-            
-            # Translate market insights
-            if 'market_insights' in trend_data:
-                translated_insights = await self.translate_text(
-                    trend_data['market_insights'], 
-                    language_code, 
-                    'trend_data'
-                )
-                translation['market_insights'] = translated_insights or trend_data['market_insights']
-            
-            # Translate salary trend
-            if 'salary_trend' in trend_data:
-                translated_salary_trend = await self.translate_text(
-                    trend_data['salary_trend'], 
-                    language_code, 
-                    'trend_data'
-                )
-                translation['salary_trend'] = translated_salary_trend or trend_data['salary_trend']
-            
-            # Translate industry impact
-            if 'industry_impact' in trend_data:
-                translated_impact = await self.translate_text(
-                    trend_data['industry_impact'], 
-                    language_code, 
-                    'trend_data'
-                )
-                translation['industry_impact'] = translated_impact or trend_data['industry_impact']
-            
-            # Translate future outlook
-            if 'future_outlook' in trend_data:
-                translated_outlook = await self.translate_text(
-                    trend_data['future_outlook'], 
-                    language_code, 
-                    'trend_data'
-                )
-                translation['future_outlook'] = translated_outlook or trend_data['future_outlook']
+            for field in translatable_fields:
+                if field in trend_data:
+                    translation[field] = translated[language_code].get(trend_data[field]) or trend_data[field]
             
             translations[language_code] = translation
-            
-            # Rate limiting - wait between language translations
-            await asyncio.sleep(1)
         
         return translations
     
@@ -302,9 +476,6 @@ class TranslationService:
                     **translation
                 }
                 all_translations[language_code].append(full_translation)
-            
-            # Rate limiting - wait between careers
-            await asyncio.sleep(2)
         
         return all_translations
     
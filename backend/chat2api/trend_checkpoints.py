@@ -0,0 +1,140 @@
+"""
+Checkpoints for monthly trend update runs
+Records how far each career got in a run (pending, analyzed, saved, translated) so a
+restarted run resumes from the last completed stage, and leases careers to one run at a time
+"""
+
+import os
+import json
+import uuid
+import socket
+import logging
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+STAGES = ('pending', 'analyzed', 'saved', 'translated')
+
+@dataclass
+class Checkpoint:
+    """Progress of one career within a run"""
+    career_id: str
+    stage: str = 'pending'
+    trend_data: Optional[Dict[str, Any]] = None
+
+    def reached(self, stage: str) -> bool:
+        return STAGES.index(self.stage) >= STAGES.index(stage)
+
+class TrendCheckpointStore:
+    """Checkpoint rows in trend_update_checkpoints for one run, keyed by run_key"""
+
+    def __init__(self, db_pool, run_key: str):
+        self.db_pool = db_pool
+        self.run_key = run_key
+        # Unique per process and run, so a crashed run's leases are distinguishable
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        # A lease older than this is considered abandoned by a crashed run
+        self.lease_seconds = int(os.getenv('TREND_CHECKPOINT_LEASE_SECONDS', '1800'))
+        self.checkpoints: Dict[str, Checkpoint] = {}
+
+    async def ensure_table(self):
+        """Create the checkpoint table if the schema has not been applied yet"""
+        async with self.db_pool.acquire() as conn:
+            await conn.execute("""
+                CREATE TABLE IF NOT EXISTS trend_update_checkpoints (
+                    run_key TEXT NOT NULL,
+                    career_id TEXT NOT NULL REFERENCES careers(id) ON DELETE CASCADE,
+                    stage TEXT NOT NULL DEFAULT 'pending' CHECK (stage IN ('pending', 'analyzed', 'saved', 'translated')),
+                    trend_data JSONB,
+                    claimed_by TEXT,
+                    claimed_at TIMESTAMP WITH TIME ZONE,
+                    attempts INTEGER DEFAULT 0,
+                    last_error TEXT,
+                    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+                    PRIMARY KEY (run_key, career_id)
+                )
+            """)
+
+    async def get_unfinished_careers(self) -> List[Dict]:
+        """Careers a previous attempt of this run started but did not finish"""
+        async with self.db_pool.acquire() as conn:
+            rows = await conn.fetch("""
+                SELECT c.id, c.title, c.industry, c.skills, c.level, c.description
+                FROM trend_update_checkpoints t
+                JOIN careers c ON c.id = t.career_id
+                WHERE t.run_key = $1 AND t.stage <> 'translated'
+                ORDER BY c.industry, c.title
+            """, self.run_key)
+        return [dict(row) for row in rows]
+
+    async def claim(self, career_ids: List[str]) -> Dict[str, Checkpoint]:
+        """Lease careers to this run; careers finished or already leased (by this run too) are left out"""
+        async with self.db_pool.acquire() as conn:
+            rows = await conn.fetch("""
+                INSERT INTO trend_update_checkpoints (run_key, career_id, stage, claimed_by, claimed_at)
+                SELECT $1, unnest($2::text[]), 'pending', $3, NOW()
+                ON CONFLICT (run_key, career_id) DO UPDATE SET
+                    claimed_by = EXCLUDED.claimed_by,
+                    claimed_at = NOW(),
+                    attempts = trend_update_checkpoints.attempts + 1
+                WHERE trend_update_checkpoints.stage <> 'translated'
+                  AND (trend_update_checkpoints.claimed_by IS NULL
+                       OR trend_update_checkpoints.claimed_at < NOW() - make_interval(secs => $4))
+                RETURNING career_id, stage, trend_data
+            """, self.run_key, career_ids, self.worker_id, float(self.lease_seconds))
+
+        claimed = {}
+        for row in rows:
+            trend_data = json.loads(row['trend_data']) if row['trend_data'] else None
+            claimed[row['career_id']] = Checkpoint(row['career_id'], row['stage'], trend_data)
+        self.checkpoints.update(claimed)
+
+        resumed = sum(1 for cp in claimed.values() if cp.stage != 'pending')
+        logger.info(f"Run {self.run_key}: claimed {len(rows)}/{len(career_ids)} careers, {resumed} resuming mid-way")
+        return claimed
+
+    def get(self, career_id: str) -> Checkpoint:
+        return self.checkpoints.get(career_id) or Checkpoint(career_id)
+
+    def advance_statement(self, career_id: str, stage: str,
+                          trend_data: Optional[Dict[str, Any]] = None) -> Tuple[str, tuple]:
+        """The checkpoint UPDATE for advance(), for callers writing it in their own transaction"""
+        checkpoint = self.checkpoints.setdefault(career_id, Checkpoint(career_id))
+        checkpoint.stage = stage
+        if trend_data is not None:
+            checkpoint.trend_data = trend_data
+        return ("""
+            UPDATE trend_update_checkpoints SET
+                stage = $3,
+                trend_data = COALESCE($4::jsonb, trend_data),
+                claimed_at = NOW(),
+                last_error = NULL,
+                updated_at = NOW()
+            WHERE run_key = $1 AND career_id = $2 AND claimed_by = $5
+        """, (self.run_key, career_id, stage,
+              json.dumps(trend_data) if trend_data is not None else None, self.worker_id))
+
+    async def advance(self, career_id: str, stage: str, trend_data: Optional[Dict[str, Any]] = None):
+        """Record that career_id completed stage; also renews the lease"""
+        sql, args = self.advance_statement(career_id, stage, trend_data)
+        async with self.db_pool.acquire() as conn:
+            await conn.execute(sql, *args)
+
+    async def record_error(self, career_id: str, error: str):
+        """Keep the last error on a career that stays at its current stage"""
+        async with self.db_pool.acquire() as conn:
+            await conn.execute("""
+                UPDATE trend_update_checkpoints SET last_error = $3, updated_at = NOW()
+                WHERE run_key = $1 AND career_id = $2 AND claimed_by = $4
+            """, self.run_key, career_id, error, self.worker_id)
+
+    async def release(self):
+        """Give up this run's leases so a retry does not wait for them to expire"""
+        async with self.db_pool.acquire() as conn:
+            await conn.execute("""
+                UPDATE trend_update_checkpoints SET claimed_by = NULL, claimed_at = NULL
+                WHERE run_key = $1 AND claimed_by = $2
+            """, self.run_key, self.worker_id)
@@ -0,0 +1,67 @@
+"""
+Career trend data model
+The CareerTrendData record shared by the trend updaters, and the career_trends upsert
+generated from its fields so columns, placeholders and arguments can't drift apart
+"""
+
+import json
+from datetime import datetime
+from dataclasses import dataclass, fields
+from functools import lru_cache
+from typing import Any, Dict, List, Tuple
+
+@dataclass
+class CareerTrendData:
+    """Data structure for career trend information"""
+    career_id: str
+    trend_score: float  # 0-10 scale
+    trend_direction: str  # 'rising', 'stable', 'declining'
+    demand_level: str  # 'high', 'medium', 'low'
+    growth_rate: float  # Percentage
+    market_insights: str
+    key_skills_trending: List[str]
+    salary_trend: str
+    job_availability_score: float  # 0-10 scale
+    top_locations: List[str]
+    remote_work_trend: float  # 0-10 scale
+    industry_impact: str
+    automation_risk: float  # 0-10 scale
+    future_outlook: str
+    confidence_score: float  # 0-10 scale
+    currency_code: str = 'USD'  # Default to USD
+    salary_data: Dict = None  # Salary data by region/currency
+
+# Fields stored as JSONB, passed to asyncpg as JSON text
+JSON_FIELDS = {'salary_data'}
+
+TREND_COLUMNS = tuple(field.name for field in fields(CareerTrendData))
+
+@lru_cache(maxsize=None)
+def trend_upsert_sql(table: str = 'career_trends') -> str:
+    """INSERT ... ON CONFLICT (career_id) DO UPDATE for every CareerTrendData field plus next_update_due
+
+    The text is built once per table, so asyncpg's per-connection statement cache
+    reuses one prepared statement for every save.
+    """
+    columns = TREND_COLUMNS + ('next_update_due',)
+    placeholders = ", ".join(f"${i}" for i in range(1, len(columns) + 1))
+    assignments = ",\n    ".join(
+        [f"{column} = EXCLUDED.{column}" for column in columns if column != 'career_id'] +
+        ["last_updated = NOW()"]
+    )
+    return (
+        f"INSERT INTO {table} ({', '.join(columns)})\n"
+        f"VALUES ({placeholders})\n"
+        f"ON CONFLICT (career_id) DO UPDATE SET\n    {assignments}"
+    )
+
+def trend_upsert_args(trend_data: CareerTrendData, next_update_due: datetime) -> Tuple[Any, ...]:
+    """Arguments for trend_upsert_sql, in column order"""
+    values = []
+    for column in TREND_COLUMNS:
+        value = getattr(trend_data, column)
+        if column in JSON_FIELDS:
+            value = json.dumps(value) if value is not None else None
+        values.append(value)
+    values.append(next_update_due)
+    return tuple(values)
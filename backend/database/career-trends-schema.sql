@@ -27,6 +27,10 @@ CREATE TABLE IF NOT EXISTS career_trends (
     automation_risk DECIMAL(3,2) CHECK (automation_risk >= 0 AND automation_risk <= 10),
     future_outlook TEXT, -- 2-3 year outlook
     
+    -- Currency support (see currency-migration.sql for existing databases)
+    currency_code TEXT DEFAULT 'USD', -- Currency code for salary data
+    salary_data JSONB, -- Salary ranges and insights for this currency/region
+    
     -- Data source and quality
     data_source TEXT DEFAULT 'chat2api',
     confidence_score DECIMAL(3,2) CHECK (confidence_score >= 0 AND confidence_score <= 10),
@@ -43,6 +47,7 @@ CREATE TABLE IF NOT EXISTS career_trend_history (
     id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
     career_id TEXT NOT NULL REFERENCES careers(id) ON DELETE CASCADE,
     trend_data JSONB NOT NULL, -- Full trend data snapshot
+    currency_code TEXT DEFAULT 'USD',
     month_year TEXT NOT NULL, -- Format: '2024-01'
     created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
 );
@@ -103,10 +108,40 @@ CREATE TABLE IF NOT EXISTS trend_update_log (
     updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
 );
 
+-- Per-career checkpoints so an interrupted monthly run resumes without repeating paid LLM calls
+CREATE TABLE IF NOT EXISTS trend_update_checkpoints (
+    run_key TEXT NOT NULL, -- Idempotency key of the run, the update month: '2024-01'
+    career_id TEXT NOT NULL REFERENCES careers(id) ON DELETE CASCADE,
+    stage TEXT NOT NULL DEFAULT 'pending' CHECK (stage IN ('pending', 'analyzed', 'saved', 'translated')),
+    trend_data JSONB, -- Analysis result, kept so later stages can resume without the LLM
+    
+    -- Lease held by the run currently processing this career
+    claimed_by TEXT,
+    claimed_at TIMESTAMP WITH TIME ZONE,
+    
+    attempts INTEGER DEFAULT 0,
+    last_error TEXT,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    
+    PRIMARY KEY (run_key, career_id)
+);
+
+-- Applied migrations of the per-language career_trends_{lang} tables (see schema_manager.py)
+CREATE TABLE IF NOT EXISTS schema_migrations (
+    table_name TEXT NOT NULL,
+    version INTEGER NOT NULL,
+    applied_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    PRIMARY KEY (table_name, version)
+);
+
 -- Indexes for performance
 CREATE INDEX IF NOT EXISTS idx_career_trends_career_id ON career_trends(career_id);
+-- Arbiter for the batched ON CONFLICT (career_id) upserts
+CREATE UNIQUE INDEX IF NOT EXISTS idx_career_trends_career_id_unique ON career_trends(career_id);
 CREATE INDEX IF NOT EXISTS idx_career_trends_last_updated ON career_trends(last_updated);
 CREATE INDEX IF NOT EXISTS idx_career_trends_next_update ON career_trends(next_update_due);
+-- Keyset scan of due careers; NOW() can't appear in an index predicate, so the scan bounds by run start instead
+CREATE INDEX IF NOT EXISTS idx_career_trends_due ON career_trends(next_update_due, career_id) WHERE next_update_due IS NOT NULL;
 CREATE INDEX IF NOT EXISTS idx_career_trends_trend_score ON career_trends(trend_score DESC);
 CREATE INDEX IF NOT EXISTS idx_career_trends_demand_level ON career_trends(demand_level);
 
@@ -122,11 +157,15 @@ CREATE INDEX IF NOT EXISTS idx_update_log_month ON trend_update_log(update_month
 CREATE INDEX IF NOT EXISTS idx_update_log_status ON trend_update_log(status);
 CREATE INDEX IF NOT EXISTS idx_update_log_created_at ON trend_update_log(created_at);
 
+CREATE INDEX IF NOT EXISTS idx_update_checkpoints_unfinished ON trend_update_checkpoints(run_key) WHERE stage <> 'translated';
+
 -- RLS Policies
 ALTER TABLE career_trends ENABLE ROW LEVEL SECURITY;
 ALTER TABLE career_trend_history ENABLE ROW LEVEL SECURITY;
 ALTER TABLE industry_trends ENABLE ROW LEVEL SECURITY;
 ALTER TABLE trend_update_log ENABLE ROW LEVEL SECURITY;
+ALTER TABLE trend_update_checkpoints ENABLE ROW LEVEL SECURITY;
+ALTER TABLE schema_migrations ENABLE ROW LEVEL SECURITY;
 
 -- Allow public read access to trend data
 CREATE POLICY "Allow public read access to career trends" ON career_trends
@@ -151,6 +190,9 @@ CREATE POLICY "Allow service role full access to industry trends" ON industry_tr
 CREATE POLICY "Allow service role full access to update log" ON trend_update_log
     FOR ALL USING (auth.role() = 'service_role');
 
+CREATE POLICY "Allow service role full access to update checkpoints" ON trend_update_checkpoints
+    FOR ALL USING (auth.role() = 'service_role');
+
 -- Functions for trend analysis
 CREATE OR REPLACE FUNCTION get_career_trend_summary(career_id_param TEXT)
 RETURNS TABLE (